@@ -31,10 +31,17 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import tkinter as tk
 # ttk for themed widgets and messagebox for pop-ups
 from tkinter import ttk, messagebox, PhotoImage
-from fastapi import status # symbolic HTTP status codes for clarity (Tiangolo, 2025)
+# Symbolic HTTP status codes from the standard library: importing fastapi just
+# for these constants cost most of the client's start-up time (Python Software Foundation, 2025d)
+from http import HTTPStatus
 import platform # Detect Operating System (Python Software Foundation, 2025c)
-import requests # For HTTP requests to FastAPI backend (Reitz & Chisamore, 2024)
 from ui import BedBuddy # BedBuddy main application window
+from ui.auth_session import AuthSession # Token storage + silent refresh
+from ui.api_client import get_api_client # Pooled keep-alive HTTP client shared with BedBuddy
+from ui.worker import BackgroundWorker, WorkerTimeout # Keeps HTTP calls off the Tk thread
+from ui.startup import report_first_window # Start-up profiling mode (BEDBUDDY_PROFILE_STARTUP=1)
+
+LOGIN_TIMEOUT = 45 # seconds before the UI gives up (covers the client's timeouts and retries)
 
 # ------------------
 # Login Window Class
@@ -98,9 +105,12 @@ class Login(tk.Tk):
         self.status.grid(row=3, column=0, columnspan=2, sticky="w", pady=(6, 2))
 
         # "Sign In" button triggers do_login()
-        ttk.Button(frame, text="Sign In", command=self.do_login).grid(
-            row=4, column=0, columnspan=2, sticky="ew", pady=(8, 0)
-        )
+        self.sign_in_btn = ttk.Button(frame, text="Sign In", command=self.do_login)
+        self.sign_in_btn.grid(row=4, column=0, columnspan=2, sticky="ew", pady=(8, 0))
+
+        # Login requests run on a background worker; results come back via after()
+        self.worker = BackgroundWorker(self, on_busy=self.set_busy)
+        self.login_job = None
 
         # Allow pressing Enter/Return to login
         self.bind("<Return>", lambda e: self.do_login())
@@ -121,78 +131,99 @@ class Login(tk.Tk):
             Steps:
             1. Read the username and password typed into the login form
             2. Send the data to the backend endpoints '/auth/login' using http POST
+               through the shared keep-alive client (ui/api_client.py), on a background
+               worker so the window never freezes on a slow server
                (Reitz & Chisamore, 2024; Tiangolo, 2024)
-            3. If backend confimrs login (response 200), display a success message and close the window
-            4. If backend rejects login, display 401 error message in red (Tiangolo, 2024)
-            5. If backend cannot be reached, show a server error message 
+            3. login_response() handles the reply back on the Tk thread
+            4. login_failed() reports timeouts and unreachable servers
             
         '''
+        if self.login_job is not None:   # A sign-in is already in flight
+            return
         username = self.e_user.get().strip()  # Get the entered username (remove spaces)
         password = self.e_pass.get()          # Get the entered password
-        
-        try:
-            ''' Send a request to the FastAPI backend at the /auth/login address
-                We are using the HTTP "POST" method which means:
-                - We are sending data to the server (username & password)
-                - The server will process the data and give us a respionse
-                (REitz & Chisamore, 2024; Tiangolo, 2024)
-            '''
-            response = requests.post(
-                "http://127.0.0.1:8000/auth/login", json={
-                "username": username,   # Take the username. from the Tkinter form
-                "password": password    # Take the password from the Tkinter form
-            })
-
-            # If the server responds with status code 200, it means login worked
-            # (Tiangolo, 2025)
-            if response.status_code == status.HTTP_200_OK:
-                # Convert the server's JSON reply into a Python dictionary
-                data = response.json()
-
-                # Get the "access_token" from the reply
-                # This token is a JSON web token (JWT) used to prove the user is logged in 
-                # (Davis, 2024)
-                access_token = data.get("access_token")
-
-                # Show a success message in a Tkinter popup
-                messagebox.showinfo("Success", "Login successful.")
-                # Close the login window
-                self.destroy()
-
-                # Launch the BedBuddy main interface (after successful login)
-                try:
-                    app = BedBuddy() # Create an instance of main UI
-                    app.run()        # Start BedBuddy interface
-                
-                except Exception as e:
-                    messagebox.showerror("Error", f"Unable to launch BedBuddy UI")
+
+        self.status.config(text="Signing in...", foreground="gray20")
+        self.login_job = self.worker.submit(
+            get_api_client().login, username, password,
+            on_success=self.login_response,
+            on_error=self.login_failed,
+            timeout=LOGIN_TIMEOUT,
+        )
+
+    def set_busy(self, busy):
+        '''Disable the Sign In button while the request is in flight.'''
+        self.sign_in_btn.config(state="disabled" if busy else "normal")
+
+    def login_response(self, response):
+        ''' Handle the /auth/login reply (runs on the Tk thread)
+
+            1. If backend confimrs login (response 200), display a success message and close the window
+            2. If backend rejects login, display 401 error message in red (Tiangolo, 2024)
+        '''
+        self.login_job = None
+        self.status.config(text="", foreground="red")
+
+        # If the server responds with status code 200, it means login worked
+        # (Tiangolo, 2025)
+        if response.status_code == HTTPStatus.OK:
+            # Convert the server's JSON reply into a Python dictionary
+            data = response.json()
+
+            # Get the "access_token" and "refresh_token" from the reply
+            # The access token is a JSON web token (JWT) used to prove the user is logged in
+            # (Davis, 2024); the refresh token renews it without re-sending the password
+            session = AuthSession.from_login_response(data)
+
+            # Show a success message in a Tkinter popup
+            messagebox.showinfo("Success", "Login successful.")
+            # Stop the worker, then close the login window
+            self.worker.shutdown()
+            self.destroy()
+
+            # Launch the BedBuddy main interface (after successful login)
+            try:
+                app = BedBuddy(session=session) # Create an instance of main UI (shows immediately)
+                app.start()      # Saved census, live updates and changed bays, after the first paint
+                app.run()        # Start BedBuddy interface
             
-            elif response.status_code == status.HTTP_401_UNAUTHORIZED:
-
-                # GUI first looks for the detail field returned by FastAPI. 
-                # If it’s not there, it defaults to a generic message "Login 
-                # failed" so users still see feedback (Tiangolo, 2025)
-                error_message = response.json().get("detail", "Login failed")
-                self.status.config(text=error_message) 
-
-            else: 
-                # Handles other possible status codes, a catch all. 
-                messagebox.showerror(
-                    "Error",
-                    f"Unexpected response ({response.status_code}): {response.text}"
-                )
-                
+            except Exception as e:
+                messagebox.showerror("Error", f"Unable to launch BedBuddy UI")
         
-        # Handles cases like server down, no internet connection(Reitz & Chisamore, 2024)
-        except requests.exceptions.RequestException as error:
+        elif response.status_code == HTTPStatus.UNAUTHORIZED:
+
+            # GUI first looks for the detail field returned by FastAPI. 
+            # If it’s not there, it defaults to a generic message "Login 
+            # failed" so users still see feedback (Tiangolo, 2025)
+            error_message = response.json().get("detail", "Login failed")
+            self.status.config(text=error_message) 
+
+        else: 
+            # Handles other possible status codes, a catch all. 
             messagebox.showerror(
-                "Connection Error",
-                f"Could not connect to the FastAPI backend:\n{error}"
+                "Error",
+                f"Unexpected response ({response.status_code}): {response.text}"
             )
-            
+
+    def login_failed(self, error):
+        ''' Handles cases like server down, no internet connection or a timeout
+            (Reitz & Chisamore, 2024)
+        '''
+        self.login_job = None
+        self.status.config(text="", foreground="red")
+        if isinstance(error, WorkerTimeout):
+            error = "The server did not respond in time."
+        messagebox.showerror(
+            "Connection Error",
+            f"Could not connect to the FastAPI backend:\n{error}"
+        )
+
+
 # Entry point: run Login GUI
 if __name__ == "__main__":
-    Login().mainloop()
+    login = Login()
+    report_first_window(login)   # no-op unless profiling start-up
+    login.mainloop()
 
 '''
 This application was developed using open-source libraries and documentation .
@@ -215,6 +246,8 @@ Python Software Foundation. (2025, October 29). os — Miscellaneous
     https://docs.python.org/3/library/os.html
 Python Software Foundation. (2024). Modules and packages — Import system. 
     In The Python 3.13 documentation. https://docs.python.org/3/tutorial/modules.html
+Python Software Foundation. (2025). http — HTTP modules: HTTPStatus.
+    In Python 3.13 documentation. https://docs.python.org/3/library/http.html
 Python Software Foundation. (2025, October 29). platform — Access 
     to underlying platform’s identifying data. In Python 3.13 documentation. 
     https://docs.python.org/3/library/platform.html
@@ -3,4 +3,3 @@
 #       https://docs.python.org/3/tutorial/modules.html#packages
 # Marks the backend folder as a Python package.
 # backend/__init__.py
-print("Initializing BedBuddy backend package...")
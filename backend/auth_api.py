@@ -1,9 +1,14 @@
 # --------------------------------------------
 # Simple FastAPI authentication backend for BedBuddy
 # --------------------------------------------
-# This file creates two endpoints:
+# This file creates these endpoints:
 #   1. /auth/register  -> add a new user to MongoDB
 #   2. /auth/login     -> verify username + password and return a JWT token
+#   3. /auth/refresh   -> trade a refresh token for a new token pair (no password check)
+#   4. /auth/logout    -> revoke a refresh token
+#   5. /auth/me        -> example protected endpoint (requires "Authorization: Bearer <token>")
+#   6. /patients, /bays/{bay} -> census reads with ETags (census_api.py)
+#   7. /metrics        -> Prometheus metrics (only with BEDBUDDY_METRICS=1)
 #
 # We are using:
 #   - FastAPI (web framework) (Tiangolo, 2025)
@@ -16,33 +21,133 @@
 # Imports and setup
 # ----------------------------
 # FastAPI is the asynchronous web framework used for defining REST endpoints (Tiangolo, 2025)
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks, Depends
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
+# Raised by the unique index on users.username (MongoDB Inc., 2025)
+from pymongo.errors import DuplicateKeyError
 # Pydantic provides type validation for incoming request bodies (Tiangolo, 2025)
 from pydantic import BaseModel
-# Motor is the asynchronous MongoDB driver maintained by MongoDB Inc.(MongoDB Inc., 2025)
-from motor.motor_asyncio import AsyncIOMotorClient
 # Load environment variables from the .env configuration file (PyPA, 2025).
 from dotenv import load_dotenv
 # For accessing environment variable (Python Software Foundation, 2025)
 import os
+import sys
+# For refresh token families and expiry checks (Python Software Foundation, 2025)
+import uuid
+from datetime import datetime
+# For request latency (Python Software Foundation, 2025)
+import time
+
+# Make the project root importable so we can share config/db_config.py
+# (Python Software Foundation, 2024)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import the helper functions from security.py (Davis, 2024; The Passlib Project, 2024)
-from security import hash_password, verify_password, create_access_token
+from security import (
+    hash_password_async, verify_password_async, needs_rehash, create_access_token,
+    create_refresh_token, hash_refresh_token, refresh_token_expiry,
+    HashingBusyError, shutdown_hash_pool, ACCESS_TOKEN_EXPIRE_MINUTES,
+    get_current_user, token_cache_stats,
+)
+# Shared, pooled Motor client (one per worker process) (MongoDB Inc., 2025)
+from config.db_config import get_motor_db, ping_async, pool_settings, close_clients
+# Latency histograms in Prometheus text format, off unless BEDBUDDY_METRICS=1 (Prometheus Authors, 2024)
+from config.metrics import METRICS_ENABLED, CONTENT_TYPE, histogram, render as render_metrics
+from database.indexes import ensure_indexes
+from census_api import router as census_router  # /patients and /bays/{bay}
 
 # Load environment variables (.env should be in the same folder)(PyPA, 2024)
 load_dotenv()
 
 # Create the FastAPI app (Tiangolo, 2025)
 app = FastAPI(title="BedBuddy Auth API")
+# Compress JSON bodies over 1 KB (census responses shrink several times) (Tiangolo, 2025)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.include_router(census_router)
+
+# Per-route latency, labelled with the route template (/bays/{bay}) so bay
+# names never multiply the series. Nothing is added when metrics are off.
+HTTP_REQUEST_SECONDS = histogram(
+    "bedbuddy_http_request_duration_seconds", "API request latency per route",
+    ("method", "route", "status"))
+
+if METRICS_ENABLED:
+    @app.middleware("http")
+    async def time_requests(request: Request, call_next):
+        start = time.perf_counter()
+        status = 500   # an exception escaped the app
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, request.method, route, str(status))
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        '''Every histogram and gauge of this worker process, for Prometheus to scrape.'''
+        return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
+
+# Connect to MongoDB Atlas through the shared connection manager (MongoDB Inc., 2025)
+# Motor connects asynchronously, so we can use "await" when calling it.
+# Looked up per request so a forked worker never reuses its parent's client.
+def users_collection():
+    '''Collection where we store user data.'''
+    return get_motor_db()["users"]
+
+
+def refresh_tokens_collection():
+    '''Collection holding hashed refresh tokens (one document per issued token).'''
+    return get_motor_db()["refresh_tokens"]
+
+
+@app.on_event("startup")
+async def startup():
+    '''
+    Create the indexes every hot query relies on (unique username, refresh
+    token hash + TTL, per-bay census fields). Idempotent, so every worker can
+    run it (MongoDB Inc., 2025). Runs in a thread: it uses the sync client.
+    '''
+    await run_in_threadpool(ensure_indexes)
+
 
-# Connect to MongoDB Atlas (MongoDB Inc., 2025)
-MONGO_URI = os.getenv("MONGO_URI")
-DB_NAME = os.getenv("DB_NAME")
+@app.on_event("shutdown")
+async def shutdown():
+    '''Close the pooled clients and hashing threads when the worker stops.'''
+    close_clients()
+    shutdown_hash_pool()
 
-# Motor connects asynchronously, so we can use "await" when calling it
-client = AsyncIOMotorClient(MONGO_URI)
-db = client[DB_NAME]
-users = db["users"]  # collection where we store user data
+
+# When every hashing slot is taken we answer immediately instead of queueing
+# without bound, so clients can back off and retry (Tiangolo, 2025)
+@app.exception_handler(HashingBusyError)
+async def hashing_busy_handler(request: Request, exc: HashingBusyError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication service busy, please retry"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+# ----------------------------
+# Endpoint: Health
+# ----------------------------
+@app.get("/health")
+async def health():
+    '''Ping MongoDB through the shared pool and report the pool settings.'''
+    try:
+        rtt_ms = await ping_async()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"MongoDB unreachable: {e}")
+    return {
+        "status": "ok",
+        "mongo_ping_ms": round(rtt_ms, 2),
+        "pool": pool_settings(),
+        "token_cache": token_cache_stats(),
+    }
 
 
 # ----------------------------
@@ -58,6 +163,11 @@ class UserCreds(BaseModel):
     username: str
     password: str
 
+
+class RefreshRequest(BaseModel):
+    '''Body for /auth/refresh and /auth/logout: the opaque refresh token.'''
+    refresh_token: str
+
 # ----------------------------
 # Endpoint: Register
 # ----------------------------
@@ -66,19 +176,24 @@ async def register(body: UserCreds):
     """
     Create a new user account (Tiangolo, 2025; MongoDB Inc., 2025).
     Steps:
-      1. Check if username already exists in MongoDB.
-      2. Hash the password with bcrypt (The Passlib Project, 2024).
-      3. Save to MongoDB.
+      1. Reject a taken username with an _id-only lookup, BEFORE hashing, so
+         repeated registrations of an existing name never occupy the hashing pool.
+      2. Hash the password with Argon2 (The Passlib Project, 2024).
+      3. Save to MongoDB in a single insert. The unique index on username
+         rejects duplicates atomically, so two concurrent registrations of
+         the same name cannot both succeed (the pre-check alone is racy).
     """
-    existing_user = await users.find_one({"username": body.username})
-    if existing_user:
+    users = users_collection()
+    if await users.find_one({"username": body.username}, {"_id": 1}):  # Covered by the unique index
+        raise HTTPException(status_code=400, detail="Username already exists")
+    hashed_pw = await hash_password_async(body.password) # Argon2 hash, off the event loop
+    try:
+        await users.insert_one({
+            "username": body.username,
+            "password_hash": hashed_pw
+        })
+    except DuplicateKeyError:
         raise HTTPException(status_code=400, detail="Username already exists")
-
-    hashed_pw = hash_password(body.password) # Secure bcrypt hash
-    await users.insert_one({
-        "username": body.username,
-        "password_hash": hashed_pw
-    })
     return {"msg": "User registered successfully"}
 
 
@@ -86,21 +201,115 @@ async def register(body: UserCreds):
 # Endpoint: Login
 # ----------------------------
 @app.post("/auth/login")
-async def login(body: UserCreds):
+async def login(body: UserCreds, background_tasks: BackgroundTasks):
     """
     Log in an existing user (Tiangolo, 2025).
     Steps:
       1. Find the user in the database (MongoDB Inc., 2025).
       2. Verify password using bcrypt 9The Passlib Project, 2024).
-      3. If correct, create and return a JWT token (Davis, 2024).
+      3. If the stored hash uses outdated Argon2 parameters, re-hash it in the
+         background after the response is sent (The Passlib Project, 2024).
+      4. If correct, create and return a JWT token (Davis, 2024).
     """
-    user = await users.find_one({"username": body.username})
+    user = await users_collection().find_one({"username": body.username})
 
-    if not user or not verify_password(body.password, user["password_hash"]):
+    if not user or not await verify_password_async(body.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid username or password")
 
-    token = create_access_token(body.username)
-    return {"access_token": token, "token_type": "bearer"}
+    if needs_rehash(user["password_hash"]):
+        background_tasks.add_task(rehash_password, body.username, body.password, user["password_hash"])
+
+    return await issue_tokens(body.username)
+
+
+async def issue_tokens(username: str, family_id: str = None) -> dict:
+    '''
+    Create an access token plus a new refresh token and store the refresh
+    token's hash. All tokens rotated from one login share a family_id, so a
+    replayed (already used) token can revoke the whole chain (IETF, 2012).
+    '''
+    refresh_token, token_hash = create_refresh_token()
+    await refresh_tokens_collection().insert_one({
+        "token_hash": token_hash,
+        "username": username,
+        "family_id": family_id or uuid.uuid4().hex,
+        "expires_at": refresh_token_expiry(),
+        "revoked": False,
+    })
+    return {
+        "access_token": create_access_token(username),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        "refresh_token": refresh_token,
+    }
+
+
+# ----------------------------
+# Endpoint: Refresh
+# ----------------------------
+@app.post("/auth/refresh")
+async def refresh(body: RefreshRequest):
+    """
+    Trade a refresh token for a new access + refresh token pair (IETF, 2012).
+    Steps:
+      1. Atomically mark the presented token as used (one indexed update).
+      2. If it was already used, treat it as stolen and revoke its family.
+      3. Issue a new pair in the same family.
+    No password hashing happens here.
+    """
+    tokens = refresh_tokens_collection()
+    token_hash = hash_refresh_token(body.refresh_token)
+    now = datetime.utcnow()
+    current = await tokens.find_one_and_update(
+        {"token_hash": token_hash, "revoked": False, "expires_at": {"$gt": now}},
+        {"$set": {"revoked": True, "revoked_at": now}},
+    )
+    if current is None:
+        reused = await tokens.find_one({"token_hash": token_hash, "revoked": True})
+        if reused:
+            await tokens.update_many({"family_id": reused["family_id"]}, {"$set": {"revoked": True}})
+        raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+
+    return await issue_tokens(current["username"], current["family_id"])
+
+
+# ----------------------------
+# Endpoint: Logout
+# ----------------------------
+@app.post("/auth/logout")
+async def logout(body: RefreshRequest):
+    '''Revoke the refresh token (and every token rotated from the same login).'''
+    tokens = refresh_tokens_collection()
+    current = await tokens.find_one({"token_hash": hash_refresh_token(body.refresh_token)})
+    if current:
+        await tokens.update_many({"family_id": current["family_id"]}, {"$set": {"revoked": True}})
+    return {"msg": "Logged out"}
+
+
+async def rehash_password(username: str, password: str, old_hash: str):
+    '''
+    Upgrade a stored hash to the current Argon2 parameters.
+    The update only matches the old hash, so a password change that happened
+    in the meantime is never overwritten. A busy hashing pool just skips the
+    upgrade; it is retried on the next login.
+    '''
+    try:
+        new_hash = await hash_password_async(password)
+    except HashingBusyError:
+        return
+    await users_collection().update_one(
+        {"username": username, "password_hash": old_hash},
+        {"$set": {"password_hash": new_hash}},
+    )
+
+
+# ----------------------------
+# Endpoint: Current user (protected)
+# ----------------------------
+@app.get("/auth/me")
+async def me(username: str = Depends(get_current_user)):
+    '''Return the user behind the bearer token; the pattern for every protected route.'''
+    return {"username": username}
 
 
 # ----------------------------
@@ -115,13 +324,18 @@ async def login(body: UserCreds):
 
 3. You'll see an automatic API tester.
    - Try POST /auth/register  →  create new user
-   - Try POST /auth/login     →  log in and receive JWT token
+   - Try POST /auth/login     →  log in and receive JWT + refresh token
+   - Try POST /auth/refresh   →  send the refresh token, receive a new pair
 """
 # References:
 # Davis, M. P. (2024). python-jose: JWT library for Python
 #       [Software repository]. GitHub. https://github.com/mpdavis/python-jose
+# IETF. (2012). The OAuth 2.0 authorization framework (RFC 6749).
+#       https://www.rfc-editor.org/rfc/rfc6749
 # MongoDB Inc. (2025). Motor: Asynchronous Python driver for MongoDB
 #       [Documentation]. https://motor.readthedocs.io/
+# Prometheus Authors. (2024). Exposition formats [Documentation].
+#       https://prometheus.io/docs/instrumenting/exposition_formats/
 # PyPA. (2025). python-dotenv* [Software package]. 
 #       PyPI. https://pypi.org/project/python-dotenv/
 # Python Software Foundation. (2025, October 29). os — 
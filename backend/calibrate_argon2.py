@@ -0,0 +1,120 @@
+# --------------------------------------------
+# Argon2 cost calibration for BedBuddy Auth
+# --------------------------------------------
+# Benchmarks Argon2 time_cost / memory_cost / parallelism on THIS host and
+# picks the strongest combination whose median verify time stays under a
+# target latency. The result is written to the params file that security.py
+# loads at startup, so it should be run once per server type:
+#
+#   python backend/calibrate_argon2.py --target-ms 150
+#   python backend/calibrate_argon2.py --target-ms 150 --dry-run
+#
+# Existing hashes keep working: login re-hashes them with the new parameters
+# (needs_rehash) the next time each user signs in.
+#
+# Libraries used:
+#   - argon2-cffi (Argon2 reference bindings) (Schlawack, 2025)
+# ----------------------------
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+from argon2 import PasswordHasher
+
+from security import ARGON2_PARAMS_FILE
+
+# Never go below the OWASP minimum for Argon2id: 19 MiB, 2 iterations, 1 lane (OWASP, 2024)
+MIN_MEMORY_COST = 19456   # KiB
+MIN_TIME_COST = 2
+MEMORY_CANDIDATES = (19456, 32768, 47104, 65536, 98304, 131072)  # KiB
+MAX_TIME_COST = 10
+SAMPLE_PASSWORD = "correct horse battery staple"
+
+
+def measure_verify_ms(time_cost, memory_cost, parallelism, samples):
+    '''Median time (ms) to verify one password with the given parameters.'''
+    hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    stored = hasher.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.verify(stored, SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms, parallelism_options, samples, verbose=True):
+    '''
+    Search the parameter grid and return the strongest parameters that verify
+    within target_ms. "Strongest" = most memory, then most passes.
+    For each memory size the time cost grows until the target is exceeded,
+    so slow combinations are measured at most once.
+    '''
+    best = None
+    for parallelism in parallelism_options:
+        for memory_cost in MEMORY_CANDIDATES:
+            one_pass_too_slow = False
+            for time_cost in range(1, MAX_TIME_COST + 1):
+                ms = measure_verify_ms(time_cost, memory_cost, parallelism, samples)
+                if verbose:
+                    print(f"  p={parallelism} m={memory_cost:>6} KiB t={time_cost:>2} -> {ms:7.1f} ms")
+                if ms > target_ms:
+                    one_pass_too_slow = time_cost == 1
+                    break
+                if memory_cost < MIN_MEMORY_COST or time_cost < MIN_TIME_COST:
+                    continue
+                candidate = {"time_cost": time_cost, "memory_cost": memory_cost,
+                             "parallelism": parallelism, "measured_ms": round(ms, 1)}
+                if best is None or (memory_cost, time_cost, -parallelism) > (
+                        best["memory_cost"], best["time_cost"], -best["parallelism"]):
+                    best = candidate
+            if one_pass_too_slow:
+                break  # larger memory sizes will be slower still
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate Argon2 cost parameters for this host")
+    parser.add_argument("--target-ms", type=float, default=150.0, help="target verify latency")
+    parser.add_argument("--parallelism", type=int, nargs="+",
+                        default=sorted({1, 2, min(4, os.cpu_count() or 1)}))
+    parser.add_argument("--samples", type=int, default=5, help="verifications per measurement")
+    parser.add_argument("--output", default=ARGON2_PARAMS_FILE)
+    parser.add_argument("--dry-run", action="store_true", help="print the result without writing it")
+    args = parser.parse_args()
+
+    print(f"Calibrating Argon2 for a {args.target_ms:.0f} ms verify target on {platform.node()}...")
+    best = calibrate(args.target_ms, args.parallelism, args.samples)
+    if best is None:
+        print(f"No parameters at or above the minimum (m={MIN_MEMORY_COST} KiB, t={MIN_TIME_COST}) "
+              f"meet {args.target_ms:.0f} ms on this host; using the minimum.")
+        best = {"time_cost": MIN_TIME_COST, "memory_cost": MIN_MEMORY_COST, "parallelism": 1,
+                "measured_ms": round(measure_verify_ms(MIN_TIME_COST, MIN_MEMORY_COST, 1, args.samples), 1)}
+
+    best.update({
+        "target_ms": args.target_ms,
+        "host": platform.node(),
+        "calibrated_at": datetime.now(timezone.utc).isoformat(),
+    })
+    print(json.dumps(best, indent=2))
+    if args.dry_run:
+        return 0
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(best, f, indent=2)
+    print(f"Wrote {args.output}; restart the API to pick up the new parameters.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# References:
+# OWASP Foundation. (2024). Password storage cheat sheet.
+#       https://cheatsheetseries.owasp.org/cheatsheets/Password_Storage_Cheat_Sheet.html
+# Schlawack, H. (2025). argon2-cffi: Argon2 for Python [Documentation].
+#       https://argon2-cffi.readthedocs.io/
@@ -0,0 +1,166 @@
+# --------------------------------------------
+# Census read API (async, Motor) with ETags
+# --------------------------------------------
+# Lets workstations read the census through the API instead of each holding
+# its own Atlas connection pool:
+#   1. GET /patients      -> every patient in every bay
+#   2. GET /bays/{bay}    -> every bed document in one bay (empty beds included)
+#
+# Both need "Authorization: Bearer <token>". Each response carries an ETag
+# built from the census version counter that database/db_operation.py bumps
+# on every write (one document in the "meta" collection). A poll that sends
+# the ETag back in If-None-Match costs a single _id lookup and gets
+# "304 Not Modified" with no body while nothing changed (IETF, 2022).
+# The last body per path is kept in memory, so after a change only the first
+# workstation's poll re-reads MongoDB. Bodies are gzip-compressed by the
+# middleware installed in auth_api.py (Tiangolo, 2025).
+#
+# Writes that bypass db_operation (e.g. by hand in Compass) do not bump the
+# counter, and a bump can fail after its write landed. So an ETag also carries
+# the current CENSUS_ETAG_MAX_AGE window: every path is re-read from MongoDB at
+# least once per window, and no client keeps getting 304 for stale data
+# longer than that.
+#
+# A bay ETag names the bay by a hash of its name, since quotes, control
+# characters and non-ASCII are not allowed inside an entity-tag (IETF, 2022).
+# ----------------------------
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from security import get_current_user  # Bearer token check (Davis, 2024)
+from config.db_config import get_motor_db  # Shared Motor client (MongoDB Inc., 2025)
+from database.db_operation import (
+    ALL_BAYS, CENSUS_META, CENSUS_VERSION_ID, NON_BAY_COLLECTIONS, PATIENT_FILTER, PATIENTS_COLLECTION,
+    decode_census_versions, get_storage,
+)
+from buslogic.logic import CENSUS_LOAD_FIELDS
+
+router = APIRouter(dependencies=[Depends(get_current_user)])
+
+CENSUS_PROJECTION = {field: 1 for field in CENSUS_LOAD_FIELDS}
+ETAG_MAX_AGE = int(os.getenv("CENSUS_ETAG_MAX_AGE", "60"))   # seconds an ETag stays valid at most
+
+# path -> (etag, encoded body) of the last 200 response
+_bodies = {}
+
+
+async def census_versions():
+    '''(census version, {bay: version}); zeros before the first write.'''
+    return decode_census_versions(await get_motor_db()[CENSUS_META].find_one({"_id": CENSUS_VERSION_ID}))
+
+
+def _bay_token(bay):
+    '''Opaque ETag-safe stand-in for a bay name (which may hold quotes or non-ASCII).'''
+    return hashlib.sha256(bay.encode("utf-8")).hexdigest()[:16]
+
+
+def _window():
+    '''Current ETAG_MAX_AGE window; part of every ETag (see header).'''
+    return int(time.time() // ETAG_MAX_AGE)
+
+
+async def list_bays():
+    '''Bay names in either storage layout (see db_operation.get_storage).'''
+    db = get_motor_db()
+    if get_storage().single_collection:
+        return sorted(bay for bay in await db[PATIENTS_COLLECTION].distinct("bay") if bay)
+    names = await db.list_collection_names(filter={"name": {"$nin": list(NON_BAY_COLLECTIONS)}})
+    return [name for name in names if not name.startswith("system.")]
+
+
+async def find_in_bay(bay, query):
+    storage = get_storage()
+    projection = {**CENSUS_PROJECTION, "bay": 1}
+    cursor = storage.collection(get_motor_db(), bay).find(storage.in_bay(bay, query), projection)
+    docs = await cursor.to_list(length=None)
+    for doc in docs:
+        doc.setdefault("bay", bay)
+    return docs
+
+
+def _json_default(value):
+    '''ObjectId -> str, datetime -> ISO 8601.'''
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _opaque(tag):
+    '''If-None-Match uses weak comparison: W/"x" and "x" match (IETF, 2022).'''
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or _opaque(etag) in [_opaque(tag) for tag in header.split(",")]
+
+
+async def conditional_json(request, etag, load):
+    '''
+    304 if the client already has `etag`; otherwise the body for `etag`
+    (from memory when this worker already built it, else from load()).
+    '''
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}   # always revalidate
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    path = request.url.path
+    cached = _bodies.get(path)
+    if cached is not None and cached[0] == etag:
+        body = cached[1]
+    else:
+        body = json.dumps(await load(), default=_json_default, separators=(",", ":")).encode()
+        _bodies[path] = (etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# ----------------------------
+# Endpoint: All patients
+# ----------------------------
+@router.get("/patients")
+async def all_patients(request: Request):
+    '''Every patient in every bay, with census fields only.'''
+    version, _ = await census_versions()   # read BEFORE the data: a racing write only makes the ETag older
+
+    async def load():
+        if get_storage().single_collection:   # one query over db.patients
+            return {"version": version, "patients": await find_in_bay(ALL_BAYS, PATIENT_FILTER)}
+        bays = await list_bays()
+        per_bay = await asyncio.gather(*(find_in_bay(bay, PATIENT_FILTER) for bay in bays))
+        return {"version": version, "patients": [doc for docs in per_bay for doc in docs]}
+
+    return await conditional_json(request, f'W/"census-{version}-{_window()}"', load)
+
+
+# ----------------------------
+# Endpoint: One bay
+# ----------------------------
+@router.get("/bays/{bay}")
+async def bay_beds(bay: str, request: Request):
+    '''Every bed document in one bay; its ETag only changes when this bay changes.'''
+    if bay in NON_BAY_COLLECTIONS or bay.startswith("system."):
+        raise HTTPException(status_code=404, detail="Unknown bay")
+    (_, bay_versions), bays = await asyncio.gather(census_versions(), list_bays())
+    if bay not in bays:   # before the ETag check, so a stale If-None-Match gets 404 and not 304
+        raise HTTPException(status_code=404, detail="Unknown bay")
+    version = bay_versions.get(bay, 0)
+
+    async def load():
+        return {"bay": bay, "version": version, "beds": await find_in_bay(bay, {})}
+
+    return await conditional_json(request, f'W/"bay-{_bay_token(bay)}-{version}-{_window()}"', load)
+
+# References:
+# Davis, M. P. (2024). python-jose: JWT library for Python. GitHub.
+#       https://github.com/mpdavis/python-jose
+# IETF. (2022). HTTP semantics (RFC 9110), sections 8.8.3 ETag and 13.1.2 If-None-Match.
+#       https://www.rfc-editor.org/rfc/rfc9110
+# MongoDB Inc. (2025). Motor: Asynchronous Python driver for MongoDB.
+#       https://motor.readthedocs.io/
+# Tiangolo, S. (2025). FastAPI documentation: Bigger applications (APIRouter);
+#       Advanced middleware (GZipMiddleware). https://fastapi.tiangolo.com/
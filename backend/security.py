@@ -5,6 +5,7 @@
 #   1. Password hashing (no storage of raw passwords
 #   2. Password verification (bcrypt, checks login attempts)
 #   3. JWT token creation for login sessions (so client knows they are logged in)
+#   4. JWT token verification for protected endpoints (get_current_user)
 #
 # It works together with auth_api.py
 #
@@ -17,10 +18,28 @@
 # Imports
 # ----------------------------
 from passlib.context import CryptContext      # handles hashing of passwords (The Passlib Project, 2024)
-from jose import jwt                          # encodes/decodes JWT access tokens (Davis, 2024)
+from jose import jwt, JWTError                # encodes/decodes JWT access tokens (Davis, 2024)
+from fastapi import Depends, HTTPException, status  # dependency injection for protected routes (Tiangolo, 2025)
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials  # reads "Authorization: Bearer" (Tiangolo, 2025)
+from collections import OrderedDict           # LRU ordering for the verified-token cache (Python Software Foundation, 2025)
 from datetime import datetime, timedelta      # For setting token expiration times (Python Software Foundation, 2025)
 from dotenv import load_dotenv                # For loading secrets from .env file (PyPA, 2025)
+from concurrent.futures import ThreadPoolExecutor  # Runs Argon2 off the event loop (Python Software Foundation, 2025)
+import asyncio                                # For awaiting the hashing pool (Python Software Foundation, 2025)
+import json                                   # For reading calibrated Argon2 parameters (Python Software Foundation, 2025)
+import hashlib                                # SHA-256 for refresh token digests (Python Software Foundation, 2025)
+import hmac                                   # Keyed digests so a leaked DB cannot mint tokens (Python Software Foundation, 2025)
+import secrets                                # Cryptographically random refresh tokens (Python Software Foundation, 2025)
 import os                                     # For accessing environment variables (Python Software Foundation, 2025)
+import threading                              # Guards the token cache (Python Software Foundation, 2025)
+import sys                                    # For making the project root importable (Python Software Foundation, 2025)
+import time                                   # Wall-clock time for token expiry checks (Python Software Foundation, 2025)
+
+# Make the project root importable so we can share config/metrics.py
+# (Python Software Foundation, 2024)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.metrics import METRICS_ENABLED, callback, histogram, timed  # Argon2 timings for /metrics (Prometheus Authors, 2024)
 
 # ----------------------------
 # Setup
@@ -33,16 +52,66 @@ load_dotenv()
 # and provides stronger resistance to GPU-based brute-force attacks.
 # This change also avoids bcrypt's 72-byte password length limit and backend version issues.
 # It is still one of the 4 recoomended password hashing but also the newest one (The Passlib Project, 2024)
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+#
+# Cost parameters come from the file written by calibrate_argon2.py so every node
+# hashes at a measured latency. Without that file passlib's defaults are used.
+# Hashes made with other parameters are flagged by needs_rehash() and upgraded
+# on the next successful login (The Passlib Project, 2024).
+ARGON2_PARAMS_FILE = os.getenv(
+    "ARGON2_PARAMS_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "argon2_params.json"),
+)
+
+
+def load_argon2_params(path: str = ARGON2_PARAMS_FILE) -> dict:
+    '''
+    Read calibrated time_cost / memory_cost / parallelism from the params file.
+    Returns an empty dict when the file does not exist (passlib defaults).
+    '''
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {key: int(data[key]) for key in ("time_cost", "memory_cost", "parallelism") if key in data}
+
+
+ARGON2_PARAMS = load_argon2_params()
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    **{f"argon2__{key}": value for key, value in ARGON2_PARAMS.items()},
+)
 
 # Read JWT settings from .env variable (Davis, 2024)
 SECRET_KEY = os.getenv("JWT_SECRET")           # secret key used to sign tokens
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")# Default algorithm HS256
 ACCESS_TOKEN_EXPIRE_MINUTES = 60              # Token valied for 1-hour
+# Refresh tokens let the client get a new access token without re-sending the
+# password (no Argon2 on refresh). One shift by default (IETF, 2012).
+REFRESH_TOKEN_EXPIRE_HOURS = int(os.getenv("REFRESH_TOKEN_EXPIRE_HOURS", "12"))
+# How many already-verified access tokens to remember (0 disables the cache)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+
+# Argon2 is deliberately CPU and memory heavy. argon2-cffi releases the GIL while
+# hashing, so a small thread pool lets several logins hash in parallel without
+# blocking the event loop (Python Software Foundation, 2025).
+HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_QUEUE_LIMIT = int(os.getenv("AUTH_HASH_QUEUE_LIMIT", "32"))  # waiting jobs before we shed load
+HASH_RETRY_AFTER_SECONDS = int(os.getenv("AUTH_HASH_RETRY_AFTER", "2"))
+
+# Time spent inside Argon2 itself (on a hashing thread), so slow logins can be
+# split into hashing vs. waiting for a free hashing thread vs. everything else
+PASSWORD_HASH_SECONDS = histogram(
+    "bedbuddy_password_hash_seconds", "Argon2 hash/verify time on a hashing thread", ("op",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0))
+PASSWORD_QUEUE_SECONDS = histogram(
+    "bedbuddy_password_queue_seconds", "Wait for a free hashing thread", ("op",))
 
 # ----------------------------
 # Password functions
 # ----------------------------
+@timed(PASSWORD_HASH_SECONDS, "hash")
 def hash_password(password: str) -> str:
     """
     Turn a plain password into a secure bycrupt hash (The Passlib Project, 2024)
@@ -51,6 +120,7 @@ def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
+@timed(PASSWORD_HASH_SECONDS, "verify")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify that a plain password matches the saved bcrypt hash (The Passlib Project, 2024)
@@ -59,6 +129,97 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    '''
+    True when a stored hash was made with different Argon2 parameters than the
+    current configuration, so it should be re-hashed after a successful login.
+    '''
+    return pwd_context.needs_update(hashed_password)
+
+
+# ----------------------------
+# Async password functions (used by the FastAPI handlers)
+# ----------------------------
+class HashingBusyError(Exception):
+    '''Raised when the hashing pool and its queue are full; the API answers 503.'''
+
+    def __init__(self, retry_after: int = HASH_RETRY_AFTER_SECONDS):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+_hash_pool = None
+_hash_inflight = 0   # jobs running or queued in the pool (not awaiting coroutines)
+_hash_inflight_lock = threading.Lock()   # decremented from pool threads when a job finishes
+
+
+def _get_hash_pool() -> ThreadPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="argon2")
+    return _hash_pool
+
+
+callback("bedbuddy_password_hash_inflight", "Hashing jobs running or queued",
+         lambda: {(): _hash_inflight})
+
+
+def _queue_timed(func, op):
+    '''Wrap func so the time between submitting it and a thread picking it up is recorded.'''
+    submitted = time.perf_counter()
+
+    def run(*args):
+        PASSWORD_QUEUE_SECONDS.observe(time.perf_counter() - submitted, op)
+        return func(*args)
+    return run
+
+
+def _hash_done(_future=None):
+    global _hash_inflight
+    with _hash_inflight_lock:
+        _hash_inflight -= 1
+
+
+async def _run_hashing(func, *args, op="hash"):
+    '''
+    Run func(*args) on the hashing pool, or fail fast when the queue is full.
+    A job counts as in flight until the pool finishes it: a cancelled request
+    (client gone) does not stop Argon2, so it must not free its slot early.
+    '''
+    global _hash_inflight
+    with _hash_inflight_lock:
+        if _hash_inflight >= HASH_WORKERS + HASH_QUEUE_LIMIT:
+            raise HashingBusyError()
+        _hash_inflight += 1
+    if METRICS_ENABLED:
+        func = _queue_timed(func, op)
+    try:
+        future = _get_hash_pool().submit(func, *args)
+    except BaseException:
+        _hash_done()
+        raise
+    future.add_done_callback(_hash_done)
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password_async(password: str) -> str:
+    '''hash_password() without blocking the event loop.'''
+    return await _run_hashing(hash_password, password, op="hash")
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    '''verify_password() without blocking the event loop.'''
+    return await _run_hashing(verify_password, plain_password, hashed_password, op="verify")
+
+
+def shutdown_hash_pool():
+    '''Stop the hashing threads (app shutdown).'''
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False)
+        _hash_pool = None
+
+
 # ----------------------------
 # Token functions
 # ----------------------------
@@ -76,12 +237,150 @@ def create_access_token(username: str) -> str:
     token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
     return token
 
+
+def create_refresh_token() -> tuple[str, str]:
+    """
+    Create an opaque refresh token (IETF, 2012).
+    Returns (token, token_hash): the raw token goes to the client once, only
+    the keyed hash is stored, so checking it is one indexed lookup instead of
+    a password hash.
+    """
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+
+def hash_refresh_token(token: str) -> str:
+    """HMAC-SHA256 of a refresh token, keyed with the JWT secret."""
+    return hmac.new(SECRET_KEY.encode(), token.encode(), hashlib.sha256).hexdigest()
+
+
+def refresh_token_expiry() -> datetime:
+    """Expiration time for a newly issued refresh token."""
+    return datetime.utcnow() + timedelta(hours=REFRESH_TOKEN_EXPIRE_HOURS)
+
+
+# ----------------------------
+# Token verification
+# ----------------------------
+class TokenCache:
+    '''
+    Bounded LRU cache of verified access tokens, keyed by the token's SHA-256
+    digest (the raw token is never kept). Entries expire at the token's own
+    'exp', so a cached token is never accepted after it would fail decoding.
+    '''
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # digest -> (claims, exp)
+        self._lock = threading.Lock()
+
+    def get(self, digest: str):
+        '''Return cached claims, or None on a miss or an expired entry.'''
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, digest: str, claims: dict):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[digest] = (claims, claims["exp"])
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)   # drop least recently used
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache()
+callback("bedbuddy_token_cache_lookups_total", "Verified-token cache lookups", lambda: {
+    ("hit",): token_cache.hits, ("miss",): token_cache.misses}, ("result",), kind="counter")
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def _credentials_error(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def decode_access_token(token: str, use_cache: bool = True) -> dict:
+    """
+    Validate a JWT access token and return its claims (Davis, 2024).
+    Tokens seen before are answered from token_cache without re-checking the
+    signature. Raises HTTP 401 if the token is invalid, expired or has no 'sub'.
+    """
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    if use_cache:
+        claims = token_cache.get(digest)
+        if claims is not None:
+            return claims
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise _credentials_error("Invalid or expired token")
+    if not claims.get("sub") or "exp" not in claims:
+        raise _credentials_error("Invalid token claims")
+    if use_cache:
+        token_cache.put(digest, claims)
+    return claims
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+) -> str:
+    """
+    FastAPI dependency for protected endpoints (Tiangolo, 2025):
+
+        @app.get("/patients")
+        async def patients(username: str = Depends(get_current_user)): ...
+
+    Returns the username ('sub') from a valid bearer token.
+    """
+    if credentials is None or credentials.scheme.lower() != "bearer":
+        raise _credentials_error("Not authenticated")
+    return decode_access_token(credentials.credentials)["sub"]
+
+
+def token_cache_stats() -> dict:
+    '''Hit/miss counters of the verified-token cache.'''
+    return token_cache.stats()
+
 # References:
 #     Biryukov, A., Dinu, D., & Khovratovich, D. (2015). 
 #           Argon2: The memory-hard function for password hashing and proof-of-work applications. 
 #           Password Hashing Competition. https://password-hashing.net
+#     IETF. (2012). The OAuth 2.0 authorization framework (RFC 6749), Section 1.5: Refresh token.
+#           https://www.rfc-editor.org/rfc/rfc6749#section-1.5
 #     Davis, M. P. (2024). python-jose: JWT library for Python[Software repositiory].
 #           GitHub. https://github.com/mpdavis/python-jose
+#     Tiangolo, S. (2025). FastAPI documentation: Security — OAuth2 with password and JWT tokens.
+#           https://fastapi.tiangolo.com/tutorial/security/
 #     The Passlib Project. (2024). Passlib: Password hashing framework for Python. 
 #           https://passlib.readthedocs.io/
 #     PyPA. (2025). python-dotenv [Software package]. PyPI. 
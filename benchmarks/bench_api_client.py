@@ -0,0 +1,62 @@
+# --------------------------------------------
+# API client latency: new connection per call vs pooled keep-alive session
+# --------------------------------------------
+# Makes N sequential GET /health calls with module-level requests.get (a new
+# TCP connection, and TLS handshake for https, every time, as the login
+# window used to) and then with the shared ApiClient, and compares latency.
+# Needs a running API:
+#
+#   cd backend && uvicorn auth_api:app
+#   python -m benchmarks.bench_api_client --calls 100
+#   BEDBUDDY_API_URL=https://api.example.org python -m benchmarks.bench_api_client
+# ----------------------------
+import argparse
+import statistics
+import time
+
+import requests
+
+from ui.api_client import API_URL, ApiClient
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def timed_calls(call, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = call()
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise SystemExit(f"unexpected {response.status_code}: {response.text}")
+    return latencies
+
+
+def report(label, latencies):
+    print(f"{label:<28} {sum(latencies):>9.0f} {statistics.mean(latencies):>8.2f} "
+          f"{percentile(latencies, 50):>8.2f} {percentile(latencies, 99):>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API client latency benchmark")
+    parser.add_argument("--url", default=API_URL)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--path", default="/health")
+    args = parser.parse_args()
+
+    url = f"{args.url.rstrip('/')}{args.path}"
+    client = ApiClient(args.url)
+    client.get(args.path)   # the server's own first-request warm-up is not what we measure
+
+    print(f"{args.calls} sequential GET {args.path}")
+    print(f"{'':<28} {'total ms':>9} {'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    report("requests.get (new conn)", timed_calls(lambda: requests.get(url, timeout=15), args.calls))
+    report("ApiClient (keep-alive)", timed_calls(lambda: client.get(args.path), args.calls))
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# --------------------------------------------
+# Bed assignment replay: a simulated 24-hour ED day
+# --------------------------------------------
+# Replays a seeded day of arrivals (priority mix, isolation needs, bay
+# preferences, length of stay by priority) through BedAssigner and reports
+# engine latency per event plus patient wait times. No database needed:
+#
+#   python -m benchmarks.bench_assignment --arrivals 2000 --bays 16 --beds-per-bay 14
+# ----------------------------
+import argparse
+import heapq
+import random
+import statistics
+import time
+
+from buslogic.assignment import BedAssigner
+
+PRIORITY_WEIGHTS = {1: 0.05, 2: 0.15, 3: 0.40, 4: 0.30, 5: 0.10}
+MEAN_STAY_MINUTES = {1: 360, 2: 300, 3: 240, 4: 150, 5: 90}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def simulate(arrivals, bays, beds_per_bay, isolation_per_bay, seed):
+    rng = random.Random(seed)
+    assigner = BedAssigner()
+    bay_names = [f"bay{b}" for b in range(bays)]
+    for bay in bay_names:
+        for n in range(1, beds_per_bay + 1):
+            assigner.add_bed(bay, f"B{n}", isolation=n <= isolation_per_bay)
+
+    # event queue: (time, order, kind, payload)
+    events, order = [], 0
+    day = 24 * 60
+    priorities, weights = zip(*PRIORITY_WEIGHTS.items())
+    for i in range(arrivals):
+        t = rng.uniform(0, day)
+        patient = {
+            "id": i,
+            "priority": rng.choices(priorities, weights)[0],
+            "isolation": rng.random() < 0.08,
+            "bay": rng.choice(bay_names) if rng.random() < 0.3 else None,
+            "arrival": t,
+        }
+        heapq.heappush(events, (t, order, "arrive", patient))
+        order += 1
+
+    patients = {}
+    waits, latencies_ns = [], []
+
+    def admitted(assignment, now):
+        nonlocal order
+        patient = patients[assignment.patient_id]
+        waits.append((patient["priority"], now - patient["arrival"]))
+        stay = rng.expovariate(1 / MEAN_STAY_MINUTES[patient["priority"]])
+        heapq.heappush(events, (now + stay, order, "discharge", (assignment.bay, assignment.bed_id)))
+        order += 1
+
+    while events:
+        now, _, kind, payload = heapq.heappop(events)
+        if kind == "arrive":
+            patients[payload["id"]] = payload
+            start = time.perf_counter_ns()
+            assignment = assigner.arrive(payload["id"], payload["priority"], now,
+                                         isolation=payload["isolation"], preferred_bay=payload["bay"])
+            latencies_ns.append(time.perf_counter_ns() - start)
+        else:
+            start = time.perf_counter_ns()
+            assignment = assigner.release(*payload)
+            latencies_ns.append(time.perf_counter_ns() - start)
+        if assignment is not None:
+            admitted(assignment, now)
+    return waits, latencies_ns, assigner.waiting_count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bed assignment replay benchmark")
+    parser.add_argument("--arrivals", type=int, default=2000)
+    parser.add_argument("--bays", type=int, default=16)
+    parser.add_argument("--beds-per-bay", type=int, default=14)
+    parser.add_argument("--isolation-per-bay", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    waits, latencies_ns, still_waiting = simulate(
+        args.arrivals, args.bays, args.beds_per_bay, args.isolation_per_bay, args.seed)
+    total = time.perf_counter() - start
+
+    latencies_us = [ns / 1000 for ns in latencies_ns]
+    print(f"replayed {len(latencies_ns)} events ({args.arrivals} arrivals) in {total * 1000:.1f} ms")
+    print(f"engine latency: p50={percentile(latencies_us, 50):.1f} us  "
+          f"p99={percentile(latencies_us, 99):.1f} us  max={max(latencies_us):.1f} us")
+    print(f"placed {len(waits)} patients, {still_waiting} still waiting at end of replay")
+    print(f"{'priority':>8} {'placed':>7} {'median wait min':>16} {'p90 wait min':>13}")
+    for priority in sorted(PRIORITY_WEIGHTS):
+        values = [w for p, w in waits if p == priority]
+        if values:
+            print(f"{priority:>8} {len(values):>7} {statistics.median(values):>16.1f} {percentile(values, 90):>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# --------------------------------------------
+# Bay switch benchmark: Frame/Label per bed vs BayCanvas
+# --------------------------------------------
+# "Before" rebuilds the bay the way show_bay used to (destroy every child,
+# then one Frame + Labels + bindings per bed in a 3-column grid). "After"
+# renders the same beds on one pooled BayCanvas. Switches alternate between
+# bays so every switch changes what is shown; a second pass re-renders the
+# same bay (a live-update redraw, where BayCanvas redraws nothing).
+# Needs a display; on a headless machine run it under Xvfb:
+#
+#   xvfb-run python -m benchmarks.bench_bay_switch --beds 12 40 80
+# ----------------------------
+import argparse
+import random
+import statistics
+import time
+import tkinter as tk
+
+from buslogic.logic import Census, Patient
+from ui.bay_canvas import BayCanvas
+
+
+def make_census(bays, beds, seed):
+    rng = random.Random(seed)
+    census = Census()
+    for b in range(bays):
+        bay = f"bay{b}"
+        for n in range(1, beds + 1):
+            census.add_bed(bay, f"B{n}")
+            if rng.random() < 0.7:
+                patient = Patient(f"{bay}-{n}", f"First{n}", f"Last{n}", priority=rng.randint(1, 5))
+                census.admit(patient, bay, f"B{n}")
+    return census
+
+
+def frame_switch(frame, beds):
+    '''The pre-canvas show_bay: destroy and rebuild every bed widget.'''
+    for widget in frame.winfo_children():
+        widget.destroy()
+    for index, b in enumerate(beds):
+        patient = b.patient
+        f = tk.Frame(frame, width=80, height=100, bg="white", bd=1, relief="solid")
+        f.pack_propagate(False)
+        tk.Label(f, text=b.bed_id, bg="white", font=("Arial", 10)).pack(side="bottom", pady=5)
+        f.bind("<Button-1>", lambda event: None)
+        if patient is not None:
+            icon = tk.Label(f, text="\U0001F464", fg=patient.color, bg="darkgray", font=("Arial", 25))
+            icon.pack(side="top", pady=5)
+            icon.bind("<Button-1>", lambda event: None)
+        row, col = divmod(index, 3)
+        f.grid(row=row, column=col, padx=15, pady=15)
+
+
+def timed(root, fn, repeats):
+    samples = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(i)
+        root.update()   # include Tk's own layout and redraw work
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bay switch benchmark")
+    parser.add_argument("--beds", type=int, nargs="+", default=[12, 40, 80])
+    parser.add_argument("--bays", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    root.geometry("400x800")
+    print(f"{'beds':>5} {'frames switch ms':>17} {'canvas switch ms':>17} "
+          f"{'frames redraw ms':>17} {'canvas redraw ms':>17}")
+    for count in args.beds:
+        census = make_census(args.bays, count, args.seed)
+        bays = census.bays()
+
+        def bay_beds(i):
+            return census.beds(bays[i % len(bays)])
+
+        frame = tk.Frame(root, bg="lightgray")
+        frame.pack(fill="both", expand=True)
+        frame_switch_ms = timed(root, lambda i: frame_switch(frame, bay_beds(i)), args.repeats)
+        frame_redraw_ms = timed(root, lambda i: frame_switch(frame, bay_beds(0)), args.repeats)
+        frame.destroy()
+
+        canvas = BayCanvas(root, width=330)
+        canvas.pack(fill="both", expand=True)
+        canvas.render(bay_beds(0))   # slots are created once; later switches re-use them
+        canvas_switch_ms = timed(root, lambda i: canvas.render(bay_beds(i + 1), keep_selection=False),
+                                 args.repeats)
+        canvas.render(bay_beds(0))
+        canvas_redraw_ms = timed(root, lambda i: canvas.render(bay_beds(0)), args.repeats)
+        canvas.destroy()
+
+        print(f"{count:>5} {frame_switch_ms:>17.2f} {canvas_switch_ms:>17.2f} "
+              f"{frame_redraw_ms:>17.2f} {canvas_redraw_ms:>17.2f}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# --------------------------------------------
+# Batch write benchmark: 1k operations batched vs one at a time
+# --------------------------------------------
+# Against a LOCAL mongod (the bench database is dropped afterwards):
+#
+#   python -m benchmarks.bench_bulk_writes --ops 1000 --bays 20
+#   python -m benchmarks.bench_bulk_writes --moves   # needs a replica set (transactions)
+# ----------------------------
+import argparse
+import os
+import random
+import time
+
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017")
+BENCH_DB_NAME = os.getenv("BENCH_DB_NAME", "bedbuddy_bench")
+os.environ["MONGO_URI"] = BENCH_MONGO_URI
+os.environ["DB_NAME"] = BENCH_DB_NAME
+
+from config.db_config import get_db  # noqa: E402
+from database import db_operation  # noqa: E402
+
+
+def make_patients(count, bays, seed=7):
+    rng = random.Random(seed)
+    return [{
+        "bay": f"bay{rng.randrange(bays):02d}",
+        "bed": f"B{rng.randrange(1, 41)}",
+        "first_name": f"First{i}",
+        "last_name": f"Last{i}",
+        "dob": "1980-05-05",
+        "priority": rng.randint(1, 5),
+    } for i in range(count)]
+
+
+def timed(label, fn, ops):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1000:>9.1f} ms  {ops / elapsed:>10,.0f} ops/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch write benchmark")
+    parser.add_argument("--ops", type=int, default=1000)
+    parser.add_argument("--bays", type=int, default=20)
+    parser.add_argument("--moves", action="store_true", help="also benchmark cross-bay moves")
+    args = parser.parse_args()
+
+    db = get_db()
+    db.client.drop_database(db.name)
+    try:
+        single = make_patients(args.ops, args.bays)
+        batch = make_patients(args.ops, args.bays)
+
+        timed("insert_patient x N", lambda: [db_operation.insert_patient(p) for p in single], args.ops)
+        timed("insert_patients (batched)", lambda: db_operation.insert_patients(batch), args.ops)
+
+        if args.moves:
+            rng = random.Random(11)
+            def moves_for(patients):
+                return [{"_id": p["_id"], "from_bay": p["bay"],
+                         "to_bay": f"bay{rng.randrange(args.bays):02d}", "bed": "B1"} for p in patients]
+            single_moves, batch_moves = moves_for(single), moves_for(batch)
+            timed("move_patients x N (one each)",
+                  lambda: [db_operation.move_patients([m]) for m in single_moves], args.ops)
+            timed("move_patients (batched)", lambda: db_operation.move_patients(batch_moves), args.ops)
+            for patients, moves in ((single, single_moves), (batch, batch_moves)):
+                for p, m in zip(patients, moves):
+                    p["bay"] = m["to_bay"]
+
+        timed("delete_patient x N", lambda: [db_operation.delete_patient(p) for p in single], args.ops)
+        timed("discharge_patients (batched)", lambda: db_operation.discharge_patients(batch), args.ops)
+    finally:
+        db.client.drop_database(db.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# --------------------------------------------
+# Census load benchmark: sequential vs concurrent loader
+# --------------------------------------------
+# Seeds a throwaway database on a LOCAL mongod with 10, 100 and 500 bays and
+# times the original one-find-per-bay loop against get_all_patients().
+#
+# Usage (from the project root, with mongod running on localhost):
+#   python -m benchmarks.bench_census
+#   python -m benchmarks.bench_census --bays 10 100 --patients 8 --repeat 5
+#
+# Never point BENCH_MONGO_URI at Atlas: the database is dropped afterwards.
+# ----------------------------
+import argparse
+import os
+import statistics
+import time
+
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017")
+BENCH_DB_NAME = os.getenv("BENCH_DB_NAME", "bedbuddy_bench")
+
+# db_operation binds to MONGO_URI/DB_NAME at import, so point it at the bench db first
+os.environ["MONGO_URI"] = BENCH_MONGO_URI
+os.environ["DB_NAME"] = BENCH_DB_NAME
+
+from config.db_config import get_db  # noqa: E402
+from database import db_operation  # noqa: E402
+from database.db_operation import PATIENT_FILTER, CENSUS_FIELDS  # noqa: E402
+
+
+def seed(db, bays, patients_per_bay):
+    """Drop the bench database and create `bays` bay collections."""
+    db.client.drop_database(db.name)
+    for b in range(bays):
+        docs = []
+        for p in range(patients_per_bay):
+            docs.append({
+                "first_name": f"First{b}_{p}",
+                "last_name": f"Last{b}_{p}",
+                "bed": f"B{p + 1}",
+                "dob": "1970-01-01",
+                "priority": p % 5 + 1,
+                "notes": "x" * 512,  # padding so projection savings are visible
+            })
+        db[f"bay{b:03d}"].insert_many(docs)
+
+
+def sequential_loader(db):
+    """The original get_all_patients(): one blocking find per bay."""
+    all_patients = []
+    for bay in db.list_collection_names():
+        all_patients += list(db[bay].find(PATIENT_FILTER))
+    return all_patients
+
+
+def time_call(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Census load benchmark")
+    parser.add_argument("--bays", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--patients", type=int, default=6, help="patients per bay")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db = get_db()
+    print(f"{'bays':>6} {'sequential ms':>14} {'concurrent ms':>14} {'+projection ms':>15} {'cached ms':>10}")
+    try:
+        for bays in args.bays:
+            seed(db, bays, args.patients)
+            db_operation.refresh()
+            old = time_call(lambda: sequential_loader(db), args.repeat)
+            new = time_call(lambda: db_operation.get_all_patients(use_cache=False), args.repeat)
+            projected = time_call(
+                lambda: db_operation.get_all_patients(projection=CENSUS_FIELDS, use_cache=False), args.repeat
+            )
+            cached = time_call(lambda: db_operation.get_all_patients(projection=CENSUS_FIELDS), args.repeat)
+            print(f"{bays:>6} {old:>14.1f} {new:>14.1f} {projected:>15.1f} {cached:>10.1f}")
+    finally:
+        db.client.drop_database(db.name)
+
+
+if __name__ == "__main__":
+    main()
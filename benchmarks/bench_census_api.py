@@ -0,0 +1,90 @@
+# --------------------------------------------
+# Census API load test: requests/sec with and without If-None-Match
+# --------------------------------------------
+# N concurrent "workstations" poll GET /patients (or /bays/<bay>) for a fixed
+# time, first as full reads (no ETag sent) and then as conditional polls
+# (ETag sent back, so an unchanged census answers 304). Reports requests/sec
+# per API worker and latency percentiles. Run the API with a known worker
+# count and pass the same number here:
+#
+#   cd backend && uvicorn auth_api:app --workers 1
+#   python -m benchmarks.bench_census_api --users 20 --seconds 10 --api-workers 1
+# ----------------------------
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def get_token(base_url, username, password):
+    requests.post(f"{base_url}/auth/register", json={"username": username, "password": password}, timeout=30)
+    resp = requests.post(f"{base_url}/auth/login", json={"username": username, "password": password}, timeout=30)
+    resp.raise_for_status()
+    return resp.json()["access_token"]
+
+
+def poll(url, token, conditional, stop):
+    '''One workstation polling on a kept-alive session until `stop` is set.'''
+    latencies, statuses, body_bytes = [], {}, 0
+    etag = None
+    with requests.Session() as session:
+        session.headers.update({"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"})
+        while not stop.is_set():
+            headers = {"If-None-Match": etag} if conditional and etag else {}
+            start = time.perf_counter()
+            resp = session.get(url, headers=headers, timeout=30)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[resp.status_code] = statuses.get(resp.status_code, 0) + 1
+            body_bytes += int(resp.headers.get("Content-Length", 0))   # on-the-wire (compressed) size
+            etag = resp.headers.get("ETag", etag)
+    return latencies, statuses, body_bytes
+
+
+def run(url, token, users, seconds, conditional):
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        futures = [pool.submit(poll, url, token, conditional, stop) for _ in range(users)]
+        time.sleep(seconds)
+        stop.set()
+        results = [f.result() for f in futures]
+    latencies = [ms for r in results for ms in r[0]]
+    statuses = {}
+    for _, counts, _ in results:
+        for code, n in counts.items():
+            statuses[code] = statuses.get(code, 0) + n
+    return latencies, statuses, sum(r[2] for r in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Census API load test")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", default="/patients", help="/patients or /bays/<bay>")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--api-workers", type=int, default=1, help="uvicorn --workers of the API under test")
+    parser.add_argument("--username", default="bench_user")
+    parser.add_argument("--password", default="bench-password-123")
+    args = parser.parse_args()
+
+    token = get_token(args.url, args.username, args.password)
+    url = f"{args.url}{args.path}"
+    print(f"GET {args.path}, {args.users} users, {args.seconds:.0f} s each, {args.api_workers} API worker(s)")
+    print(f"{'mode':<14} {'req/s/worker':>13} {'p50 ms':>8} {'p99 ms':>8} {'KB/req':>8}  statuses")
+    for label, conditional in (("full read", False), ("If-None-Match", True)):
+        latencies, statuses, body_bytes = run(url, token, args.users, args.seconds, conditional)
+        total = len(latencies)
+        print(f"{label:<14} {total / args.seconds / args.api_workers:>13.0f} "
+              f"{statistics.median(latencies):>8.2f} {percentile(latencies, 99):>8.2f} "
+              f"{body_bytes / max(total, 1) / 1024:>8.1f}  {dict(sorted(statuses.items()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# --------------------------------------------
+# Census model benchmark at 5k beds
+# --------------------------------------------
+# Compares the indexed Census lookups against the old approach (linear scan
+# over bay -> list of bed tuples, filtering on color strings) and times the
+# incremental admit / move / discharge updates. No database needed:
+#
+#   python -m benchmarks.bench_census_model --beds 5000 --bays 100
+# ----------------------------
+import argparse
+import random
+import time
+
+from buslogic.logic import Census, Patient, PRIORITY_COLORS
+
+
+def build(beds, bays, occupancy, seed=3):
+    rng = random.Random(seed)
+    per_bay = beds // bays
+    docs, tuples = [], {}
+    next_id = 0
+    for b in range(bays):
+        bay = f"bay{b:03d}"
+        tuples[bay] = []
+        for n in range(1, per_bay + 1):
+            if rng.random() < occupancy:
+                next_id += 1
+                priority = rng.randint(1, 5)
+                docs.append({"_id": next_id, "bay": bay, "bed": f"B{n}", "first_name": f"F{next_id}",
+                             "last_name": f"L{next_id}", "priority": priority})
+                tuples[bay].append((f"B{n}", PRIORITY_COLORS[priority], True, f"F{next_id} L{next_id}"))
+            else:
+                docs.append({"_id": f"empty-{bay}-{n}", "bay": bay, "bed": f"B{n}"})
+                tuples[bay].append((f"B{n}", "white", False, None))
+    return docs, tuples
+
+
+def per_call_us(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Census model benchmark")
+    parser.add_argument("--beds", type=int, default=5000)
+    parser.add_argument("--bays", type=int, default=100)
+    parser.add_argument("--occupancy", type=float, default=0.8)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    docs, tuples = build(args.beds, args.bays, args.occupancy)
+    start = time.perf_counter()
+    census = Census.from_documents(docs)
+    print(f"build {len(docs)} beds: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    bay = census.bays()[args.bays // 2]
+    occupied_colors = set(PRIORITY_COLORS.values())
+    scans = {
+        "occupied beds in one bay": (
+            lambda: [t for t in tuples[bay] if t[2] and t[1] in occupied_colors],
+            lambda: census.occupied_beds(bay)),
+        "all priority-1 patients": (
+            lambda: [t for beds in tuples.values() for t in beds if t[2] and t[1] == PRIORITY_COLORS[1]],
+            lambda: census.patients_with_priority(1)),
+        "all free beds": (
+            lambda: [t for beds in tuples.values() for t in beds if not t[2]],
+            lambda: census.free_beds()),
+        "all occupied beds": (
+            lambda: [t for beds in tuples.values() for t in beds if t[2]],
+            lambda: census.occupied_beds()),
+    }
+    print(f"{'query':<28} {'linear scan us':>15} {'indexed us':>12}")
+    for label, (scan, indexed) in scans.items():
+        print(f"{label:<28} {per_call_us(scan, args.repeat):>15.1f} {per_call_us(indexed, args.repeat):>12.1f}")
+
+    # incremental updates
+    rng = random.Random(5)
+    ops = 2000
+    start = time.perf_counter()
+    for i in range(ops):
+        free = census.free_beds(rng.choice(census.bays()))
+        if not free:
+            continue
+        target = free[0]
+        patient = census.admit(Patient(f"new{i}", "A", "B", priority=rng.randint(1, 5)),
+                               target.bay, target.bed_id)
+        other = census.free_beds(rng.choice(census.bays()))
+        if other:
+            census.move(patient.id, other[0].bay, other[0].bed_id)
+        census.discharge(patient.id)
+    elapsed = time.perf_counter() - start
+    print(f"admit+move+discharge: {elapsed / ops * 1e6:.1f} us per cycle ({ops} cycles)")
+
+
+if __name__ == "__main__":
+    main()
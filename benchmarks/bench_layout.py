@@ -0,0 +1,108 @@
+# --------------------------------------------
+# Storage layout benchmark: collection-per-bay vs single patients collection
+# --------------------------------------------
+# Seeds a throwaway database on a LOCAL mongod in the per-bay layout, copies
+# it into db.patients with the migration tool's backfill, then times under
+# each layout:
+#   - census load (get_all_patients, cache off)
+#   - one bay's patients (get_bay_patients)
+#   - a batch of cross-bay moves (move_patients)
+# Cross-bay moves in the per-bay layout use transactions, so mongod must run
+# as a replica set (mongod --replSet rs0, then rs.initiate()); --moves 0 skips them.
+#
+#   python -m benchmarks.bench_layout --bays 20 100 --patients 20 --moves 200
+#
+# Never point BENCH_MONGO_URI at Atlas: the database is dropped afterwards.
+# ----------------------------
+import argparse
+import os
+import random
+import statistics
+import time
+
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017/?replicaSet=rs0")
+BENCH_DB_NAME = os.getenv("BENCH_DB_NAME", "bedbuddy_bench")
+
+# db_operation binds to MONGO_URI/DB_NAME at import, so point it at the bench db first
+os.environ["MONGO_URI"] = BENCH_MONGO_URI
+os.environ["DB_NAME"] = BENCH_DB_NAME
+
+from config.db_config import get_db  # noqa: E402
+from database import db_operation  # noqa: E402
+from database.db_operation import CENSUS_FIELDS, PATIENTS_COLLECTION  # noqa: E402
+from database.indexes import BAY_INDEXES, PATIENTS_INDEXES  # noqa: E402
+from database.migrate_layout import backfill_bay  # noqa: E402
+
+
+def seed(db, bays, patients_per_bay):
+    db.client.drop_database(db.name)
+    names = [f"bay{b:03d}" for b in range(bays)]
+    for b, bay in enumerate(names):
+        db[bay].insert_many([{
+            "first_name": f"First{b}_{p}",
+            "last_name": f"Last{b}_{p}",
+            "bed": f"B{p + 1}",
+            "dob": "1970-01-01",
+            "priority": p % 5 + 1,
+            "bay": bay,
+        } for p in range(patients_per_bay)])
+        db[bay].create_indexes(BAY_INDEXES)
+    db[PATIENTS_COLLECTION].create_indexes(PATIENTS_INDEXES)
+    for bay in names:
+        backfill_bay(db, bay)
+    return names
+
+
+def time_call(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def make_moves(db, bays, count, seed):
+    rng = random.Random(seed)
+    docs = list(db[PATIENTS_COLLECTION].find({}, {"bay": 1}))
+    moves = []
+    for doc in rng.sample(docs, min(count, len(docs))):
+        to_bay = rng.choice([bay for bay in bays if bay != doc["bay"]])
+        moves.append({"_id": doc["_id"], "from_bay": doc["bay"], "to_bay": to_bay, "bed": "B999"})
+    return moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage layout benchmark")
+    parser.add_argument("--bays", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--patients", type=int, default=20, help="patients per bay")
+    parser.add_argument("--moves", type=int, default=200, help="cross-bay moves per layout (0 skips)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    db = get_db()
+    print(f"{'bays':>5} {'layout':>8} {'census ms':>10} {'one bay ms':>11} {'moves ms':>9} {'moved':>6}")
+    try:
+        for bay_count in args.bays:
+            bays = seed(db, bay_count, args.patients)
+            moves = make_moves(db, bays, args.moves, bay_count)
+            for layout in ("per_bay", "single"):
+                db_operation.set_storage(layout)
+                census = time_call(lambda: db_operation.get_all_patients(
+                    projection=CENSUS_FIELDS, use_cache=False), args.repeat)
+                one_bay = time_call(lambda: db_operation.get_bay_patients(
+                    bays[0], projection=CENSUS_FIELDS, use_cache=False), args.repeat)
+                moved, move_ms = 0, 0.0
+                if moves:
+                    start = time.perf_counter()
+                    results = db_operation.move_patients([dict(m) for m in moves])
+                    move_ms = (time.perf_counter() - start) * 1000
+                    moved = sum(result["ok"] for result in results)
+                print(f"{bay_count:>5} {layout:>8} {census:>10.1f} {one_bay:>11.2f} {move_ms:>9.1f} {moved:>6}")
+    finally:
+        db_operation.set_storage(db_operation.PATIENT_STORAGE)
+        db.client.drop_database(db.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# --------------------------------------------
+# Login load test: p50/p99 latency at N concurrent users
+# --------------------------------------------
+# Fires /auth/login from N concurrent "workstations" against a running API and
+# reports latency percentiles and throughput. Run it once against the old
+# build and once against the new one (same host, same worker count):
+#
+#   cd backend && uvicorn auth_api:app --workers 1
+#   python -m benchmarks.bench_login --users 50 --rounds 10
+#
+# 503 responses (hashing queue full) are counted separately, not as latency.
+# ----------------------------
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def ensure_user(base_url, username, password):
+    resp = requests.post(f"{base_url}/auth/register",
+                         json={"username": username, "password": password}, timeout=30)
+    if resp.status_code not in (201, 400):  # 400 = already registered
+        raise SystemExit(f"register failed: {resp.status_code} {resp.text}")
+
+
+def user_session(base_url, username, password, rounds):
+    """One simulated workstation: `rounds` sequential logins on a kept-alive session."""
+    latencies, rejected = [], 0
+    with requests.Session() as session:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            resp = session.post(f"{base_url}/auth/login",
+                                json={"username": username, "password": password}, timeout=60)
+            elapsed = (time.perf_counter() - start) * 1000
+            if resp.status_code == 200:
+                latencies.append(elapsed)
+            elif resp.status_code == 503:
+                rejected += 1
+            else:
+                raise RuntimeError(f"login failed: {resp.status_code} {resp.text}")
+    return latencies, rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login load test")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=50, help="concurrent users")
+    parser.add_argument("--rounds", type=int, default=10, help="logins per user")
+    parser.add_argument("--username", default="bench_user")
+    parser.add_argument("--password", default="bench-password-123")
+    args = parser.parse_args()
+
+    ensure_user(args.url, args.username, args.password)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        results = list(pool.map(
+            lambda _: user_session(args.url, args.username, args.password, args.rounds),
+            range(args.users),
+        ))
+    wall = time.perf_counter() - start
+
+    latencies = [ms for user_latencies, _ in results for ms in user_latencies]
+    rejected = sum(r for _, r in results)
+    if not latencies:
+        raise SystemExit("no successful logins")
+    print(f"users={args.users} logins={len(latencies)} rejected(503)={rejected} wall={wall:.2f}s")
+    print(f"p50={percentile(latencies, 50):.1f} ms  p99={percentile(latencies, 99):.1f} ms  "
+          f"mean={statistics.mean(latencies):.1f} ms  throughput={len(latencies) / wall:.1f} logins/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# --------------------------------------------
+# Patient search benchmark: prefix index vs scanning every patient
+# --------------------------------------------
+# Builds a synthetic census (benchmarks/synthetic.py) and replays typing:
+# every prefix of a set of realistic queries (names, "bay bed", MRN digits)
+# is one keystroke. Reports per-keystroke time for Census.search (with the
+# dashboard's result limit) and for a naive filter over every patient, plus
+# the cost of keeping the index current on admit / move / discharge.
+# No database or display needed.
+#
+#   python -m benchmarks.bench_search --patients 10000
+# ----------------------------
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.synthetic import generate_census, with_ids
+from buslogic.logic import Census, Patient
+from buslogic.search import query_terms
+
+TARGET_MS = 5.0
+RESULT_LIMIT = 200   # BedBuddy.SEARCH_RESULT_LIMIT
+
+
+def naive_search(census, query, limit=None):
+    '''What a Treeview filter without an index does: test every patient on every keystroke.'''
+    terms = query_terms(query)
+    results = []
+    for patient in census.patients():
+        fields = [str(value).casefold() for value in (patient.first_name, patient.last_name,
+                                                      patient.mrn, patient.bay, patient.bed) if value]
+        if all(any(field.startswith(term) for field in fields) for term in terms):
+            results.append(patient)
+            if limit is not None and len(results) >= limit:
+                break
+    return results
+
+
+def keystrokes(census, rng, count):
+    '''Every prefix of `count` queries built from real patients.'''
+    patients = [p for p in census.patients() if p.bed]
+    queries = []
+    for _ in range(count):
+        p = rng.choice(patients)
+        queries.append(rng.choice([
+            p.last_name,
+            f"{p.first_name} {p.last_name}",
+            f"{p.bay} {p.bed}",
+            p.mrn[3:],
+            f"{p.last_name[:3]} {p.bay[:4]}",
+        ]))
+    return [query[:n] for query in queries for n in range(1, len(query) + 1)]
+
+
+def time_each(fn, inputs):
+    samples = []
+    for value in inputs:
+        start = time.perf_counter()
+        fn(value)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summary(samples):
+    ordered = sorted(samples)
+    return (statistics.median(ordered), ordered[int(0.99 * (len(ordered) - 1))], ordered[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Patient search benchmark")
+    parser.add_argument("--patients", type=int, default=10000)
+    parser.add_argument("--beds-per-bay", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    bays = max(1, args.patients // args.beds_per_bay)
+    docs = generate_census(args.seed, bays=bays, beds_per_bay=args.beds_per_bay, occupancy=0.95)
+    census = Census.from_documents(with_ids(docs))
+    start = time.perf_counter()
+    census.build_search_index()
+    build_ms = (time.perf_counter() - start) * 1000
+    rng = random.Random(args.seed)
+    typed = keystrokes(census, rng, args.queries)
+    print(f"{len(census)} patients in {bays} bays, index built in {build_ms:.0f} ms, {len(typed)} keystrokes")
+
+    print(f"{'per keystroke':<30} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, fn in (
+        (f"prefix index (limit {RESULT_LIMIT})", lambda q: census.search(q, limit=RESULT_LIMIT)),
+        ("prefix index (no limit)", census.search),
+        (f"naive scan (limit {RESULT_LIMIT})", lambda q: naive_search(census, q, limit=RESULT_LIMIT)),
+        ("naive scan (no limit)", lambda q: naive_search(census, q)),
+    ):
+        p50, p99, worst = summary(time_each(fn, typed))
+        print(f"{label:<30} {p50:>8.3f} {p99:>8.3f} {worst:>8.3f}")
+
+    # Keeping the index current: admit into a free bed, move, discharge
+    free = [(bed.bay, bed.bed_id) for bed in census.free_beds()]
+    updates = []
+    for n in range(min(500, len(free) // 2)):
+        patient = Patient(f"bench-{n}", rng.choice(["Ana", "Ben", "Cai"]), f"Bench{n}", mrn=f"MRN9{n:06d}")
+        start = time.perf_counter()
+        census.admit(patient, *free[2 * n])
+        census.move(patient.id, *free[2 * n + 1])
+        census.discharge(patient.id)
+        updates.append((time.perf_counter() - start) * 1000 / 3)
+    if updates:
+        p50, p99, worst = summary(updates)
+        print(f"{'index update (admit/move/dc)':<30} {p50:>8.3f} {p99:>8.3f} {worst:>8.3f}")
+
+    p99 = summary(time_each(lambda q: census.search(q, limit=RESULT_LIMIT), typed))[1]
+    print(f"target: p99 under {TARGET_MS} ms per keystroke -> {'PASS' if p99 < TARGET_MS else 'FAIL'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# --------------------------------------------
+# Cold start profile: time to first window + import breakdown
+# --------------------------------------------
+# Launches the login window (or main.py) in a fresh interpreter with
+# BEDBUDDY_PROFILE_STARTUP=1 and -X importtime. The app prints a timestamp
+# once its window is drawn and exits (ui/startup.py), so each run measures
+# interpreter start -> imports -> window visible. Reports the median over
+# several runs, the slowest imports, and whether any heavy module (fastapi,
+# pymongo, requests, ...) was imported before the window showed.
+# Needs a display; on a headless machine run it under Xvfb:
+#
+#   xvfb-run python -m benchmarks.bench_startup --target login --runs 5
+# ----------------------------
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from ui.startup import STARTUP_PROFILE_ENV, WINDOW_VISIBLE_MARKER
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGETS = {
+    "login": ["-m", "Login.LoginApp"],
+    "main": ["main.py"],
+}
+HEAVY_MODULES = ("fastapi", "starlette", "pydantic", "pymongo", "motor", "requests", "passlib", "jose")
+TARGET_MS = 300
+
+
+def launch(target):
+    '''One cold start. Returns (ms to first window, parse_importtime(...)).'''
+    env = dict(os.environ, **{STARTUP_PROFILE_ENV: "1"})
+    start = time.time()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *TARGETS[target]],
+                          cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+    visible = None
+    for line in proc.stdout.splitlines():
+        if line.startswith(WINDOW_VISIBLE_MARKER):
+            visible = float(line.split()[1])
+    if visible is None:
+        raise RuntimeError(f"{target} did not report a window:\n{proc.stderr[-2000:]}")
+    return (visible - start) * 1000, parse_importtime(proc.stderr)
+
+
+def parse_importtime(stderr):
+    '''
+    "import time: self [us] | cumulative | imported package" lines ->
+    {module: cumulative us} for top-level imports, plus the set of every module imported.
+    '''
+    top, everything = {}, set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, raw = line[len("import time:"):].split("|")
+        name = raw.strip()
+        everything.add(name.split(".")[0])
+        if len(raw) - len(raw.lstrip()) == 1:   # one space after "|" = imported by the app itself
+            top[name] = int(cumulative)
+    return top, everything
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start profile")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="login")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    launch(args.target)   # discarded: fills the OS file cache so runs compare fresh interpreters, not disks
+    times, modules, imported = [], {}, set()
+    for _ in range(args.runs):
+        ms, (modules, imported) = launch(args.target)
+        times.append(ms)
+
+    median = statistics.median(times)
+    print(f"{args.target}: first window in {median:.0f} ms median "
+          f"(min {min(times):.0f}, max {max(times):.0f}) over {args.runs} runs; "
+          f"target {TARGET_MS} ms -> {'OK' if median <= TARGET_MS else 'SLOW'}")
+    print(f"\n{'slowest top-level imports':<40} {'cumulative ms':>14}")
+    for name, us in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<40} {us / 1000:>14.1f}")
+    heavy = [name for name in HEAVY_MODULES if name in imported]
+    print(f"\nheavy modules imported before first window: {', '.join(heavy) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# --------------------------------------------
+# Streaming / pagination benchmark: peak memory and time to first row
+# --------------------------------------------
+# Seeds a throwaway database on a LOCAL mongod with 100k patients and compares:
+#   - get_all_patients()       whole census in one list
+#   - iter_patients()          generator over streaming cursors
+#   - get_patients_page()      first keyset page, then walking every page
+# Peak memory is Python heap growth measured with tracemalloc.
+#
+# Usage (from the project root, with mongod running on localhost):
+#   python -m benchmarks.bench_streaming --patients 100000 --bays 50
+#
+# Never point BENCH_MONGO_URI at Atlas: the database is dropped afterwards.
+# ----------------------------
+import argparse
+import os
+import time
+import tracemalloc
+
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017")
+BENCH_DB_NAME = os.getenv("BENCH_DB_NAME", "bedbuddy_bench")
+
+# db_operation binds to MONGO_URI/DB_NAME at import, so point it at the bench db first
+os.environ["MONGO_URI"] = BENCH_MONGO_URI
+os.environ["DB_NAME"] = BENCH_DB_NAME
+
+from config.db_config import get_db  # noqa: E402
+from database import db_operation  # noqa: E402
+from database.db_operation import CENSUS_FIELDS  # noqa: E402
+
+
+def seed(db, patients, bays):
+    db.client.drop_database(db.name)
+    per_bay = patients // bays
+    for b in range(bays):
+        docs = [{
+            "first_name": f"First{b}_{p}",
+            "last_name": f"Last{b}_{p}",
+            "bed": f"B{p + 1}",
+            "dob": "1970-01-01",
+            "priority": p % 5 + 1,
+            "notes": "x" * 256,
+        } for p in range(per_bay)]
+        for start in range(0, len(docs), 10000):
+            db[f"bay{b:03d}"].insert_many(docs[start:start + 10000], ordered=False)
+    return per_bay * bays
+
+
+def measure(consume):
+    '''Run consume(on_first_row) -> rows; returns (rows, first row ms, total ms, peak MB).'''
+    first = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = consume(lambda: first or first.append(time.perf_counter()))
+    total = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    first_ms = ((first[0] if first else total) - start) * 1000
+    return rows, first_ms, (total - start) * 1000, peak / 1024 / 1024
+
+
+def whole_list(on_first_row):
+    patients = db_operation.get_all_patients(projection=CENSUS_FIELDS, use_cache=False)
+    if patients:
+        on_first_row()   # nothing is usable before the whole list exists
+    return len(patients)
+
+
+def streamed(batch_size):
+    def consume(on_first_row):
+        rows = 0
+        for _ in db_operation.iter_patients(projection=CENSUS_FIELDS, batch_size=batch_size):
+            if not rows:
+                on_first_row()
+            rows += 1
+        return rows
+    return consume
+
+
+def paged(limit):
+    def consume(on_first_row):
+        rows, cursor = 0, (None, None)
+        while True:
+            page, next_cursor = db_operation.get_patients_page(
+                limit, after_bay=cursor[0], after_id=cursor[1], projection=CENSUS_FIELDS)
+            if page and not rows:
+                on_first_row()
+            rows += len(page)
+            if next_cursor is None:
+                return rows
+            cursor = next_cursor
+    return consume
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming and pagination benchmark")
+    parser.add_argument("--patients", type=int, default=100000)
+    parser.add_argument("--bays", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=db_operation.STREAM_BATCH_SIZE)
+    parser.add_argument("--page-size", type=int, default=db_operation.PAGE_SIZE)
+    args = parser.parse_args()
+
+    db = get_db()
+    try:
+        total = seed(db, args.patients, args.bays)
+        db_operation.refresh()
+        print(f"{total} patients in {args.bays} bays")
+        print(f"{'method':<32} {'rows':>7} {'first row ms':>13} {'total ms':>9} {'peak MB':>8}")
+        for label, consume in (
+            ("get_all_patients (list)", whole_list),
+            (f"iter_patients (batch {args.batch_size})", streamed(args.batch_size)),
+            (f"get_patients_page (limit {args.page_size})", paged(args.page_size)),
+        ):
+            rows, first_ms, total_ms, peak_mb = measure(consume)
+            print(f"{label:<32} {rows:>7} {first_ms:>13.1f} {total_ms:>9.1f} {peak_mb:>8.1f}")
+    finally:
+        db.client.drop_database(db.name)
+
+
+if __name__ == "__main__":
+    main()
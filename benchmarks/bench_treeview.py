@@ -0,0 +1,94 @@
+# --------------------------------------------
+# Treeview refresh benchmark: clear-and-reinsert vs TreeviewSync
+# --------------------------------------------
+# Measures a refresh at 1k and 10k rows where ~2% of rows changed, ~1% were
+# discharged and ~1% admitted (a typical poll), plus the initial load.
+# Needs a display; on a headless machine run it under Xvfb:
+#
+#   xvfb-run python -m benchmarks.bench_treeview --rows 1000 10000
+# ----------------------------
+import argparse
+import random
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from ui.tree_sync import TreeviewSync
+
+
+def make_rows(count, seed):
+    rng = random.Random(seed)
+    return {i: (f"First{i} Last{i}", f"bay{rng.randrange(60)} / B{rng.randrange(1, 40)}",
+                f"Priority {rng.randint(1, 5)}") for i in range(count)}
+
+
+def mutate(rows, seed):
+    '''~2% updated, ~1% discharged, ~1% admitted.'''
+    rng = random.Random(seed)
+    rows = dict(rows)
+    keys = list(rows)
+    n = len(keys)
+    for key in rng.sample(keys, n // 50):
+        name, location, _ = rows[key]
+        rows[key] = (name, location, f"Priority {rng.randint(1, 5)}")
+    for key in rng.sample(keys, n // 100):
+        del rows[key]
+    for i in range(n, n + n // 100):
+        rows[i] = (f"First{i} Last{i}", "bay0 / B1", "Priority 3")
+    return rows
+
+
+def clear_and_reinsert(tree, rows):
+    for row in tree.get_children():
+        tree.delete(row)
+    for values in rows.values():
+        tree.insert("", "end", values=values)
+
+
+def timed(root, fn):
+    start = time.perf_counter()
+    fn()
+    root.update()   # include Tk's own redraw work
+    return (time.perf_counter() - start) * 1000
+
+
+def run_sync_to_completion(root, sync, rows):
+    sync.sync(rows.items())
+    while sync.loading:
+        root.update()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Treeview refresh benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    print(f"{'rows':>6} {'old load ms':>12} {'old refresh ms':>15} {'sync load ms':>13} "
+          f"{'sync refresh ms':>16} {'first slice ms':>15}")
+    for count in args.rows:
+        before = make_rows(count, 1)
+        after = mutate(before, 2)
+
+        old_tree = ttk.Treeview(root, columns=("Name", "Location", "Info"), show="headings")
+        old_load = timed(root, lambda: clear_and_reinsert(old_tree, before))
+        old_refresh = timed(root, lambda: clear_and_reinsert(old_tree, after))
+        old_tree.destroy()
+
+        new_tree = ttk.Treeview(root, columns=("Name", "Location", "Info"), show="headings")
+        sync = TreeviewSync(new_tree)
+        first_slice = timed(root, lambda: sync.sync(before.items()))   # time until rows first show
+        while sync.loading:
+            root.update()
+        sync.clear()
+        sync_load = timed(root, lambda: run_sync_to_completion(root, sync, before))
+        sync_refresh = timed(root, lambda: run_sync_to_completion(root, sync, after))
+        new_tree.destroy()
+
+        print(f"{count:>6} {old_load:>12.1f} {old_refresh:>15.1f} {sync_load:>13.1f} "
+              f"{sync_refresh:>16.1f} {first_slice:>15.1f}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+# --------------------------------------------
+# End-to-end benchmark suite: census load, auth throughput, Tk rendering
+# --------------------------------------------
+# Runs on one machine and writes every number to one JSON file, so releases
+# can be compared run against run:
+#   census  get_all_patients (cold and cached), load_census and iter_patients'
+#           time to first row, in each storage layout, on a LOCAL mongod
+#           (or an in-process mongomock database with --mongomock)
+#   auth    /auth/register and /auth/login requests/sec and latency through
+#           the FastAPI app itself, over an in-process ASGI client (no server)
+#   ui      BedBuddy.census_loaded, show_bay and show_all_patients on a
+#           synthetic census (needs a display: run under xvfb-run)
+# Data comes from benchmarks/synthetic.py, so the same --seed and --scale
+# always measure the same census. A section whose dependency is missing is
+# recorded as skipped (with the reason) instead of failing the run.
+#
+#   xvfb-run python -m benchmarks.suite --scale hospital --output results.json
+#   xvfb-run python -m benchmarks.suite --scale hospital --compare results.json
+#
+# Never point BENCH_MONGO_URI at Atlas: the database is dropped afterwards.
+# (Encode OSS, 2024; Tiangolo, 2025)
+# ----------------------------
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.synthetic import SCALES, generate_census, generate_users, with_ids
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "mongodb://localhost:27017")
+BENCH_DB_NAME = os.getenv("BENCH_DB_NAME", "bedbuddy_bench")
+BENCH_JWT_SECRET = "bench-only-secret"   # used when JWT_SECRET is unset; tokens never leave the process
+SECTIONS = ("census", "auth", "ui")
+REGRESSION_RATIO = 1.2   # --compare flags *_ms metrics that got 20% slower
+
+
+class Skipped(Exception):
+    '''A section cannot run here (missing package, no display, ...).'''
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def timed_ms(fn, repeat):
+    '''Median wall time of `repeat` calls, in milliseconds.'''
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def _require(module, why):
+    try:
+        return __import__(module)
+    except ImportError as e:
+        raise Skipped(f"{module} not installed ({why}): {e}")
+
+
+# ---------------- census ---------------- #
+def _first_row_ms(db_operation, projection):
+    start = time.perf_counter()
+    first = None
+    for _ in db_operation.iter_patients(projection=projection):
+        if first is None:
+            first = time.perf_counter()
+    end = time.perf_counter()
+    return round(((first or end) - start) * 1000, 3), round((end - start) * 1000, 3)
+
+
+def bench_census(args, docs):
+    _require("pymongo", "census section")
+    patcher = None
+    if args.mongomock:
+        mongomock = _require("mongomock", "--mongomock")
+        # Replaces pymongo.MongoClient for localhost only; db_config imports it lazily
+        patcher = mongomock.patch(servers=(("localhost", 27017),))
+        patcher.start()
+    try:
+        from config.db_config import close_clients, get_db
+        from database import db_operation
+        from database.db_operation import CENSUS_FIELDS
+        from buslogic.logic import load_census
+        from benchmarks.synthetic import seed_database
+
+        db = get_db()
+        results = {"backend": "mongomock" if args.mongomock else "mongod"}
+        try:
+            for layout in args.layouts:
+                seed_database(db, docs, layout)
+                db_operation.set_storage(layout)
+                patients = len(db_operation.get_all_patients(projection=CENSUS_FIELDS, use_cache=False))
+                first_row_ms, stream_ms = _first_row_ms(db_operation, CENSUS_FIELDS)
+                results[layout] = {
+                    "patients": patients,
+                    "get_all_patients_cold_ms": timed_ms(lambda: db_operation.get_all_patients(
+                        projection=CENSUS_FIELDS, use_cache=False), args.repeat),
+                    "get_all_patients_cached_ms": timed_ms(lambda: db_operation.get_all_patients(
+                        projection=CENSUS_FIELDS), args.repeat),
+                    "load_census_ms": timed_ms(lambda: load_census(use_cache=False), args.repeat),
+                    "iter_patients_first_row_ms": first_row_ms,
+                    "iter_patients_total_ms": stream_ms,
+                }
+        finally:
+            db_operation.set_storage(db_operation.PATIENT_STORAGE)
+            db.client.drop_database(db.name)
+            close_clients()
+        return results
+    finally:
+        if patcher is not None:
+            patcher.stop()
+
+
+# ---------------- auth ---------------- #
+async def _burst(client, path, bodies, concurrency):
+    '''POST every body to `path`, at most `concurrency` in flight. Returns the stats dict.'''
+    gate = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+
+    async def one(body):
+        async with gate:
+            start = time.perf_counter()
+            response = await client.post(path, json=body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(body) for body in bodies))
+    seconds = time.perf_counter() - start
+    return {
+        "requests": len(bodies),
+        "req_per_s": round(len(bodies) / seconds, 1),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "statuses": dict(sorted(statuses.items())),   # 503 = hashing queue full (shed load)
+    }
+
+
+async def _auth_run(app, users, args):
+    import httpx
+
+    bodies = [{"username": name, "password": password} for name, password in users]
+    # lifespan_context runs the app's startup (indexes) and shutdown (pools) handlers
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return {
+                "users": len(users),
+                "concurrency": args.concurrency,
+                "register": await _burst(client, "/auth/register", bodies, args.concurrency),
+                "login": await _burst(client, "/auth/login", bodies * args.rounds, args.concurrency),
+            }
+
+
+def bench_auth(args, users):
+    if args.mongomock:
+        raise Skipped("the API uses Motor, which mongomock cannot stand in for; run against mongod")
+    for module in ("fastapi", "httpx", "motor"):
+        _require(module, "auth section")
+    os.environ.setdefault("JWT_SECRET", BENCH_JWT_SECRET)
+    sys.path.insert(0, os.path.join(ROOT, "backend"))   # auth_api imports its siblings flat
+    from auth_api import app
+    from config.db_config import close_clients, get_client
+
+    try:
+        return asyncio.run(_auth_run(app, users, args))
+    finally:
+        get_client().drop_database(BENCH_DB_NAME)
+        close_clients()
+
+
+# ---------------- ui ---------------- #
+def _settle(app):
+    '''Let Tk finish drawing, including TreeviewSync's time-sliced batches.'''
+    app.root.update()
+    while app.tree_sync.loading:
+        app.root.update()
+
+
+def _ui_ms(app, fn):
+    start = time.perf_counter()
+    fn()
+    _settle(app)
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_ui(args, docs):
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        raise Skipped("no display; run the suite under xvfb-run")
+    from buslogic.logic import Census
+    from ui import BedBuddy
+
+    census = Census.from_documents(with_ids(docs))
+    bays = census.bays()
+    app = BedBuddy()   # empty census: the swap below is what a real load costs
+    try:
+        _settle(app)
+        results = {"bays": len(bays), "beds": sum(len(census.beds(bay)) for bay in bays),
+                   "census_loaded_ms": round(_ui_ms(app, lambda: app.census_loaded(census)), 3)}
+        switches = [_ui_ms(app, lambda b=bay: app.show_bay(b)) for bay in bays]
+        redraws = [_ui_ms(app, lambda: app.show_bay(bays[0])) for _ in range(args.repeat)]
+        results.update({
+            "show_bay_switch_p50_ms": round(statistics.median(switches), 3),
+            "show_bay_switch_max_ms": round(max(switches), 3),
+            "show_bay_redraw_ms": round(statistics.median(redraws), 3),
+            "show_all_patients_first_ms": round(_ui_ms(app, app.show_all_patients), 3),
+            "show_all_patients_again_ms": round(_ui_ms(app, app.show_all_patients), 3),
+        })
+        return results
+    finally:
+        app.worker.shutdown()
+        app.api.close()
+        app.root.destroy()
+
+
+# ---------------- runner ---------------- #
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_section(name, fn, *args):
+    print(f"[{name}] running...", flush=True)
+    start = time.perf_counter()
+    try:
+        result = fn(*args)
+    except Skipped as e:
+        print(f"[{name}] skipped: {e}")
+        return {"skipped": str(e)}
+    except Exception as e:   # one broken section must not lose the others' numbers
+        print(f"[{name}] failed: {type(e).__name__}: {e}")
+        return {"error": f"{type(e).__name__}: {e}"}
+    print(f"[{name}] done in {time.perf_counter() - start:.1f} s")
+    return result
+
+
+def flatten(results, prefix=""):
+    '''{"census": {"single": {"x_ms": 1}}} -> {"census.single.x_ms": 1}'''
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(current, baseline_path, ratio=REGRESSION_RATIO):
+    '''Print every timing next to the baseline's. Returns the metrics that regressed.'''
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old, new = flatten(baseline["results"]), flatten(current["results"])
+    regressions = []
+    print(f"\nvs {baseline_path} ({baseline['meta'].get('git_commit')})")
+    for key in sorted(new):
+        if not key.endswith("_ms") or not old.get(key):
+            continue
+        change = new[key] / old[key]
+        flag = "  REGRESSION" if change > ratio else ""
+        print(f"  {key:<52} {old[key]:>10.2f} -> {new[key]:>10.2f} ms  x{change:.2f}{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BedBuddy end-to-end benchmark suite")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="ed")
+    parser.add_argument("--bays", type=int, help="override the scale's bay count")
+    parser.add_argument("--beds-per-bay", type=int)
+    parser.add_argument("--occupancy", type=float)
+    parser.add_argument("--users", type=int, help="staff accounts registered in the auth section")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--only", nargs="+", choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument("--layouts", nargs="+", choices=("per_bay", "single"), default=["per_bay", "single"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=16, help="auth requests in flight")
+    parser.add_argument("--rounds", type=int, default=3, help="logins per registered user")
+    parser.add_argument("--mongomock", action="store_true", help="census section on mongomock instead of mongod")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="BASELINE_JSON", help="flag timings >20%% slower than this run")
+    args = parser.parse_args()
+
+    scale = dict(SCALES[args.scale])
+    for key in ("bays", "beds_per_bay", "occupancy", "users"):
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+
+    # db_config binds to MONGO_URI/DB_NAME at import, so point it at the bench db first
+    os.environ["MONGO_URI"] = "mongodb://localhost:27017" if args.mongomock else BENCH_MONGO_URI
+    os.environ["DB_NAME"] = BENCH_DB_NAME
+
+    docs = generate_census(args.seed, **scale)
+    users = generate_users(args.seed, **scale)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scale": {"name": args.scale, **scale},
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    runners = {"census": (bench_census, docs), "auth": (bench_auth, users), "ui": (bench_ui, docs)}
+    for name in args.only:
+        fn, data = runners[name]
+        report["results"][name] = run_section(name, fn, args, data)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+    if args.compare:
+        return 1 if compare(report, args.compare) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# References:
+# Encode OSS. (2024). HTTPX: Transports — ASGI transport. https://www.python-httpx.org/advanced/transports/
+# Tiangolo, S. (2025). FastAPI: Testing; Lifespan events. https://fastapi.tiangolo.com/advanced/testing-events/
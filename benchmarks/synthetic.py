@@ -0,0 +1,113 @@
+# --------------------------------------------
+# Seeded synthetic ED census: bays, beds, patients and staff accounts
+# --------------------------------------------
+# The same seed and scale always produce the same documents, so two runs of
+# the benchmark suite (or two releases) are measured against identical data.
+#   - bays named like a real department (resus, majors_a, minors, ...)
+#   - every bed exists as a document: occupied beds carry a patient, empty
+#     beds are placeholders with blank names (the app's own convention)
+#   - triage priorities follow a typical ED mix (ESI 3 most common, ESI 1 rare),
+#     ~8% of beds are isolation rooms, and a few patients wait without a bed
+#   - staff accounts (username, password) for the auth endpoints
+# (Gilboy et al., 2020)
+#
+#   docs = generate_census(seed=7, **SCALES["hospital"])
+#   seed_database(get_db(), docs, layout="single")
+# ----------------------------
+import random
+
+from buslogic.logic import natural_key
+
+BAY_NAMES = ("resus", "majors_a", "majors_b", "minors", "fast_track",
+             "paeds", "obs", "psych", "ambulatory", "corridor")
+
+# Named scales for --scale; every value can still be overridden on the command line
+SCALES = {
+    "clinic": {"bays": 4, "beds_per_bay": 8, "occupancy": 0.75, "users": 10},
+    "ed": {"bays": 10, "beds_per_bay": 20, "occupancy": 0.85, "users": 50},
+    "hospital": {"bays": 60, "beds_per_bay": 40, "occupancy": 0.9, "users": 200},
+}
+
+PRIORITY_WEIGHTS = {1: 3, 2: 25, 3: 45, 4: 22, 5: 5}   # ESI levels, percent of arrivals
+ISOLATION_RATE = 0.08     # share of beds that are isolation rooms
+WAITING_RATE = 0.05       # waiting-room patients (no bed) per bed
+
+FIRST_NAMES = ("Olivia", "Liam", "Amelia", "Noah", "Isla", "Oliver", "Ava", "Jack", "Mia", "Leo",
+               "Aroha", "Nikau", "Priya", "Arjun", "Mei", "Wei", "Fatima", "Omar", "Sofia", "Mateo",
+               "Grace", "Henry", "Zoe", "Samuel", "Chloe", "Ethan", "Ruby", "Lucas", "Hana", "Kai")
+LAST_NAMES = ("Smith", "Williams", "Brown", "Wilson", "Taylor", "Ngata", "Patel", "Singh", "Chen",
+              "Wang", "Nguyen", "Kim", "Walker", "Harris", "Martin", "Thompson", "Anderson",
+              "Tane", "Rahman", "Garcia", "Lopez", "Clarke", "Young", "King", "Wright", "Scott")
+
+
+def bay_names(count):
+    '''`count` bay collection names: the department's own names first, then numbered wards.'''
+    names = list(BAY_NAMES[:count])
+    names += [f"ward_{n}" for n in range(1, count - len(names) + 1)]
+    return names
+
+
+def _patient(rng):
+    return {
+        "first_name": rng.choice(FIRST_NAMES),
+        "last_name": rng.choice(LAST_NAMES),
+        "dob": f"{rng.randint(1930, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "priority": rng.choices(list(PRIORITY_WEIGHTS), weights=list(PRIORITY_WEIGHTS.values()))[0],
+        "mrn": f"MRN{rng.randrange(10 ** 7):07d}",
+    }
+
+
+def generate_census(seed=0, bays=10, beds_per_bay=20, occupancy=0.85, waiting_rate=WAITING_RATE, **_):
+    '''
+    Bay documents for a whole department, each with a "bay" key and no _id
+    (the database assigns those). Extra keyword arguments are ignored so a
+    SCALES entry can be passed as-is.
+    '''
+    rng = random.Random(seed)
+    docs = []
+    for bay in bay_names(bays):
+        for n in range(1, beds_per_bay + 1):
+            doc = {"bay": bay, "bed": f"B{n}", "first_name": "", "last_name": "",
+                   "isolation": rng.random() < ISOLATION_RATE}
+            if rng.random() < occupancy:
+                doc.update(_patient(rng))
+            docs.append(doc)
+    for _ in range(int(bays * beds_per_bay * waiting_rate)):
+        docs.append({"bay": rng.choice(bay_names(bays)), "bed": "", **_patient(rng)})
+    return docs
+
+
+def generate_users(seed=0, users=50, **_):
+    '''[(username, password)] staff accounts for register/login.'''
+    rng = random.Random(seed)
+    alphabet = "abcdefghijkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+    return [(f"staff{n:04d}", "".join(rng.choice(alphabet) for _ in range(16))) for n in range(users)]
+
+
+def with_ids(docs):
+    '''Copies of `docs` with sequential _ids, for building a Census without a database.'''
+    return [dict(doc, _id=n) for n, doc in enumerate(docs)]
+
+
+def seed_database(db, docs, layout="per_bay"):
+    '''
+    Drop `db` and load `docs` in the given storage layout ("per_bay" or
+    "single"), with the same indexes the app creates. Returns the bay names.
+    '''
+    from database.db_operation import PATIENTS_COLLECTION
+    from database.indexes import BAY_INDEXES, PATIENTS_INDEXES
+
+    db.client.drop_database(db.name)
+    bays = sorted({doc["bay"] for doc in docs}, key=natural_key)
+    if layout == "single":
+        db[PATIENTS_COLLECTION].insert_many([dict(doc) for doc in docs], ordered=False)
+        db[PATIENTS_COLLECTION].create_indexes(PATIENTS_INDEXES)
+    else:
+        for bay in bays:
+            db[bay].insert_many([dict(doc) for doc in docs if doc["bay"] == bay], ordered=False)
+            db[bay].create_indexes(BAY_INDEXES)
+    return bays
+
+# References:
+# Gilboy, N., Tanabe, P., Travers, D., & Rosenau, A. M. (2020). Emergency Severity Index (ESI):
+#       A triage tool for emergency department care, version 4. Emergency Nurses Association.
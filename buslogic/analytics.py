@@ -0,0 +1,343 @@
+# --------------------------------------------
+# Occupancy and throughput analytics over admission history
+# --------------------------------------------
+# EventLog records arrive / admit / move / discharge events (attach one to a
+# Census as census.events and every change is logged). For analysis the log
+# becomes columnar NumPy arrays, and every metric is computed with whole-array
+# operations (sort, searchsorted, bincount, cumsum), never a Python loop over
+# events, so a year of history (millions of rows) takes seconds:
+#
+#   bed_stays()       one row per patient-in-bed interval
+#   occupancy()       beds in use per bay on a time grid (bays x samples)
+#   turnover_times()  empty time between one patient leaving a bed and the next arriving
+#   door_to_bed()     arrival to first bed, per bay of that bed
+#   report()          per-bay utilization and percentiles of all of the above
+#
+#   python -m buslogic.analytics --synthetic --days 365 --bays 10 --beds-per-bay 20
+#   python -m buslogic.analytics --events history.npz --step 900
+#
+# (Harris et al., 2020)
+# ----------------------------
+import argparse
+from collections import namedtuple
+import sys
+import time
+
+import numpy as np
+
+ARRIVE, ADMIT, MOVE, DISCHARGE = 0, 1, 2, 3
+EVENT_KINDS = {"arrive": ARRIVE, "admit": ADMIT, "move": MOVE, "discharge": DISCHARGE}
+NO_BED = -1
+
+# Columnar history. time: epoch seconds (float64), kind: int8, patient: int64
+# code, bed: int32 code or NO_BED. bed_bay maps bed code -> bay code;
+# bays, beds and patient_ids turn codes back into names.
+Events = namedtuple("Events", "time kind patient bed bed_bay bays beds patient_ids")
+# One row per patient-in-bed interval; open stays end at the end of the history
+Stays = namedtuple("Stays", "patient bed bay start end closed")
+
+
+class EventLog:
+    '''Append-only event recorder; columns are plain lists until to_events().'''
+
+    def __init__(self):
+        self._time, self._kind, self._patient, self._bed = [], [], [], []
+        self._patients = {}   # patient id -> code
+        self._beds = {}       # (bay, bed_id) -> code
+        self._bays = {}       # bay -> code
+
+    def record(self, kind, patient_id, bay=None, bed_id=None, at=None):
+        '''Log one event; `kind` is "arrive", "admit", "move" or "discharge".'''
+        self._time.append(time.time() if at is None else at)
+        self._kind.append(EVENT_KINDS[kind])
+        self._patient.append(self._patients.setdefault(patient_id, len(self._patients)))
+        if bay is None or bed_id is None:
+            self._bed.append(NO_BED)
+        else:
+            self._bays.setdefault(bay, len(self._bays))
+            self._bed.append(self._beds.setdefault((bay, bed_id), len(self._beds)))
+
+    def __len__(self):
+        return len(self._time)
+
+    def to_events(self):
+        bed_bay = np.array([self._bays[bay] for bay, _ in self._beds], dtype=np.int32)
+        return _sorted(Events(
+            np.array(self._time, dtype=np.float64), np.array(self._kind, dtype=np.int8),
+            np.array(self._patient, dtype=np.int64), np.array(self._bed, dtype=np.int32),
+            bed_bay, list(self._bays), list(self._beds), list(self._patients),
+        ))
+
+
+def _sorted(events):
+    order = np.argsort(events.time, kind="stable")
+    return events._replace(time=events.time[order], kind=events.kind[order],
+                           patient=events.patient[order], bed=events.bed[order])
+
+
+def save_events(events, path):
+    '''Compressed .npz: the columns plus the name tables.'''
+    np.savez_compressed(
+        path, time=events.time, kind=events.kind, patient=events.patient, bed=events.bed,
+        bed_bay=events.bed_bay, bays=np.array(events.bays, dtype=str),
+        beds=np.array([bed_id for _, bed_id in events.beds], dtype=str),
+        patient_ids=np.array([str(p) for p in events.patient_ids], dtype=str),
+    )
+
+
+def load_events(path):
+    with np.load(path) as data:
+        bays = data["bays"].tolist()
+        beds = [(bays[bay], bed_id) for bay, bed_id in zip(data["bed_bay"].tolist(), data["beds"].tolist())]
+        return Events(data["time"], data["kind"], data["patient"], data["bed"], data["bed_bay"],
+                      bays, beds, data["patient_ids"].tolist())
+
+
+# ----------------------------
+# Metrics
+# ----------------------------
+def bed_stays(events, horizon=None):
+    '''
+    Patient-in-bed intervals. Each admit or move into a bed starts one; the
+    patient's next event (move, discharge, or a move off the bed) ends it.
+    '''
+    if horizon is None:
+        horizon = float(events.time[-1]) if len(events.time) else 0.0
+    order = np.lexsort((events.time, events.patient))
+    patient, t = events.patient[order], events.time[order]
+    kind, bed = events.kind[order], events.bed[order]
+    has_next = np.zeros(len(patient), dtype=bool)
+    has_next[:-1] = patient[1:] == patient[:-1]
+    end = np.full(len(patient), horizon, dtype=np.float64)
+    end[:-1] = np.where(has_next[:-1], t[1:], horizon)
+    in_bed = ((kind == ADMIT) | (kind == MOVE)) & (bed != NO_BED)
+    return Stays(patient[in_bed], bed[in_bed], events.bed_bay[bed[in_bed]],
+                 t[in_bed], end[in_bed], has_next[in_bed])
+
+
+def bed_counts(events):
+    '''Beds per bay (every bed that appears in the history).'''
+    return np.bincount(events.bed_bay, minlength=len(events.bays))
+
+
+def occupancy(stays, n_bays, start, end, step=3600.0):
+    '''
+    Occupied beds per bay at each grid time start, start+step, ... < end.
+    Returns (grid, counts[bays, samples]). Each stay adds +1 at its first
+    sample and -1 after its last; one cumulative sum gives the curve.
+    '''
+    grid = np.arange(start, end, step, dtype=np.float64)
+    width = len(grid) + 1
+    first = np.searchsorted(grid, stays.start, side="left")
+    past = np.searchsorted(grid, stays.end, side="left")
+    size = n_bays * width
+    delta = (np.bincount(stays.bay * width + first, minlength=size)
+             - np.bincount(stays.bay * width + past, minlength=size))
+    return grid, np.cumsum(delta.reshape(n_bays, width), axis=1)[:, :-1]
+
+
+def utilization(stays, beds_per_bay, start, end):
+    '''Share of available bed time in use per bay over [start, end).'''
+    busy = np.clip(stays.end, start, end) - np.clip(stays.start, start, end)
+    per_bay = np.bincount(stays.bay, weights=busy, minlength=len(beds_per_bay))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return per_bay / (beds_per_bay * (end - start))
+
+
+def turnover_times(stays):
+    '''(bay, seconds) for every bed that emptied and was filled again.'''
+    order = np.lexsort((stays.start, stays.bed))
+    bed, start, end = stays.bed[order], stays.start[order], stays.end[order]
+    refilled = (bed[1:] == bed[:-1]) & stays.closed[order][:-1]
+    return stays.bay[order][:-1][refilled], (start[1:] - end[:-1])[refilled]
+
+
+def door_to_bed(events, stays):
+    '''(bay, seconds) from each patient's first arrival to their first bed.'''
+    arrivals = events.kind == ARRIVE
+    arrived, first_arrival = np.unique(events.patient[arrivals], return_index=True)  # events are time-sorted
+    arrival_time = events.time[arrivals][first_arrival]
+    by_start = np.argsort(stays.start, kind="stable")
+    bedded, first_stay = np.unique(stays.patient[by_start], return_index=True)
+    first_stay = by_start[first_stay]
+    both, in_arrived, in_bedded = np.intersect1d(arrived, bedded, assume_unique=True, return_indices=True)
+    wait = stays.start[first_stay[in_bedded]] - arrival_time[in_arrived]
+    valid = wait >= 0
+    return stays.bay[first_stay[in_bedded]][valid], wait[valid]
+
+
+def grouped_percentiles(groups, values, n_groups, percentiles):
+    '''
+    Percentiles of `values` within each group, linear interpolation like
+    np.percentile, computed for all groups from one sort. NaN for empty groups.
+    '''
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    result = np.full((n_groups, len(percentiles)), np.nan)
+    present = counts > 0
+    for column, pct in enumerate(percentiles):
+        position = offsets[present] + (counts[present] - 1) * (pct / 100.0)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        fraction = position - low
+        result[present, column] = ordered[low] * (1 - fraction) + ordered[high] * fraction
+    return result
+
+
+def report(events, step=3600.0, percentiles=(50, 90)):
+    '''Per-bay occupancy, utilization, stay, turnover and door-to-bed figures.'''
+    start, end = float(events.time[0]), float(events.time[-1])
+    n_bays = len(events.bays)
+    stays = bed_stays(events, horizon=end)
+    beds = bed_counts(events)
+    _, curve = occupancy(stays, n_bays, start, end, step)
+    occupancy_pct = grouped_percentiles(np.repeat(np.arange(n_bays), curve.shape[1]),
+                                        curve.ravel().astype(np.float64), n_bays, percentiles)
+    closed = stays.closed
+    stay_pct = grouped_percentiles(stays.bay[closed], stays.end[closed] - stays.start[closed],
+                                   n_bays, percentiles)
+    turnover_pct = grouped_percentiles(*turnover_times(stays), n_bays, percentiles)
+    dtb_bay, dtb = door_to_bed(events, stays)
+    dtb_pct = grouped_percentiles(dtb_bay, dtb, n_bays, percentiles)
+    used = utilization(stays, beds, start, end)
+    rows = []
+    for bay in range(n_bays):
+        rows.append({
+            "bay": events.bays[bay],
+            "beds": int(beds[bay]),
+            "stays": int(np.count_nonzero(stays.bay == bay)),
+            "utilization": float(used[bay]),
+            "occupancy_mean": float(curve[bay].mean()) if curve.shape[1] else 0.0,
+            "occupancy_peak": int(curve[bay].max()) if curve.shape[1] else 0,
+            "occupancy_pct": occupancy_pct[bay].tolist(),
+            "stay_hours_pct": (stay_pct[bay] / 3600).tolist(),
+            "turnover_minutes_pct": (turnover_pct[bay] / 60).tolist(),
+            "door_to_bed_minutes_pct": (dtb_pct[bay] / 60).tolist(),
+        })
+    return {"start": start, "end": end, "events": len(events.time), "percentiles": list(percentiles),
+            "bays": rows}
+
+
+# ----------------------------
+# Synthetic history
+# ----------------------------
+def synthetic_events(days=365, bays=10, beds_per_bay=20, seed=0, move_rate=0.05, start=0.0):
+    '''
+    A year (by default) of arrive / admit / move / discharge events. Each bed
+    alternates lognormal stays (median 3.5 h) with cleaning gaps; patients
+    arrive a median ~40 min before their bed; `move_rate` of stays end with
+    a move into a bed that is free at that moment. Generated with arrays too.
+    '''
+    rng = np.random.default_rng(seed)
+    n_beds, span = bays * beds_per_bay, days * 86400.0
+    per_bed = int(span / (4.5 * 3600) * 1.3) + 10        # more than enough stays per bed
+    los = rng.lognormal(np.log(3.5 * 3600), 0.6, (n_beds, per_bed))
+    gap = 600 + rng.exponential(1800, (n_beds, per_bed))
+    finish = np.cumsum(gap + los, axis=1)
+    begin = finish - los
+    keep = begin < span
+    bed = np.broadcast_to(np.arange(n_beds, dtype=np.int32)[:, None], keep.shape)[keep]
+    begin, finish = start + begin[keep], start + finish[keep]    # sorted by (bed, begin)
+    n_stays = len(begin)
+    patient = np.arange(n_stays, dtype=np.int64)
+    arrival = begin - 300 - rng.exponential(45 * 60, n_stays)
+    ended = finish < start + span
+
+    # Moves: the patient leaves bed A at `finish` for a random bed B that is empty then
+    candidates = np.flatnonzero(ended & (rng.random(n_stays) < move_rate))
+    target = rng.integers(0, n_beds, len(candidates)).astype(np.int32)
+    at = finish[candidates]
+    key = bed.astype(np.float64) * (span + 1e6) + (begin - start)   # (bed, begin) as one sorted key
+    slot = np.searchsorted(key, target * (span + 1e6) + (at - start))
+    prev_free = (slot == 0) | (bed[np.maximum(slot - 1, 0)] != target) | (finish[np.maximum(slot - 1, 0)] <= at)
+    has_next = (slot < n_stays) & (bed[np.minimum(slot, n_stays - 1)] == target)
+    next_begin = np.where(has_next, begin[np.minimum(slot, n_stays - 1)], start + span)
+    ok = prev_free & (target != bed[candidates]) & (next_begin - at > 900)
+    gap_id = target.astype(np.int64) * (n_stays + 1) + slot
+    _, first = np.unique(gap_id[ok], return_index=True)          # one move per empty gap
+    chosen = np.flatnonzero(ok)[first]
+    moved = candidates[chosen]
+    move_at, move_bed = at[chosen], target[chosen]
+    move_end = np.minimum(move_at + rng.lognormal(np.log(2 * 3600), 0.5, len(moved)), next_begin[chosen])
+    move_done = move_end < start + span
+    discharged = ended.copy()
+    discharged[moved] = False
+
+    times = np.concatenate([arrival, begin, finish[discharged], move_at, move_end[move_done]])
+    kinds = np.concatenate([np.full(n_stays, ARRIVE), np.full(n_stays, ADMIT),
+                            np.full(np.count_nonzero(discharged), DISCHARGE),
+                            np.full(len(moved), MOVE), np.full(np.count_nonzero(move_done), DISCHARGE)])
+    patients = np.concatenate([patient, patient, patient[discharged], patient[moved],
+                               patient[moved][move_done]])
+    beds = np.concatenate([np.full(n_stays, NO_BED), bed, np.full(np.count_nonzero(discharged), NO_BED),
+                           move_bed, np.full(np.count_nonzero(move_done), NO_BED)])
+    bay_names = [f"bay{b:02d}" for b in range(bays)]
+    return _sorted(Events(
+        times, kinds.astype(np.int8), patients, beds.astype(np.int32),
+        np.repeat(np.arange(bays, dtype=np.int32), beds_per_bay), bay_names,
+        [(bay_names[b // beds_per_bay], f"B{b % beds_per_bay + 1}") for b in range(n_beds)],
+        range(n_stays),
+    ))
+
+
+# ----------------------------
+# Command line report
+# ----------------------------
+def _fmt(values):
+    return "/".join("-" if np.isnan(v) else f"{v:.0f}" for v in values)
+
+
+def print_report(result):
+    pct = "/".join(f"p{p}" for p in result["percentiles"])
+    days = (result["end"] - result["start"]) / 86400
+    print(f"{result['events']} events over {days:.1f} days")
+    print(f"{'bay':<12} {'beds':>5} {'stays':>8} {'util %':>7} {'occ mean':>9} {'peak':>5} "
+          f"{'occ ' + pct:>12} {'stay h ' + pct:>14} {'turnover min ' + pct:>20} {'door-bed min ' + pct:>20}")
+    for row in result["bays"]:
+        print(f"{row['bay']:<12} {row['beds']:>5} {row['stays']:>8} {row['utilization'] * 100:>7.1f} "
+              f"{row['occupancy_mean']:>9.1f} {row['occupancy_peak']:>5} {_fmt(row['occupancy_pct']):>12} "
+              f"{_fmt(row['stay_hours_pct']):>14} {_fmt(row['turnover_minutes_pct']):>20} "
+              f"{_fmt(row['door_to_bed_minutes_pct']):>20}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bed occupancy and throughput report")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--events", help=".npz event history (save_events)")
+    source.add_argument("--synthetic", action="store_true", help="generate a synthetic history")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--bays", type=int, default=10)
+    parser.add_argument("--beds-per-bay", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="write the (synthetic) history to this .npz")
+    parser.add_argument("--step", type=float, default=3600, help="occupancy sample interval, seconds")
+    parser.add_argument("--percentiles", type=float, nargs="+", default=[50, 90])
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.synthetic:
+        events = synthetic_events(args.days, args.bays, args.beds_per_bay, args.seed)
+    else:
+        events = load_events(args.events)
+    if not len(events.time):
+        print("No events.")
+        return 1
+    if args.save:
+        save_events(events, args.save)
+    loaded = time.perf_counter()
+    result = report(events, args.step, args.percentiles)
+    done = time.perf_counter()
+    print_report(result)
+    print(f"{'generated' if args.synthetic else 'loaded'} in {loaded - start:.2f} s, "
+          f"analysed in {done - loaded:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# References:
+# Harris, C. R., Millman, K. J., van der Walt, S. J., et al. (2020). Array programming with NumPy.
+#       Nature, 585, 357-362. https://doi.org/10.1038/s41586-020-2649-2
@@ -0,0 +1,208 @@
+# --------------------------------------------
+# Triage bed assignment engine for BedBuddy
+# --------------------------------------------
+# Waiting patients sit in a heap keyed by (priority, arrival time), so the most
+# urgent, longest-waiting patient is always on top. Free beds sit in per-bay
+# heaps plus one heap across all bays, so "a free bed in my preferred bay" and
+# "any free bed" are both O(log n). Every arrival and every freed bed is
+# handled in O(log n) amortized (Cormen et al., 2022; Python Software
+# Foundation, 2025).
+#
+# Constraints:
+#   - isolation: a patient who needs isolation only gets an isolation bed;
+#     other patients use isolation beds only when allow_isolation_overflow=True
+#     and no isolation patient is waiting.
+#   - preferred_bay: soft preference, used when that bay has a free bed.
+#
+# Removed or re-prioritized entries are invalidated lazily: stale heap entries
+# are skipped when they reach the top instead of being searched for. A free
+# bed sits in two heaps but is taken from one, so free-bed entries carry the
+# bed's release generation, and a heap holding more than twice as many stale
+# entries as live ones (plus COMPACT_SLACK) is rebuilt from its live entries:
+# memory stays proportional to the free beds however long the assigner runs.
+# ----------------------------
+import heapq
+import itertools
+import numbers
+from collections import namedtuple
+
+from buslogic.logic import natural_key
+
+# Result of a successful assignment
+Assignment = namedtuple("Assignment", "patient_id bay bed_id")
+
+COMPACT_SLACK = 16   # stale entries a heap may always hold before it is rebuilt
+
+
+def _check_priority(priority):
+    '''Priorities are compared inside the heap: only real numbers are accepted.'''
+    if isinstance(priority, bool) or not isinstance(priority, numbers.Real):
+        raise ValueError(f"Priority must be a number, got {priority!r}")
+
+
+class BedAssigner:
+    '''Priority-queue bed assignment (see module header).'''
+
+    def __init__(self, allow_isolation_overflow=False):
+        self.allow_isolation_overflow = allow_isolation_overflow
+        self._seq = itertools.count()     # tie-breaker so heap entries never compare patients
+        self._waiting = {False: [], True: []}   # needs isolation -> heap of [priority, arrival, seq, id, alive]
+        self._entries = {}                # patient id -> live heap entry
+        self._requests = {}               # patient id -> (priority, arrival, isolation, preferred_bay)
+        self._free = set()                # (bay, bed_id) of free beds
+        self._isolation = {}              # (bay, bed_id) -> is isolation bed
+        self._generation = {}             # (bay, bed_id) -> release count; older heap entries are stale
+        self._free_by_bay = {}            # (bay, isolation) -> heap of (bed sort key, generation, bed_id)
+        self._free_any = {False: [], True: []}   # isolation -> heap of (bay key, bed key, generation, bay, bed_id)
+        self._free_in_bay = {}            # (bay, isolation) -> number of free beds
+        self._free_of_kind = {False: 0, True: 0}   # isolation -> number of free beds
+
+    # ---------------- Setup ---------------- #
+    @classmethod
+    def from_census(cls, census, **kwargs):
+        '''Register every census bed; free ones become available for assignment.'''
+        assigner = cls(**kwargs)
+        for bay in census.bays():
+            for bed in census.beds(bay):
+                assigner.add_bed(bay, bed.bed_id, isolation=bed.isolation, free=not bed.occupied)
+        return assigner
+
+    def add_bed(self, bay, bed_id, isolation=False, free=True):
+        '''Register a bed. Returns an Assignment if a waiting patient takes it.'''
+        self._isolation[(bay, bed_id)] = isolation
+        if free:
+            return self.release(bay, bed_id)
+        return None
+
+    # ---------------- Events ---------------- #
+    def arrive(self, patient_id, priority, arrival_time, isolation=False, preferred_bay=None):
+        '''
+        A patient needs a bed. Returns an Assignment if a suitable bed is free,
+        otherwise queues the patient and returns None.
+        '''
+        if patient_id in self._requests:
+            raise ValueError(f"Patient {patient_id!r} is already waiting")
+        _check_priority(priority)
+        bed = self._take_bed(isolation, preferred_bay)
+        if bed is not None:
+            return Assignment(patient_id, *bed)
+        self._requests[patient_id] = (priority, arrival_time, isolation, preferred_bay)
+        self._push_waiting(patient_id)
+        return None
+
+    def release(self, bay, bed_id):
+        '''
+        A bed became free (discharge, move, cleaning done). Gives it to the best
+        compatible waiting patient and returns that Assignment, or keeps it free.
+        '''
+        key = (bay, bed_id)
+        if key in self._free:
+            raise ValueError(f"Bed {bay}/{bed_id} is already free")
+        isolation_bed = self._isolation.setdefault(key, False)
+        patient_id = self._pop_waiting(True) if isolation_bed else None
+        if patient_id is None and (not isolation_bed or self.allow_isolation_overflow):
+            patient_id = self._pop_waiting(False)
+        if patient_id is not None:
+            return Assignment(patient_id, bay, bed_id)
+        self._free.add(key)
+        generation = self._generation[key] = self._generation.get(key, 0) + 1
+        self._free_in_bay[(bay, isolation_bed)] = self._free_in_bay.get((bay, isolation_bed), 0) + 1
+        self._free_of_kind[isolation_bed] += 1
+        by_bay = self._free_by_bay.setdefault((bay, isolation_bed), [])
+        heapq.heappush(by_bay, (natural_key(bed_id), generation, bed_id))
+        self._compact(by_bay, self._free_in_bay[(bay, isolation_bed)], lambda e: self._live(bay, e[2], e[1]))
+        any_bay = self._free_any[isolation_bed]
+        heapq.heappush(any_bay, (natural_key(bay), natural_key(bed_id), generation, bay, bed_id))
+        self._compact(any_bay, self._free_of_kind[isolation_bed], lambda e: self._live(e[3], e[4], e[2]))
+        return None
+
+    def occupy(self, bay, bed_id):
+        '''Mark a free bed as taken outside the engine (e.g. a manual placement).'''
+        self._take((bay, bed_id))   # its heap entries are skipped lazily
+
+    def cancel(self, patient_id):
+        '''Remove a waiting patient (left without being seen, transferred out).'''
+        self._requests.pop(patient_id)
+        self._entries.pop(patient_id)[4] = False
+
+    def reprioritize(self, patient_id, priority):
+        '''Re-triage a waiting patient; keeps their original arrival time.'''
+        _, arrival, isolation, preferred_bay = self._requests[patient_id]
+        _check_priority(priority)
+        self._entries.pop(patient_id)[4] = False
+        self._requests[patient_id] = (priority, arrival, isolation, preferred_bay)
+        self._push_waiting(patient_id)
+
+    # ---------------- Queries ---------------- #
+    def waiting_count(self):
+        return len(self._requests)
+
+    def free_count(self):
+        return len(self._free)
+
+    def next_waiting(self, isolation=False):
+        '''Patient id at the head of the queue (without removing it).'''
+        heap = self._waiting[isolation]
+        while heap and not heap[0][4]:
+            heapq.heappop(heap)
+        return heap[0][3] if heap else None
+
+    # ---------------- Internals ---------------- #
+    def _push_waiting(self, patient_id):
+        priority, arrival, isolation, _ = self._requests[patient_id]
+        entry = [priority, arrival, next(self._seq), patient_id, True]
+        self._entries[patient_id] = entry
+        heapq.heappush(self._waiting[isolation], entry)
+
+    def _pop_waiting(self, isolation):
+        heap = self._waiting[isolation]
+        while heap:
+            entry = heapq.heappop(heap)
+            if entry[4]:
+                patient_id = entry[3]
+                del self._entries[patient_id]
+                del self._requests[patient_id]
+                return patient_id
+        return None
+
+    def _live(self, bay, bed_id, generation):
+        '''A free-bed heap entry is live while the bed is free since that same release.'''
+        key = (bay, bed_id)
+        return key in self._free and self._generation[key] == generation
+
+    def _take(self, key):
+        if key in self._free:
+            self._free.discard(key)
+            isolation_bed = self._isolation[key]
+            self._free_in_bay[(key[0], isolation_bed)] -= 1
+            self._free_of_kind[isolation_bed] -= 1
+
+    @staticmethod
+    def _compact(heap, live_count, is_live):
+        if len(heap) > 3 * live_count + COMPACT_SLACK:   # stale > 2 x live (+ slack)
+            heap[:] = [entry for entry in heap if is_live(entry)]
+            heapq.heapify(heap)
+
+    def _take_bed(self, isolation, preferred_bay):
+        kinds = [True] if isolation else ([False, True] if self.allow_isolation_overflow else [False])
+        for kind in kinds:
+            if preferred_bay is not None:
+                heap = self._free_by_bay.get((preferred_bay, kind))
+                while heap:
+                    _, generation, bed_id = heapq.heappop(heap)
+                    if self._live(preferred_bay, bed_id, generation):
+                        self._take((preferred_bay, bed_id))
+                        return preferred_bay, bed_id
+            heap = self._free_any[kind]
+            while heap:
+                _, _, generation, bay, bed_id = heapq.heappop(heap)
+                if self._live(bay, bed_id, generation):
+                    self._take((bay, bed_id))
+                    return bay, bed_id
+        return None
+
+# References:
+# Cormen, T. H., Leiserson, C. E., Rivest, R. L., & Stein, C. (2022).
+#       Introduction to algorithms (4th ed.), Chapter 6: Heapsort / priority queues. MIT Press.
+# Python Software Foundation. (2025). heapq — Heap queue algorithm. In Python 3.13 documentation.
+#       https://docs.python.org/3/library/heapq.html
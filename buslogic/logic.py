@@ -1 +1,361 @@
-# UI/DB interfacing
\ No newline at end of file
+# UI/DB interfacing
+# --------------------------------------------
+# In-memory census model for BedBuddy
+# --------------------------------------------
+# The UI asks the same questions over and over ("occupied beds in bay N",
+# "all priority-1 patients", "free beds"). Census answers them from secondary
+# indexes that are updated incrementally on admit / move / discharge, so each
+# query costs O(result) instead of a scan over every bed.
+#
+#   Census.from_documents(docs)  -> build from MongoDB bay documents
+#   load_census()                -> same, straight from the database
+#   census.search("smi maj")     -> patients by name / MRN / bay / bed prefix (buslogic/search.py)
+#   census.events = EventLog()   -> log admit / move / discharge for analytics (buslogic/analytics.py)
+#
+# Records use __slots__ so 5k+ beds stay compact (Python Software Foundation, 2025).
+# ----------------------------
+import re
+
+from buslogic.search import PrefixIndex, patient_terms
+
+# Icon color per triage priority (1 = most urgent)
+PRIORITY_COLORS = {1: "red", 2: "orange", 3: "yellow", 4: "green", 5: "blue"}
+DEFAULT_PATIENT_COLOR = "yellow"
+
+# Fields needed to build the census (empty bed placeholders only carry "bed")
+CENSUS_LOAD_FIELDS = ("first_name", "last_name", "bed", "dob", "priority", "mrn", "isolation")
+
+
+def natural_key(text):
+    '''"B2" sorts before "B10".'''
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", str(text))]
+
+
+def parse_priority(value):
+    '''
+    Stored priority -> int when numeric ("2" -> 2), None when empty. Anything
+    else ("high", "2a") is kept as stored, so one bad row is shown as entered
+    instead of failing the whole census load.
+    '''
+    if value is None or str(value).strip() == "":
+        return None
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return value
+
+
+def has_patient(doc):
+    '''True when a bay document holds a named patient (same rule as PATIENT_FILTER).'''
+    return bool(doc.get("first_name")) and bool(doc.get("last_name"))
+
+
+class Patient:
+    '''One patient; bay/bed are None while the patient is waiting for a bed.'''
+    __slots__ = ("id", "first_name", "last_name", "dob", "priority", "mrn", "bay", "bed")
+
+    def __init__(self, id, first_name, last_name, dob=None, priority=None, mrn=None):
+        self.id = id
+        self.first_name = first_name
+        self.last_name = last_name
+        self.dob = dob
+        self.priority = priority
+        self.mrn = mrn
+        self.bay = None
+        self.bed = None
+
+    @classmethod
+    def from_document(cls, doc):
+        return cls(
+            doc["_id"], doc.get("first_name", ""), doc.get("last_name", ""),
+            dob=doc.get("dob"),
+            priority=parse_priority(doc.get("priority")),
+            mrn=doc.get("mrn"),
+        )
+
+    @property
+    def name(self):
+        return f"{self.first_name} {self.last_name}"
+
+    @property
+    def color(self):
+        return PRIORITY_COLORS.get(self.priority, DEFAULT_PATIENT_COLOR)
+
+    def __repr__(self):
+        return f"Patient({self.id!r}, {self.name!r}, priority={self.priority})"
+
+
+class Bed:
+    '''One bed in a bay, optionally holding a patient.'''
+    __slots__ = ("bay", "bed_id", "isolation", "patient")
+
+    def __init__(self, bay, bed_id, isolation=False):
+        self.bay = bay
+        self.bed_id = bed_id
+        self.isolation = isolation
+        self.patient = None
+
+    @property
+    def key(self):
+        return (self.bay, self.bed_id)
+
+    @property
+    def occupied(self):
+        return self.patient is not None
+
+    @property
+    def location(self):
+        return f"{self.bay} / {self.bed_id}"
+
+    def __repr__(self):
+        return f"Bed({self.bay!r}, {self.bed_id!r}, patient={self.patient!r})"
+
+
+class Census:
+    '''
+    Beds and patients with secondary indexes by bay, bed, patient id,
+    priority and occupancy. Dicts are used as insertion-ordered sets so
+    removal is O(1) and iteration order is stable for the UI.
+    '''
+
+    def __init__(self):
+        self._beds = {}          # (bay, bed_id) -> Bed
+        self._bays = {}          # bay -> {bed_id: Bed}
+        self._patients = {}      # patient id -> Patient
+        self._by_priority = {}   # priority -> {patient id: Patient}
+        self._occupied = {}      # bay -> {bed_id: Bed}
+        self._free = {}          # bay -> {bed_id: Bed}
+        self._waiting = {}       # patient id -> Patient (no bed yet)
+        self._doc_bay = {}       # patient id -> bay whose document last held the patient
+        self._search = None      # PrefixIndex, built on the first search() and then kept current
+        self.events = None       # optional EventLog: every admit / move / discharge is recorded
+
+    # ---------------- Building ---------------- #
+    @classmethod
+    def from_documents(cls, docs):
+        '''
+        Build a census from bay documents (each with a "bay" key).
+        Documents with a patient name are patients in their "bed"; documents
+        without one are empty bed placeholders.
+        '''
+        census = cls()
+        docs = sorted(docs, key=lambda d: (natural_key(d["bay"]), natural_key(d.get("bed") or "")))
+        for doc in docs:
+            bay, bed_id = doc["bay"], doc.get("bed")
+            if bed_id and (bay, bed_id) not in census._beds:
+                census.add_bed(bay, bed_id, isolation=bool(doc.get("isolation")))
+            if has_patient(doc):
+                patient = Patient.from_document(doc)
+                if bed_id and not census._beds[(bay, bed_id)].occupied:
+                    census.admit(patient, bay, bed_id)
+                else:
+                    census.admit(patient)   # no bed (or a double-booked bed): waiting list
+                census._doc_bay[patient.id] = bay
+        return census
+
+    def add_bed(self, bay, bed_id, isolation=False):
+        if (bay, bed_id) in self._beds:
+            raise ValueError(f"Bed {bay}/{bed_id} already exists")
+        bed = Bed(bay, bed_id, isolation)
+        self._beds[bed.key] = bed
+        self._bays.setdefault(bay, {})[bed_id] = bed
+        self._occupied.setdefault(bay, {})
+        self._free.setdefault(bay, {})[bed_id] = bed
+        return bed
+
+    # ---------------- Updates ---------------- #
+    def admit(self, patient, bay=None, bed_id=None):
+        '''Add a patient, into a free bed or (bay=None) onto the waiting list.'''
+        if patient.id in self._patients:
+            raise ValueError(f"Patient {patient.id!r} is already in the census")
+        self._patients[patient.id] = patient
+        self._by_priority.setdefault(patient.priority, {})[patient.id] = patient
+        if bay is None:
+            self._waiting[patient.id] = patient
+            self._reindex(patient)
+            self._record("arrive", patient)
+        else:
+            self._place(patient, self._free_bed(bay, bed_id))
+            self._record("admit", patient)
+        return patient
+
+    def move(self, patient_id, bay, bed_id):
+        '''Move a patient (placed or waiting) into another free bed.'''
+        patient = self._patients[patient_id]
+        target = self._free_bed(bay, bed_id)
+        waiting = patient.bed is None
+        self._vacate(patient)
+        self._place(patient, target)
+        self._record("admit" if waiting else "move", patient)
+        return patient
+
+    def discharge(self, patient_id):
+        '''Remove a patient from the census and free their bed.'''
+        patient = self._patients.pop(patient_id)
+        self._doc_bay.pop(patient_id, None)
+        self._vacate(patient)
+        self._record("discharge", patient)
+        bucket = self._by_priority[patient.priority]
+        del bucket[patient_id]
+        if not bucket:
+            del self._by_priority[patient.priority]
+        if self._search is not None:
+            self._search.remove(patient_id)
+        return patient
+
+    def set_priority(self, patient_id, priority):
+        patient = self._patients[patient_id]
+        if priority == patient.priority:
+            return patient
+        bucket = self._by_priority[patient.priority]
+        del bucket[patient_id]
+        if not bucket:
+            del self._by_priority[patient.priority]
+        patient.priority = priority
+        self._by_priority.setdefault(priority, {})[patient_id] = patient
+        return patient
+
+    # ---------------- Live changes ---------------- #
+    def apply_document(self, doc):
+        '''
+        Apply one bay document as it now exists in MongoDB (insert / update /
+        replace from a change stream). Idempotent: applying it twice is a no-op.
+        '''
+        bay, bed_id, doc_id = doc["bay"], doc.get("bed"), doc["_id"]
+        if bed_id and (bay, bed_id) not in self._beds:
+            self.add_bed(bay, bed_id, isolation=bool(doc.get("isolation")))
+        current = self._patients.get(doc_id)
+        if not has_patient(doc):
+            if current is not None:
+                self.discharge(doc_id)   # patient fields were cleared from the document
+            return None
+
+        incoming = Patient.from_document(doc)
+        self._doc_bay[doc_id] = bay
+        if current is None:
+            current = self.admit(incoming)
+        else:
+            current.first_name, current.last_name = incoming.first_name, incoming.last_name
+            current.dob, current.mrn = incoming.dob, incoming.mrn
+            self.set_priority(doc_id, incoming.priority)
+            self._reindex(current)
+        if (current.bay, current.bed) != (bay, bed_id) and (bed_id or current.bed is not None):
+            target = self._beds.get((bay, bed_id)) if bed_id else None
+            if target is not None and not target.occupied:
+                self.move(doc_id, bay, bed_id)
+            elif current.bed is not None:
+                self._vacate(current)            # no (free) bed: back to the waiting list
+                self._waiting[doc_id] = current
+                self._reindex(current)
+                self._record("move", current)
+        return current
+
+    def remove_document(self, bay, doc_id):
+        '''
+        Apply a delete from `bay`. A patient whose document has meanwhile been
+        upserted into another bay (a cross-bay move arrives as insert + delete)
+        is kept, even when the target bed was still taken and they are waiting.
+        bay=None (single-collection layout, where moves are updates) always discharges.
+        '''
+        patient = self._patients.get(doc_id)
+        if patient is not None and (bay is None or self._doc_bay.get(doc_id, patient.bay) == bay):
+            return self.discharge(doc_id)
+        return None
+
+    def _free_bed(self, bay, bed_id):
+        bed = self._beds.get((bay, bed_id))
+        if bed is None:
+            raise KeyError(f"No bed {bay}/{bed_id}")
+        if bed.occupied:
+            raise ValueError(f"Bed {bay}/{bed_id} is occupied by {bed.patient.name}")
+        return bed
+
+    def _place(self, patient, bed):
+        bed.patient = patient
+        patient.bay, patient.bed = bed.bay, bed.bed_id
+        del self._free[bed.bay][bed.bed_id]
+        self._occupied[bed.bay][bed.bed_id] = bed
+        self._waiting.pop(patient.id, None)
+        self._reindex(patient)
+
+    def _vacate(self, patient):
+        if patient.bed is None:
+            self._waiting.pop(patient.id, None)
+            return
+        bed = self._beds[(patient.bay, patient.bed)]
+        bed.patient = None
+        del self._occupied[bed.bay][bed.bed_id]
+        self._free[bed.bay][bed.bed_id] = bed
+        patient.bay = patient.bed = None
+
+    def _reindex(self, patient):
+        '''Keep the search index current once it exists (name, MRN or location changed).'''
+        if self._search is not None and patient.id in self._patients:
+            self._search.update(patient.id, patient_terms(patient))
+
+    def _record(self, kind, patient):
+        if self.events is not None:
+            self.events.record(kind, patient.id, patient.bay, patient.bed)
+
+    # ---------------- Queries (O(result)) ---------------- #
+    def bays(self):
+        return list(self._bays)
+
+    def beds(self, bay):
+        '''All beds of a bay in display order.'''
+        return list(self._bays.get(bay, {}).values())
+
+    def bed(self, bay, bed_id):
+        return self._beds.get((bay, bed_id))
+
+    def patient(self, patient_id):
+        return self._patients.get(patient_id)
+
+    def patients(self):
+        return list(self._patients.values())
+
+    def occupied_beds(self, bay=None):
+        if bay is not None:
+            return list(self._occupied.get(bay, {}).values())
+        return [bed for beds in self._occupied.values() for bed in beds.values()]
+
+    def free_beds(self, bay=None):
+        if bay is not None:
+            return list(self._free.get(bay, {}).values())
+        return [bed for beds in self._free.values() for bed in beds.values()]
+
+    def patients_with_priority(self, priority):
+        return list(self._by_priority.get(priority, {}).values())
+
+    def waiting_patients(self):
+        return list(self._waiting.values())
+
+    def build_search_index(self):
+        '''Build the search index now (e.g. on a worker thread) instead of on the first search().'''
+        if self._search is None:
+            self._search = PrefixIndex.build((p.id, patient_terms(p)) for p in self._patients.values())
+        return self._search
+
+    def search(self, query, limit=None):
+        '''
+        Patients whose name, MRN, bay or bed starts with every word of `query`
+        ("smi maj" finds Smith in majors_a). O(log n + matches) per call.
+        '''
+        self.build_search_index()
+        return [self._patients[patient_id] for patient_id in self._search.search(query, limit)]
+
+    def __len__(self):
+        return len(self._patients)
+
+    def __contains__(self, patient_id):
+        return patient_id in self._patients
+
+
+def load_census(use_cache=True):
+    '''Build the census from every bay collection in MongoDB.'''
+    from database.db_operation import get_all_beds  # keeps the model importable without a DB driver
+    return Census.from_documents(get_all_beds(projection=CENSUS_LOAD_FIELDS, use_cache=use_cache))
+
+# References:
+# Python Software Foundation. (2025). Data model — __slots__. In Python 3.13 documentation.
+#       https://docs.python.org/3/reference/datamodel.html#slots
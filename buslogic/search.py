@@ -0,0 +1,131 @@
+# --------------------------------------------
+# Prefix index for incremental patient search
+# --------------------------------------------
+# Every patient contributes a few search terms (first and last name, MRN,
+# bay and bed). The terms live in one sorted list, so every term starting
+# with what was typed sits in one contiguous run found with two bisects:
+# O(log n + matches) per keystroke instead of a scan over every patient.
+# Adding or removing a patient is a bisect plus a list insert/delete, so the
+# index follows admissions, moves and discharges without being rebuilt
+# (Python Software Foundation, 2025).
+#
+#   index = PrefixIndex.build((p.id, patient_terms(p)) for p in patients)
+#   index.search("smi maj")   -> ids whose terms start with "smi" AND "maj"
+# ----------------------------
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+import re
+
+_SPLIT = re.compile(r"[\s/,]+")
+_HIGHEST = "\U0010ffff"   # sorts after every character a term can continue with
+
+
+def normalize(text):
+    return str(text).strip().casefold()
+
+
+def query_terms(query):
+    '''"Smith majors_a/B3" -> ["smith", "majors_a", "b3"]'''
+    return [term for term in _SPLIT.split(normalize(query)) if term]
+
+
+def patient_terms(patient):
+    '''Search terms for one patient: names (and their hyphen/space parts), MRN, bay, bed.'''
+    terms = set()
+    for name in (patient.first_name, patient.last_name):
+        name = normalize(name or "")
+        if name:
+            terms.add(name)
+            terms.update(part for part in re.split(r"[\s\-']+", name) if part)
+    if patient.mrn:
+        mrn = normalize(patient.mrn)
+        terms.add(mrn)
+        digits = mrn.lstrip("abcdefghijklmnopqrstuvwxyz")   # "mrn0012345" is also found as "0012345"
+        if digits:
+            terms.add(digits)
+    if patient.bay:
+        terms.add(normalize(patient.bay))
+    if patient.bed:
+        terms.add(normalize(patient.bed))
+    return frozenset(terms)
+
+
+class PrefixIndex:
+    '''
+    Sorted (term, id) pairs kept as two parallel lists, so ids never need to
+    be comparable with each other. Terms per id are remembered for removal.
+    '''
+
+    def __init__(self):
+        self._keys = []     # sorted terms
+        self._ids = []      # id owning the term at the same position
+        self._terms = {}    # id -> frozenset of its terms
+
+    @classmethod
+    def build(cls, items):
+        '''Bulk load from (id, terms) pairs: one sort instead of n inserts.'''
+        index = cls()
+        pairs = []
+        for item_id, terms in items:
+            index._terms[item_id] = terms
+            pairs.extend((term, item_id) for term in terms)
+        pairs.sort(key=itemgetter(0))
+        index._keys = [term for term, _ in pairs]
+        index._ids = [item_id for _, item_id in pairs]
+        return index
+
+    # ---------------- Updates ---------------- #
+    def add(self, item_id, terms):
+        if item_id in self._terms:
+            self.remove(item_id)
+        self._terms[item_id] = terms
+        for term in terms:
+            i = bisect_right(self._keys, term)
+            self._keys.insert(i, term)
+            self._ids.insert(i, item_id)
+
+    def remove(self, item_id):
+        for term in self._terms.pop(item_id, ()):
+            lo, hi = bisect_left(self._keys, term), bisect_right(self._keys, term)
+            i = lo + self._ids[lo:hi].index(item_id)
+            del self._keys[i]
+            del self._ids[i]
+
+    def update(self, item_id, terms):
+        '''Re-index an item whose terms may have changed (no-op when they did not).'''
+        if self._terms.get(item_id) != terms:
+            self.add(item_id, terms)
+
+    # ---------------- Queries ---------------- #
+    def _range(self, prefix):
+        return bisect_left(self._keys, prefix), bisect_left(self._keys, prefix + _HIGHEST)
+
+    def search(self, query, limit=None):
+        '''
+        Ids matching every term of `query` as a prefix, in term order of the
+        most selective term, each id once. An empty query matches nothing.
+        '''
+        ranges = sorted((self._range(term) for term in query_terms(query)), key=lambda r: r[1] - r[0])
+        if not ranges:
+            return []
+        lo, hi = ranges[0]
+        others = [set(self._ids[start:end]) for start, end in ranges[1:]]
+        results, seen = [], set()
+        for item_id in self._ids[lo:hi]:
+            if item_id in seen or not all(item_id in ids for ids in others):
+                continue
+            seen.add(item_id)
+            results.append(item_id)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def __len__(self):
+        return len(self._terms)
+
+    def __contains__(self, item_id):
+        return item_id in self._terms
+
+# References:
+# Python Software Foundation. (2025). bisect — Array bisection algorithm. In Python 3.13 documentation.
+#       https://docs.python.org/3/library/bisect.html
@@ -1,8 +1,30 @@
 # Setup db information
+# --------------------------------------------
+# Process-wide MongoDB connection manager
+# --------------------------------------------
+# Every caller (desktop UI, FastAPI backend, scripts) goes through this module
+# so each process holds ONE pooled PyMongo client and ONE pooled Motor client
+# instead of opening a new connection (and TLS handshake) per call.
+#
+#   get_db()        -> sync Database   (PyMongo)
+#   get_motor_db()  -> async Database  (Motor, created lazily inside the event loop)
+#   ping()          -> health check, returns round-trip time in ms
+#   close_clients() -> shut both pools down (tests, app shutdown)
+#
+# With BEDBUDDY_METRICS=1 both clients report command latency and pool
+# gauges to config/metrics.py.
+#
+# Clients are never shared across fork(): a child process (e.g. a uvicorn or
+# gunicorn worker) drops the parent's clients and lazily builds its own
+# (MongoDB Inc., 2025).
+# ----------------------------
 import os
-from pymongo import MongoClient
+import threading
+import time
 from dotenv import load_dotenv
 
+from config.metrics import mongo_listeners
+
 # load variables from .env
 load_dotenv()
 
@@ -11,6 +33,137 @@ load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI")
 DB_NAME = os.getenv("DB_NAME")
 
+# ----------------------------
+# Pool settings (override in .env)
+# ----------------------------
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "2"))   # warm connections kept open
+MONGO_MAX_IDLE_MS = int(os.getenv("MONGO_MAX_IDLE_MS", "300000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zlib")         # e.g. "zstd,snappy,zlib"
+MONGO_TLS_CA_FILE = os.getenv("MONGO_TLS_CA_FILE")                 # defaults to certifi for Atlas URIs
+
+_lock = threading.Lock()
+_client = None
+_motor_client = None
+_owner_pid = os.getpid()
+
+
+def client_options():
+    """Keyword arguments shared by the PyMongo and Motor clients."""
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+        "appname": "bedbuddy",
+    }
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    # tlsCAFile implies TLS, so only set it for Atlas (SRV) URIs or when asked to
+    ca_file = MONGO_TLS_CA_FILE
+    if ca_file is None and MONGO_URI and MONGO_URI.startswith("mongodb+srv://"):
+        import certifi
+        ca_file = certifi.where()
+    if ca_file:
+        options["tlsCAFile"] = ca_file
+    return options
+
+
+def _reset_after_fork():
+    """Forget the parent's clients; their sockets must not be used in the child."""
+    global _client, _motor_client, _owner_pid, _lock
+    _lock = threading.Lock()
+    _client = None
+    _motor_client = None
+    _owner_pid = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _check_pid():
+    # Fallback for fork paths that skip the at-fork hooks
+    if os.getpid() != _owner_pid:
+        _reset_after_fork()
+
+
+def get_client():
+    """Return the shared PyMongo client, creating it on first use."""
+    global _client
+    _check_pid()
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from pymongo import MongoClient
+                _client = MongoClient(MONGO_URI, event_listeners=mongo_listeners("sync"),
+                                      **client_options())
+    return _client
+
+
+def get_motor_client():
+    """Return the shared Motor client, creating it on first use."""
+    global _motor_client
+    _check_pid()
+    if _motor_client is None:
+        with _lock:
+            if _motor_client is None:
+                from motor.motor_asyncio import AsyncIOMotorClient
+                _motor_client = AsyncIOMotorClient(MONGO_URI, event_listeners=mongo_listeners("motor"),
+                                                   **client_options())
+    return _motor_client
+
+
 def get_db():
-    client = MongoClient(MONGO_URI)
-    return client[DB_NAME]
+    return get_client()[DB_NAME]
+
+
+def get_motor_db():
+    return get_motor_client()[DB_NAME]
+
+
+def ping():
+    """
+    Health check against the shared sync client.
+    Returns the round-trip time in milliseconds; raises on failure.
+    """
+    start = time.perf_counter()
+    get_client().admin.command("ping")
+    return (time.perf_counter() - start) * 1000
+
+
+async def ping_async():
+    """Health check against the shared Motor client (milliseconds)."""
+    start = time.perf_counter()
+    await get_motor_client().admin.command("ping")
+    return (time.perf_counter() - start) * 1000
+
+
+def pool_settings():
+    """Effective pool configuration, for logs and health endpoints."""
+    settings = client_options()
+    settings.pop("tlsCAFile", None)
+    return settings
+
+
+def close_clients():
+    """Close both pools (app shutdown, tests)."""
+    global _client, _motor_client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+        if _motor_client is not None:
+            _motor_client.close()
+            _motor_client = None
+
+# References:
+# MongoDB Inc. (2025). PyMongo: Frequently asked questions — Is PyMongo fork-safe?
+#       https://pymongo.readthedocs.io/en/stable/faq.html
+# MongoDB Inc. (2025). Motor: Asynchronous Python driver for MongoDB.
+#       https://motor.readthedocs.io/
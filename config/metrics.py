@@ -0,0 +1,273 @@
+# --------------------------------------------
+# Process-wide metrics in Prometheus text format
+# --------------------------------------------
+# Off by default. With BEDBUDDY_METRICS=1 (read once, at import):
+#   - the API serves GET /metrics and times every request per route
+#   - Argon2 hash/verify, db_operation reads/writes and every MongoDB command
+#     (PyMongo and Motor, through command listeners) land in latency histograms
+#   - connection pool listeners keep gauges of open and checked-out connections
+# When off, timed() hands back the undecorated function, no listener is
+# registered and no middleware is added, so the only cost is the import.
+# Each process keeps its own numbers: scrape every API worker separately
+# (Prometheus Authors, 2024; MongoDB Inc., 2025).
+#
+#   HASH_SECONDS = histogram("bedbuddy_password_hash_seconds", "Argon2 time", ("op",))
+#   @timed(HASH_SECONDS, "hash")
+#   def hash_password(password): ...
+# ----------------------------
+import functools
+import os
+import threading
+import time
+
+METRICS_ENABLED = os.getenv("BEDBUDDY_METRICS", "0") == "1"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Seconds; Argon2 sits around 0.05-0.5 s, indexed Mongo reads around 1 ms
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = {}   # metric name -> metric, in registration order
+_registry_lock = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class Histogram:
+    '''Cumulative-bucket latency histogram with a fixed set of label names.'''
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series = {}   # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield (f"{self.name}_bucket{_labels(self.labelnames, labels, [('le', _number(bound))])}"
+                       f" {cumulative}")
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-2])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}"
+
+
+class Gauge:
+    '''Value per label set, moved by inc()/dec()/set().'''
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Counter(Gauge):
+    '''Gauge that only goes up (totals since the process started).'''
+    kind = "counter"
+
+
+class Callback:
+    '''Gauge or counter read at scrape time: fn() -> {label values tuple: number}.'''
+
+    def __init__(self, name, help, fn, labelnames=(), kind="gauge"):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+
+    def samples(self):
+        for labels, value in sorted(self.fn().items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+def _register(metric):
+    '''Keep the first metric registered under a name (re-imports get the same object).'''
+    with _registry_lock:
+        return _registry.setdefault(metric.name, metric)
+
+
+def histogram(name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return _register(Histogram(name, help, labelnames, buckets))
+
+
+def gauge(name, help, labelnames=()):
+    return _register(Gauge(name, help, labelnames))
+
+
+def counter(name, help, labelnames=()):
+    return _register(Counter(name, help, labelnames))
+
+
+def callback(name, help, fn, labelnames=(), kind="gauge"):
+    return _register(Callback(name, help, fn, labelnames, kind))
+
+
+def timed(metric, *labels):
+    '''
+    Decorator: observe each call's wall time in `metric`. With no labels and a
+    one-label histogram, the function name is the label. Returns the function
+    itself when metrics are off.
+    '''
+    def decorate(fn):
+        if not METRICS_ENABLED:
+            return fn
+        values = labels or (fn.__name__,)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metric.observe(time.perf_counter() - start, *values)
+        return wrapper
+    return decorate
+
+
+def render():
+    '''Every registered metric in the Prometheus text exposition format.'''
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+# ----------------------------
+# MongoDB (PyMongo and Motor share the driver's monitoring API)
+# ----------------------------
+MONGO_COMMAND_SECONDS = histogram(
+    "bedbuddy_mongo_command_duration_seconds", "MongoDB command round trip, per client and command",
+    ("client", "command", "outcome"))
+MONGO_CHECKOUT_SECONDS = histogram(
+    "bedbuddy_mongo_pool_checkout_seconds", "Wait for a pooled connection (PyMongo 4.7+)", ("client",))
+MONGO_CONNECTIONS = gauge(
+    "bedbuddy_mongo_pool_connections", "Open pooled connections per server", ("client", "address"))
+MONGO_CHECKED_OUT = gauge(
+    "bedbuddy_mongo_pool_checked_out", "Connections currently in use per server", ("client", "address"))
+MONGO_CHECKOUT_FAILURES = counter(
+    "bedbuddy_mongo_pool_checkout_failures_total", "Checkouts that timed out or failed",
+    ("client", "reason"))
+
+
+def mongo_listeners(client):
+    '''
+    Event listeners for a MongoClient / AsyncIOMotorClient named `client`
+    ("sync" or "motor"); [] when metrics are off.
+    '''
+    if not METRICS_ENABLED:
+        return []
+    from pymongo import monitoring
+
+    class CommandTimer(monitoring.CommandListener):
+        def started(self, event):
+            pass
+
+        def succeeded(self, event):
+            MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, client, event.command_name, "ok")
+
+        def failed(self, event):
+            MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, client, event.command_name, "error")
+
+    class PoolGauges(monitoring.ConnectionPoolListener):
+        def pool_created(self, event):
+            pass
+
+        def pool_ready(self, event):
+            pass
+
+        def pool_cleared(self, event):
+            pass
+
+        def pool_closed(self, event):
+            MONGO_CONNECTIONS.set(0, client, _address(event))
+            MONGO_CHECKED_OUT.set(0, client, _address(event))
+
+        def connection_created(self, event):
+            MONGO_CONNECTIONS.inc(client, _address(event))
+
+        def connection_ready(self, event):
+            pass
+
+        def connection_closed(self, event):
+            MONGO_CONNECTIONS.dec(client, _address(event))
+
+        def connection_check_out_started(self, event):
+            pass
+
+        def connection_check_out_failed(self, event):
+            MONGO_CHECKOUT_FAILURES.inc(client, str(event.reason))
+
+        def connection_checked_out(self, event):
+            MONGO_CHECKED_OUT.inc(client, _address(event))
+            duration = getattr(event, "duration", None)   # seconds, PyMongo 4.7+
+            if duration is not None:
+                MONGO_CHECKOUT_SECONDS.observe(duration, client)
+
+        def connection_checked_in(self, event):
+            MONGO_CHECKED_OUT.dec(client, _address(event))
+
+    return [CommandTimer(), PoolGauges()]
+
+
+def _address(event):
+    host, port = event.address
+    return f"{host}:{port}"
+
+# References:
+# MongoDB Inc. (2025). PyMongo: monitoring — Command and connection pool monitoring.
+#       https://pymongo.readthedocs.io/en/stable/api/pymongo/monitoring.html
+# Prometheus Authors. (2024). Exposition formats: Text-based format; Histograms and summaries.
+#       https://prometheus.io/docs/instrumenting/exposition_formats/
@@ -0,0 +1,200 @@
+# --------------------------------------------
+# Live census updates via a MongoDB change stream
+# --------------------------------------------
+# CensusWatcher opens ONE database-level change stream filtered to the bay
+# collections (instead of polling every bay) and turns each insert / update /
+# replace / delete into a CensusChange on a thread-safe queue. The Tkinter
+# thread drains that queue with root.after() (see BedBuddy.start_live_updates).
+#
+# The resume token is saved to disk, so after a disconnect or a restart the
+# stream continues where it stopped. The file name carries a hash of the
+# server hosts and DB_NAME, so a token is never offered to another deployment
+# or database (bench vs prod, a migration target). If the server no longer has that point in
+# its oplog, the watcher emits a "reload" change and starts fresh
+# (MongoDB Inc., 2025).
+#
+# Change streams need a replica set. For local testing, a single node works:
+#   mongod --replSet rs0 --dbpath /tmp/rs0 && mongosh --eval "rs.initiate()"
+#   MONGO_URI=mongodb://localhost:27017/?replicaSet=rs0 python -m database.change_stream
+# ----------------------------
+from collections import namedtuple
+import hashlib
+import os
+import queue
+import threading
+import time
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from config.db_config import DB_NAME, MONGO_URI, get_db
+from database.db_operation import get_storage, invalidate_bays, refresh
+
+# op is "upsert" (doc = full document), "delete" (doc = None) or "reload" (start over)
+CensusChange = namedtuple("CensusChange", "op bay doc_id doc")
+
+
+
+def deployment_key(uri=MONGO_URI, db_name=DB_NAME):
+    '''
+    Short hash of the URI's host list and the database name. Credentials and
+    options are left out, so a rotated password keeps the same token file.
+    '''
+    hosts = (uri or "").split("://", 1)[-1].split("/", 1)[0].split("?", 1)[0].rsplit("@", 1)[-1]
+    return hashlib.sha256(f"{hosts.lower()}/{db_name}".encode()).hexdigest()[:16]
+
+
+RESUME_TOKEN_FILE = os.getenv(
+    "CHANGE_STREAM_TOKEN_FILE",
+    os.path.join(os.path.expanduser("~"), ".bedbuddy", f"resume_token_{deployment_key()}.json"),
+)
+TOKEN_SAVE_INTERVAL = 2.0     # seconds between resume-token writes
+MAX_AWAIT_MS = 1000           # how long one poll of the stream may block
+RETRY_BACKOFF = (1, 2, 5, 10, 30)
+CHANGE_STREAM_HISTORY_LOST = 286   # server error code: resume point is gone
+
+_WATCHED_OPERATIONS = ["insert", "update", "replace", "delete"]
+
+
+def _load_token(path):
+    from bson import json_util
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json_util.loads(f.read())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _save_token(path, token):
+    from bson import json_util
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json_util.dumps(token))
+    os.replace(tmp, path)   # atomic, so a crash never leaves half a token
+
+
+def to_census_change(change):
+    '''
+    Translate a raw change stream event into a CensusChange (None if irrelevant).
+    In the single-collection layout a delete's bay is None (the document is gone).
+    '''
+    bay = get_storage().change_bay(change)
+    doc_id = change["documentKey"]["_id"]
+    if change["operationType"] == "delete":
+        return CensusChange("delete", bay, doc_id, None)
+    doc = change.get("fullDocument")
+    if doc is None:   # updated, then deleted before the lookup ran; the delete follows
+        return None
+    if bay is None:   # single layout document without a bay: not on the census
+        return None
+    doc.setdefault("bay", bay)
+    return CensusChange("upsert", bay, doc_id, doc)
+
+
+class CensusWatcher(threading.Thread):
+    '''Background thread feeding CensusChange items into `self.changes`.'''
+
+    def __init__(self, changes=None, token_file=RESUME_TOKEN_FILE):
+        super().__init__(name="census-watcher", daemon=True)
+        self.changes = changes if changes is not None else queue.Queue()
+        self.token_file = token_file
+        self._stop_event = threading.Event()
+        self._token = _load_token(token_file)
+        self._token_dirty = False
+        self._last_save = 0.0
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        attempt = 0
+        while not self._stop_event.is_set():
+            try:
+                self._watch()
+                attempt = 0
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    self._token = None          # resume point gone: reload, then watch from now
+                    self.changes.put(CensusChange("reload", None, None, None))
+                    continue
+                attempt += 1
+            except PyMongoError:
+                attempt += 1
+            self._flush_token(force=True)
+            delay = RETRY_BACKOFF[min(attempt, len(RETRY_BACKOFF)) - 1] if attempt else 0
+            self._stop_event.wait(delay)
+        self._flush_token(force=True)
+
+    def _watch(self):
+        pipeline = [{"$match": {
+            **get_storage().watch_filter(),   # bay collections, or db.patients
+            "operationType": {"$in": _WATCHED_OPERATIONS},
+        }}]
+        with get_db().watch(pipeline, full_document="updateLookup",
+                            resume_after=self._token, max_await_time_ms=MAX_AWAIT_MS) as stream:
+            while not self._stop_event.is_set() and stream.alive:
+                change = stream.try_next()
+                if change is not None:
+                    census_change = to_census_change(change)
+                    if census_change is not None:
+                        if census_change.bay is not None:
+                            invalidate_bays([census_change.bay])   # keep the read cache honest too
+                        else:
+                            refresh()   # delete in the single layout: bay unknown, drop it all
+                        self.changes.put(census_change)
+                if stream.resume_token is not None and stream.resume_token != self._token:
+                    self._token = stream.resume_token
+                    self._token_dirty = True
+                self._flush_token()
+
+    def _flush_token(self, force=False):
+        if not self._token_dirty or self._token is None:
+            return
+        now = time.monotonic()
+        if force or now - self._last_save >= TOKEN_SAVE_INTERVAL:
+            try:
+                _save_token(self.token_file, self._token)
+                self._token_dirty = False
+                self._last_save = now
+            except OSError:
+                pass   # a lost token only means a reload after restart
+
+
+def drain(changes, limit=None):
+    '''
+    Take every pending change off the queue without blocking and coalesce
+    them: the last change per (bay, _id) wins, ordered by each key's latest change.
+    A "reload" discards everything queued before it.
+    Returns (reload_needed, [CensusChange, ...]).
+    '''
+    pending, reload_needed, taken = {}, False, 0
+    while limit is None or taken < limit:
+        try:
+            change = changes.get_nowait()
+        except queue.Empty:
+            break
+        taken += 1
+        if change.op == "reload":
+            pending.clear()
+            reload_needed = True
+            continue
+        pending.pop((change.bay, change.doc_id), None)
+        pending[(change.bay, change.doc_id)] = change
+    return reload_needed, list(pending.values())
+
+
+if __name__ == "__main__":
+    # Print live changes (manual test against a local replica set, see header)
+    watcher = CensusWatcher()
+    watcher.start()
+    try:
+        while True:
+            print(watcher.changes.get())
+    except KeyboardInterrupt:
+        watcher.stop()
+
+# References:
+# MongoDB Inc. (2025). Change streams; Resume a change stream. MongoDB manual.
+#       https://www.mongodb.com/docs/manual/changeStreams/
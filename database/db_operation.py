@@ -1,30 +1,597 @@
 # Using PyMongo
-from config.db_config import get_db
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+import threading
+import time
 
-db = get_db()
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 
+from config.db_config import get_client, get_db
+from config.metrics import callback, counter, histogram, timed
+
+log = logging.getLogger(__name__)
+
+# Filter shared by every census query: only documents that hold a named patient
+PATIENT_FILTER = {
+    "first_name": {"$exists": True, "$ne": ""},
+    "last_name": {"$exists": True, "$ne": ""}
+}
+
+# Fields the dashboard actually shows (name, bed, DOB, priority)
+CENSUS_FIELDS = ("first_name", "last_name", "bed", "dob", "priority")
+
+# Collections that share the database with the bays but are not bays
+# ("patients" is the single-collection layout below, never a bay itself)
+NON_BAY_COLLECTIONS = ("users", "refresh_tokens", "meta", "patients")
+
+# Census version counter: {"_id": "census", "version": n, "bays": {bay key: n}}.
+# Every write below bumps it, so the API can derive ETags from it without
+# re-reading the census (see backend/census_api.py). Bay names are escaped
+# into field names (version_key) so "." or a leading "$" cannot nest or break
+# the $inc. A bump that fails after its write is logged, kept in this process
+# and retried before the next version read or write (census_versions_pending).
+CENSUS_META = "meta"
+CENSUS_VERSION_ID = "census"
+
+# Upper bound on concurrent per-bay queries. PyMongo releases the GIL while it
+# waits on the socket, so a small thread pool overlaps the network round trips.
+CENSUS_MAX_WORKERS = int(os.getenv("CENSUS_MAX_WORKERS", "16"))
+
+# ----------------------------
+# Storage layout
+# ----------------------------
+# per_bay (default): one collection per bay, db[bay] (the original schema).
+# single:            one "patients" collection with a "bay" field and compound
+#                    indexes (database/indexes.py); the whole census is one
+#                    query and a move is one update, no transaction needed.
+# Switch with PATIENT_STORAGE=single after running database/migrate_layout.py.
+PATIENT_STORAGE = os.getenv("PATIENT_STORAGE", "per_bay")
+PATIENTS_COLLECTION = "patients"
+ALL_BAYS = "*"  # pseudo-bay: the whole census in one query (single layout)
+
+class PerBayStorage:
+    """Bay = collection."""
+    name = "per_bay"
+    single_collection = False
+
+    def list_bays(self, db):
+        names = db.list_collection_names(filter={"name": {"$nin": list(NON_BAY_COLLECTIONS)}})
+        return [name for name in names if not name.startswith("system.")]
+
+    def collection(self, db, bay):
+        return db[bay]
+
+    def in_bay(self, bay, query):
+        return query
+
+    def watch_filter(self):
+        """Change stream $match on the namespace."""
+        return {"ns.coll": {"$nin": list(NON_BAY_COLLECTIONS)}}
+
+    def change_bay(self, change):
+        """Bay of a change stream event."""
+        return change["ns"]["coll"]
+
+class SingleCollectionStorage:
+    """Every bay in db.patients, told apart by the "bay" field."""
+    name = "single"
+    single_collection = True
+
+    def list_bays(self, db):
+        return sorted(bay for bay in db[PATIENTS_COLLECTION].distinct("bay") if bay)  # bay_bed index
+
+    def collection(self, db, bay):
+        return db[PATIENTS_COLLECTION]
+
+    def in_bay(self, bay, query):
+        return query if bay == ALL_BAYS else {**query, "bay": bay}
+
+    def watch_filter(self):
+        return {"ns.coll": PATIENTS_COLLECTION}
+
+    def change_bay(self, change):
+        # Deletes carry no document, so their bay is unknown (None)
+        return (change.get("fullDocument") or {}).get("bay")
+
+STORAGES = {"per_bay": PerBayStorage(), "single": SingleCollectionStorage()}
+if PATIENT_STORAGE not in STORAGES:
+    raise ValueError(f"PATIENT_STORAGE must be one of {sorted(STORAGES)}, not {PATIENT_STORAGE!r}")
+_storage = STORAGES[PATIENT_STORAGE]
+
+def get_storage():
+    return _storage
+
+def set_storage(name):
+    """Switch layout at runtime (migration tool, benchmarks); drops the read cache."""
+    global _storage
+    _storage = STORAGES[name]
+    refresh()
+
+# ----------------------------
+# Read cache
+# ----------------------------
+# The bay layout changes about once a year, so the bay list is cached for a day.
+# Per-bay patient lists are cached briefly and dropped as soon as one of our
+# own write functions touches that bay; refresh() clears everything.
+BAY_LIST_TTL = float(os.getenv("BAY_LIST_TTL", "86400"))        # seconds
+CENSUS_CACHE_TTL = float(os.getenv("CENSUS_CACHE_TTL", "30"))   # seconds, 0 disables
+CENSUS_CACHE_SIZE = int(os.getenv("CENSUS_CACHE_SIZE", "256"))  # (bay, projection) entries
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (True, value) on a fresh hit, else (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, key, value):
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, match=None):
+        """Drop every entry (match=None) or the entries whose key satisfies match(key)."""
+        with self._lock:
+            if match is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if match(key)]:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+_bay_cache = TTLCache(maxsize=1, ttl=BAY_LIST_TTL)
+_census_cache = TTLCache(maxsize=CENSUS_CACHE_SIZE, ttl=CENSUS_CACHE_TTL)
+# Bumped on every invalidation, so a query that started before a write never
+# stores its (now stale) result after the write has invalidated the bay
+_bay_generation = {}
+_cache_epoch = 0  # bumped by refresh(), covers bays never invalidated individually
+_generation_lock = threading.Lock()
+
+def _projection_key(projection):
+    return None if projection is None else tuple(sorted(projection.items()))
+
+def invalidate_bays(bays):
+    """Drop cached patient lists for the given bays (called by our write functions)."""
+    bays = set(bays) | {ALL_BAYS}  # any write also changes the whole-census entries
+    with _generation_lock:
+        for bay in bays:
+            _bay_generation[bay] = _bay_generation.get(bay, 0) + 1
+    _census_cache.invalidate(lambda key: key[0] in bays)
+    found, cached_bays = _bay_cache.get("bays")
+    if found and not bays.issubset(cached_bays):
+        _bay_cache.invalidate()  # a write created a new bay collection
+
+def version_key(bay):
+    """Bay name -> field name under "bays": "%", "." and "$" are percent-encoded."""
+    return str(bay).replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+def bay_from_version_key(key):
+    return key.replace("%24", "$").replace("%2E", ".").replace("%25", "%")
+
+def decode_census_versions(doc):
+    """(census version, {bay: version}) from a meta document (or None)."""
+    doc = doc or {}
+    return doc.get("version", 0), {bay_from_version_key(key): n for key, n in doc.get("bays", {}).items()}
+
+def bump_census_version(bays):
+    """Record that `bays` changed: +1 on the census version and on each bay's version."""
+    bays = set(bays)
+    if not bays:
+        return
+    inc = {"version": 1}
+    inc.update({f"bays.{version_key(bay)}": 1 for bay in bays if bay is not None})
+    get_db()[CENSUS_META].update_one({"_id": CENSUS_VERSION_ID}, {"$inc": inc}, upsert=True)
+
+# Bays whose write landed but whose version bump failed (this process only)
+_unbumped = set()
+_unbumped_lock = threading.Lock()
+CENSUS_BUMP_FAILURES = counter(
+    "bedbuddy_census_version_bump_failures_total", "Writes whose census version bump failed")
+
+def census_versions_pending():
+    """True while a failed version bump has not been re-applied: versions may be behind the data."""
+    with _unbumped_lock:
+        return bool(_unbumped)
+
+def _flush_census_versions(bays=()):
+    """Bump `bays` plus any earlier failed bumps; on failure keep them all pending and log."""
+    with _unbumped_lock:
+        bays = set(bays) | _unbumped
+        _unbumped.clear()
+    if not bays:
+        return True
+    try:
+        bump_census_version(bays)
+        return True
+    except PyMongoError:
+        with _unbumped_lock:
+            _unbumped.update(bays)
+        CENSUS_BUMP_FAILURES.inc()
+        log.exception("Census version bump failed for bays %s; ETags and snapshots may be stale "
+                      "until it is retried", sorted(map(str, bays)))
+        return False
+
+def get_census_versions():
+    """(census version, {bay: version}) from the meta document; zeros before the first write."""
+    _flush_census_versions()
+    return decode_census_versions(get_db()[CENSUS_META].find_one({"_id": CENSUS_VERSION_ID}))
+
+def _written(bays):
+    """After any write: drop the cached bays and bump their versions (never masks the write's result)."""
+    invalidate_bays(bays)
+    _flush_census_versions(bays)
+
+def refresh():
+    """Forget every cached bay list and patient list (UI refresh button)."""
+    global _cache_epoch
+    with _generation_lock:
+        _cache_epoch += 1
+    _bay_cache.invalidate()
+    _census_cache.invalidate()
+
+def cache_stats():
+    """Hit/miss counters for the bay list and census caches."""
+    return {"bays": _bay_cache.stats(), "census": _census_cache.stats()}
+
+# ----------------------------
+# Metrics (BEDBUDDY_METRICS=1, see config/metrics.py)
+# ----------------------------
+# Wall time per public function, cache hits included; the MongoDB command
+# listeners show how much of it was spent waiting on the server.
+DB_OPERATION_SECONDS = histogram(
+    "bedbuddy_db_operation_seconds", "db_operation call time, cache hits included", ("operation",))
+callback("bedbuddy_db_cache_lookups_total", "db_operation read cache lookups", lambda: {
+    (name, result): stats[result] for name, stats in cache_stats().items() for result in ("hits", "misses")
+}, ("cache", "result"), kind="counter")
+
+# ----------------------------
+# Reads
+# ----------------------------
 # List NAMES of collections (bays), returns LIST[STR]
-def get_bays():
-    return db.list_collection_names() # Return list of collection names
-
-# List ALL patients in ALL bays, returns LIST[STR]
-def get_all_patients():
-    bays = get_bays() # Get all bay names
-    all_patients: list[str] = [] # New list[str] for all patients
-    for bay in bays:
-        bay_collection = db[bay] # Get collection of bay name
-        all_patients += list(bay_collection.find({ # Append all patients in bay to current list
-            "first_name": {"$exists": True, "$ne": ""},
-            "last_name": {"$exists": True, "$ne": ""}
-        }))
+@timed(DB_OPERATION_SECONDS)
+def get_bays(use_cache=True):
+    if use_cache:
+        found, bays = _bay_cache.get("bays")
+        if found:
+            return list(bays)
+    bays = get_storage().list_bays(get_db()) # Collection names, or distinct "bay" values
+    _bay_cache.put("bays", tuple(bays))
+    return bays
+
+# Find patients in ONE bay, returns LIST[DICT]
+@timed(DB_OPERATION_SECONDS)
+def get_bay_patients(bay, projection=None, use_cache=True):
+    return _find_in_bay(bay, "patients", PATIENT_FILTER, projection, use_cache)
+
+# Find ALL documents in ONE bay (patients and empty bed placeholders), returns LIST[DICT]
+@timed(DB_OPERATION_SECONDS)
+def get_bay_beds(bay, projection=None, use_cache=True):
+    docs = _find_in_bay(bay, "beds", {}, projection, use_cache)
+    for doc in docs:
+        doc.setdefault("bay", bay)
+    return docs
+
+def _find_in_bay(bay, query_name, query, projection, use_cache):
+    if projection is not None and not isinstance(projection, dict):
+        projection = {field: 1 for field in projection}
+    key = (bay, query_name, _projection_key(projection))
+    if use_cache:
+        found, docs = _census_cache.get(key)
+        if found:
+            return [dict(doc) for doc in docs]
+    generation = (_cache_epoch, _bay_generation.get(bay, 0))
+    storage = get_storage()
+    docs = list(storage.collection(get_db(), bay).find(storage.in_bay(bay, query), projection))
+    with _generation_lock:
+        if (_cache_epoch, _bay_generation.get(bay, 0)) == generation:
+            _census_cache.put(key, tuple(dict(doc) for doc in docs))
+    return docs
+
+# List ALL patients in ALL bays, returns LIST[DICT]
+@timed(DB_OPERATION_SECONDS)
+def get_all_patients(projection=None, max_workers=CENSUS_MAX_WORKERS, use_cache=True):
+    """
+    Load every patient from every bay.
+    The per-bay queries run in parallel on a bounded thread pool and the
+    results are merged in bay order. Pass a projection (e.g. CENSUS_FIELDS)
+    to avoid pulling whole patient documents. Bays already in the read cache
+    cost no query at all.
+    """
+    if projection is not None and not isinstance(projection, dict):
+        projection = {field: 1 for field in projection}
+    if get_storage().single_collection:  # one indexed query for the whole census
+        return _find_in_bay(ALL_BAYS, "patients", PATIENT_FILTER, _with_bay(projection), use_cache)
+    bays = get_bays(use_cache) # Get all bay names
+
+    results = _map_bays(lambda bay: get_bay_patients(bay, projection, use_cache), bays, max_workers)
+
+    all_patients: list[dict] = [] # New list for all patients
+    for bay_patients in results:
+        all_patients += bay_patients # Append all patients in bay to current list
     return all_patients
 
-# PLACEHOLDER for inserting a patient
+# List ALL bed documents in ALL bays (each tagged with its "bay"), returns LIST[DICT]
+@timed(DB_OPERATION_SECONDS)
+def get_all_beds(projection=None, max_workers=CENSUS_MAX_WORKERS, use_cache=True):
+    if projection is not None and not isinstance(projection, dict):
+        projection = {field: 1 for field in projection}
+    if get_storage().single_collection:
+        return _find_in_bay(ALL_BAYS, "beds", {}, _with_bay(projection), use_cache)
+    results = _map_bays(lambda bay: get_bay_beds(bay, projection, use_cache), get_bays(use_cache), max_workers)
+    return [doc for bay_docs in results for doc in bay_docs]
+
+# ----------------------------
+# Streaming and keyset pagination
+# ----------------------------
+# get_all_patients() holds the whole census in one list. These two read the
+# same patients without that: iter_patients() yields documents while the
+# cursors stream (batch_size documents per round trip), and
+# get_patients_page() returns one page in (bay, _id) order, resuming from the
+# last row of the previous page instead of skipping over it.
+# Neither goes through the read cache.
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+PAGE_SIZE = 100
+
+def _as_projection(projection):
+    if projection is not None and not isinstance(projection, dict):
+        projection = {field: 1 for field in projection}
+    return projection
+
+# Yield ALL patients bay by bay as they arrive, returns ITERATOR[DICT]
+def iter_patients(projection=None, batch_size=STREAM_BATCH_SIZE, bays=None):
+    """
+    Generator over every patient (each tagged with its "bay"). Memory stays
+    at about one batch, and the first patient is available after the first
+    round trip. Stop iterating (or close() it) to release the open cursor.
+    """
+    projection = _as_projection(projection)
+    for bay in (sorted(get_bays()) if bays is None else bays):
+        storage = get_storage()
+        query = storage.in_bay(bay, PATIENT_FILTER)
+        with storage.collection(get_db(), bay).find(query, projection, batch_size=batch_size) as cursor:
+            for doc in cursor:
+                doc.setdefault("bay", bay)
+                yield doc
+
+# One page of patients ordered by (bay, _id), returns (LIST[DICT], next cursor or None)
+@timed(DB_OPERATION_SECONDS)
+def get_patients_page(limit=PAGE_SIZE, after_id=None, after_bay=None, projection=None):
+    """
+    Keyset pagination across bays. Pass the (bay, _id) of the last row of the
+    previous page as after_bay/after_id (the returned cursor) to get the next
+    page; None means there are no more pages. Each bay is read with an _id
+    range on the default _id index, so page 500 costs the same as page 1.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")  # MongoDB reads limit(0) as "no limit"
+    projection = _as_projection(projection)
+    if projection is not None and projection.get("_id") == 0:
+        raise ValueError("keyset pagination needs _id in the projection")
+    page = []
+    for bay in sorted(get_bays()):
+        if after_bay is not None and bay < after_bay:
+            continue
+        storage = get_storage()
+        query = PATIENT_FILTER
+        if bay == after_bay and after_id is not None:
+            query = {**PATIENT_FILTER, "_id": {"$gt": after_id}}
+        docs = (storage.collection(get_db(), bay).find(storage.in_bay(bay, query), projection)
+                .sort("_id", 1).limit(limit - len(page)))  # bay_id index in the single layout
+        for doc in docs:
+            doc.setdefault("bay", bay)
+            page.append(doc)
+        if len(page) >= limit:
+            return page, (bay, page[-1]["_id"])
+    return page, None
+
+def _with_bay(projection):
+    """An inclusion projection that also keeps "bay" (single layout needs it in the result)."""
+    if projection and any(value and key != "_id" for key, value in projection.items()):
+        return {**projection, "bay": 1}
+    return projection
+
+# Run fn(bay) for every bay on the bounded pool, results in bay order
+def _map_bays(fn, bays, max_workers=CENSUS_MAX_WORKERS):
+    bays = list(bays)
+    workers = max(1, min(max_workers, len(bays)))
+    if workers == 1:
+        return [fn(bay) for bay in bays]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bays") as pool:
+        return list(pool.map(fn, bays))
+
+# Insert ONE patient (dict with a "bay" key), returns InsertOneResult
+@timed(DB_OPERATION_SECONDS)
 def insert_patient(patient_data):
-    bay_collection = db[patient_data.bay]
-    return bay_collection.insert_one(patient_data)
+    bay_collection = get_storage().collection(get_db(), patient_data["bay"])
+    try:
+        return bay_collection.insert_one(patient_data)
+    finally:
+        _written([patient_data["bay"]])
 
-# PLACEHOLDER for deleting a patient
+# Delete ONE patient (dict with "bay" and "_id"), returns DeleteResult
+@timed(DB_OPERATION_SECONDS)
 def delete_patient(patient_data):
-    bay_collection = db[patient_data.bay]
-    return bay_collection.delete_one({"_id": patient_data.patient_id})
+    storage = get_storage()
+    bay_collection = storage.collection(get_db(), patient_data["bay"])
+    try:
+        return bay_collection.delete_one(storage.in_bay(patient_data["bay"], {"_id": patient_data["_id"]}))
+    finally:
+        _written([patient_data["bay"]])
+
+# ----------------------------
+# Batch writes
+# ----------------------------
+# Each batch call groups its items by bay collection and sends one unordered
+# bulk_write per bay (bays in parallel), so N changes cost one round trip per
+# bay instead of one per patient. Every call returns one result dict per input
+# item, in input order: {"ok": bool, "_id": ..., "error": str | None}.
+
+def _group_by_bay(items, key="bay"):
+    groups = {}
+    for index, item in enumerate(items):
+        groups.setdefault(item[key], []).append((index, item))
+    return groups
+
+def _result(ok, _id, error=None):
+    return {"ok": ok, "_id": _id, "error": error}
+
+def _bulk_errors(bay, ops):
+    """Run an unordered bulk_write; return {op index: error message}."""
+    try:
+        get_storage().collection(get_db(), bay).bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        return {err["index"]: err.get("errmsg", "write error") for err in e.details.get("writeErrors", [])}
+    return {}
+
+def _run_grouped(groups, write_bay, total):
+    results = [None] * total
+    def run(bay):
+        try:
+            return write_bay(bay, groups[bay])
+        except PyMongoError as e:  # whole bay failed (network, auth, ...)
+            return [(index, _result(False, item.get("_id"), str(e))) for index, item in groups[bay]]
+    try:
+        for bay_results in _map_bays(run, groups):
+            for index, result in bay_results:
+                results[index] = result
+    finally:
+        _written(groups)
+    return results
+
+# Insert MANY patients (dicts with a "bay" key), returns LIST[DICT] of per-item results
+@timed(DB_OPERATION_SECONDS)
+def insert_patients(patients):
+    def write_bay(bay, entries):
+        ops = [InsertOne(patient) for _, patient in entries]  # fills in patient["_id"]
+        errors = _bulk_errors(bay, ops)
+        return [(index, _result(i not in errors, patient.get("_id"), errors.get(i)))
+                for i, (index, patient) in enumerate(entries)]
+    return _run_grouped(_group_by_bay(patients), write_bay, len(patients))
+
+# Discharge (delete) MANY patients (dicts with "bay" and "_id"), returns LIST[DICT]
+@timed(DB_OPERATION_SECONDS)
+def discharge_patients(patients):
+    def write_bay(bay, entries):
+        return _write_existing(bay, entries, lambda patient: DeleteOne({"_id": patient["_id"]}))
+    return _run_grouped(_group_by_bay(patients), write_bay, len(patients))
+
+def _write_existing(bay, entries, make_op):
+    """
+    Bulk-apply make_op(item) to the items whose _id exists in the bay.
+    One extra _id-only query per bay tells "not found" apart from success,
+    which bulk_write's aggregate counts cannot do per item.
+    """
+    ids = [item["_id"] for _, item in entries]
+    storage = get_storage()
+    present = {doc["_id"] for doc in storage.collection(get_db(), bay).find(
+        storage.in_bay(bay, {"_id": {"$in": ids}}), {"_id": 1})}
+    targets = [item for _, item in entries if item["_id"] in present]
+    errors = _bulk_errors(bay, [make_op(item) for item in targets]) if targets else {}
+    failed = {targets[i]["_id"]: msg for i, msg in errors.items()}
+    out = []
+    for index, item in entries:
+        _id = item["_id"]
+        if _id not in present:
+            out.append((index, _result(False, _id, "not found")))
+        else:
+            out.append((index, _result(_id not in failed, _id, failed.get(_id))))
+    return out
+
+# Move MANY patients between beds/bays, returns LIST[DICT]
+@timed(DB_OPERATION_SECONDS)
+def move_patients(moves):
+    """
+    Each move is {"_id", "from_bay", "to_bay", "bed"}.
+    Moves inside one bay are a bulk update of the bed field. Moves between
+    bays are grouped by (from_bay, to_bay) and each group runs in one session
+    transaction (insert into the target bay, delete from the source), so a
+    patient is never in both bays or in neither (needs a replica set).
+    In the single-collection layout every move is one update of bay + bed.
+    """
+    single = get_storage().single_collection
+    results = [None] * len(moves)
+    transfers = {}
+    for index, move in enumerate(moves):
+        transfers.setdefault((move["from_bay"], move["to_bay"]), []).append((index, move))
+
+    def run(pair):
+        from_bay, to_bay = pair
+        entries = transfers[pair]
+        try:
+            if from_bay == to_bay or single:
+                return _move_in_place(from_bay, entries)
+            return _transfer_between_bays(from_bay, to_bay, entries)
+        except PyMongoError as e:
+            return [(index, _result(False, move["_id"], str(e))) for index, move in entries]
+
+    try:
+        for pair_results in _map_bays(run, transfers):
+            for index, result in pair_results:
+                results[index] = result
+    finally:
+        _written({bay for pair in transfers for bay in pair})
+    return results
+
+def _move_in_place(bay, entries):
+    """Update bed (and bay) where the documents are: same bay, or single layout."""
+    return _write_existing(bay, entries, lambda move: UpdateOne(
+        {"_id": move["_id"]}, {"$set": {"bay": move["to_bay"], "bed": move["bed"]}}))
+
+def _transfer_between_bays(from_bay, to_bay, entries):
+    db = get_db()
+    ids = [move["_id"] for _, move in entries]
+    beds = {move["_id"]: move["bed"] for _, move in entries}
+    moved = set()
+
+    def transfer(session):
+        moved.clear()  # with_transaction may retry this callback
+        docs = list(db[from_bay].find({"_id": {"$in": ids}}, session=session))
+        if not docs:
+            return
+        for doc in docs:
+            doc["bay"] = to_bay
+            doc["bed"] = beds[doc["_id"]]
+        db[to_bay].insert_many(docs, ordered=True, session=session)
+        db[from_bay].delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}}, session=session)
+        moved.update(doc["_id"] for doc in docs)
+
+    with get_client().start_session() as session:
+        session.with_transaction(transfer)
+    return [(index, _result(move["_id"] in moved, move["_id"],
+                            None if move["_id"] in moved else "not found"))
+            for index, move in entries]
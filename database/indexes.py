@@ -0,0 +1,134 @@
+# --------------------------------------------
+# Index management for the BedBuddy database
+# --------------------------------------------
+# ensure_indexes() creates every index the app relies on. It is idempotent
+# (create_indexes is a no-op for indexes that already exist) and runs at API
+# startup. check_indexes() runs explain() on the hot queries and reports any
+# that would still scan a whole collection (MongoDB Inc., 2025).
+#
+#   python -m database.indexes            # create indexes
+#   python -m database.indexes --check    # create, then fail if any hot query plans a COLLSCAN
+# ----------------------------
+import argparse
+import sys
+
+from pymongo import ASCENDING, IndexModel
+
+from config.db_config import get_db
+from database.db_operation import PATIENT_FILTER, PATIENTS_COLLECTION, get_bays, get_storage
+
+# users: one account per username; register relies on this (DuplicateKeyError)
+USER_INDEXES = [
+    IndexModel([("username", ASCENDING)], unique=True, name="username_unique"),
+]
+
+# refresh_tokens: O(1) lookup by hash, family revocation, TTL clean-up of expired tokens
+REFRESH_TOKEN_INDEXES = [
+    IndexModel([("token_hash", ASCENDING)], unique=True, name="token_hash_unique"),
+    IndexModel([("family_id", ASCENDING)], name="family_id"),
+    IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+]
+
+# every bay: the census filter (first/last name), bed lookups and triage by priority
+BAY_INDEXES = [
+    IndexModel([("last_name", ASCENDING), ("first_name", ASCENDING)], name="patient_name"),
+    IndexModel([("bed", ASCENDING)], name="bed"),
+    IndexModel([("priority", ASCENDING)], name="priority"),
+]
+
+# patients (single-collection layout): per-bay census and bed lookups, keyset
+# pages within a bay, triage by priority, admission status, and the name filter
+PATIENTS_INDEXES = [
+    IndexModel([("bay", ASCENDING), ("bed", ASCENDING)], name="bay_bed"),
+    IndexModel([("bay", ASCENDING), ("_id", ASCENDING)], name="bay_id"),
+    IndexModel([("priority", ASCENDING), ("bay", ASCENDING)], name="priority_bay"),
+    IndexModel([("status", ASCENDING), ("bay", ASCENDING)], name="status_bay"),
+    IndexModel([("last_name", ASCENDING), ("first_name", ASCENDING)], name="patient_name"),
+]
+
+
+def ensure_indexes(db=None):
+    '''
+    Create all indexes (safe to call on every startup).
+    Returns {collection name: [index names]}.
+    '''
+    db = db if db is not None else get_db()
+    created = {
+        "users": db["users"].create_indexes(USER_INDEXES),
+        "refresh_tokens": db["refresh_tokens"].create_indexes(REFRESH_TOKEN_INDEXES),
+    }
+    if get_storage().single_collection:
+        created[PATIENTS_COLLECTION] = db[PATIENTS_COLLECTION].create_indexes(PATIENTS_INDEXES)
+    else:
+        for bay in get_bays():
+            created[bay] = db[bay].create_indexes(BAY_INDEXES)
+    return created
+
+
+def hot_queries(db=None):
+    '''(collection, filter) pairs the app runs on every login, refresh and census load.'''
+    db = db if db is not None else get_db()
+    queries = [
+        ("users", {"username": "__index_check__"}),
+        ("refresh_tokens", {"token_hash": "__index_check__"}),
+    ]
+    if get_storage().single_collection:
+        queries += [(PATIENTS_COLLECTION, PATIENT_FILTER)]
+        queries += [(PATIENTS_COLLECTION, {**PATIENT_FILTER, "bay": bay}) for bay in get_bays()]
+    else:
+        queries += [(bay, PATIENT_FILTER) for bay in get_bays()]
+    return queries
+
+
+def _plan_stages(plan):
+    '''Yield every "stage" name in an explain() plan tree.'''
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+def check_indexes(db=None):
+    '''
+    explain() every hot query. Returns a list of (collection, filter) pairs whose
+    winning plan contains a COLLSCAN; an empty list means every query is indexed.
+    '''
+    db = db if db is not None else get_db()
+    failures = []
+    for collection, query in hot_queries(db):
+        explain = db[collection].find(query).explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in set(_plan_stages(winning_plan)):
+            failures.append((collection, query))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create BedBuddy MongoDB indexes")
+    parser.add_argument("--check", action="store_true",
+                        help="fail if any hot query still plans a collection scan")
+    args = parser.parse_args()
+
+    for collection, names in ensure_indexes().items():
+        print(f"{collection}: {', '.join(names)}")
+    if not args.check:
+        return 0
+
+    failures = check_indexes()
+    for collection, query in failures:
+        print(f"COLLSCAN: {collection} {query}")
+    print("Index check failed." if failures else "Index check passed: no COLLSCAN on hot queries.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# References:
+# MongoDB Inc. (2025). Indexes; Explain results. MongoDB manual.
+#       https://www.mongodb.com/docs/manual/indexes/
+#       https://www.mongodb.com/docs/manual/reference/explain-results/
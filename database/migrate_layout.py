@@ -0,0 +1,168 @@
+# --------------------------------------------
+# Online migration: collection-per-bay -> single "patients" collection
+# --------------------------------------------
+# Copies every bay collection into db.patients (adding a "bay" field) while
+# the app keeps running on the old layout:
+#
+#   1. create the patients indexes (database/indexes.py PATIENTS_INDEXES)
+#   2. note the cluster time, then backfill each bay in batches; writes are
+#      upserts by _id, so the tool can be stopped and re-run at any point
+#   3. --follow: replay every change made since step 2 from a change stream
+#      (needs a replica set) and keep replaying until Ctrl-C
+#   4. verify: per-bay document counts must match in both layouts
+#
+# Cut-over needs a short write freeze. The replay is one-way: writes to
+# db.patients never reach clients still on per_bay, and replaying a late
+# per-bay write would overwrite a newer change made on the single layout. So
+# the two layouts must never take writes at the same time:
+#   a. run with --follow while every client still uses per_bay (no downtime)
+#   b. freeze writes: stop every API worker and close every desktop client
+#   c. wait for "caught up" (no change for IDLE_SECONDS), then Ctrl-C; the
+#      verify step runs
+#   d. start everything again with PATIENT_STORAGE=single
+# The bay collections are left untouched; drop them once you are satisfied
+# (MongoDB Inc., 2025).
+#
+#   python -m database.migrate_layout --follow
+#   python -m database.migrate_layout --verify-only
+# ----------------------------
+import argparse
+import sys
+import time
+
+from pymongo import DeleteOne, ReplaceOne
+
+from config.db_config import get_client, get_db
+from database.db_operation import PATIENTS_COLLECTION, STORAGES
+from database.indexes import PATIENTS_INDEXES
+
+BATCH_SIZE = 1000
+IDLE_SECONDS = 5   # no change for this long during the write freeze = caught up
+
+
+def backfill_bay(db, bay, batch_size=BATCH_SIZE, dry_run=False):
+    '''Upsert every document of db[bay] into db.patients. Returns the number copied.'''
+    target = db[PATIENTS_COLLECTION]
+    copied, ops = 0, []
+    for doc in db[bay].find({}, batch_size=batch_size):
+        doc["bay"] = bay
+        ops.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+        if len(ops) >= batch_size:
+            copied += _flush(target, ops, dry_run)
+    return copied + _flush(target, ops, dry_run)
+
+
+def _flush(target, ops, dry_run):
+    count = len(ops)
+    if ops and not dry_run:
+        target.bulk_write(ops, ordered=False)
+    ops.clear()
+    return count
+
+
+def to_patients_op(change):
+    '''
+    Translate a change on a bay collection into a write on db.patients.
+    Deletes also match the bay, so the delete half of a cross-bay move
+    (insert into the new bay, then delete from the old) leaves the moved
+    document alone.
+    '''
+    bay = change["ns"]["coll"]
+    doc_id = change["documentKey"]["_id"]
+    if change["operationType"] == "delete":
+        return DeleteOne({"_id": doc_id, "bay": bay})
+    doc = change.get("fullDocument")
+    if doc is None:   # deleted before the lookup ran; the delete event follows
+        return None
+    doc["bay"] = bay
+    return ReplaceOne({"_id": doc_id}, doc, upsert=True)
+
+
+def follow(db, start_time, batch_size=BATCH_SIZE):
+    '''
+    Replay bay-collection changes from `start_time` onto db.patients until
+    Ctrl-C. Replays are unconditional upserts, so this is only safe while no
+    client writes with PATIENT_STORAGE=single (see the cut-over steps above).
+    '''
+    pipeline = [{"$match": {
+        **STORAGES["per_bay"].watch_filter(),
+        "operationType": {"$in": ["insert", "update", "replace", "delete"]},
+    }}]
+    target = db[PATIENTS_COLLECTION]
+    applied = 0
+    print("Replaying changes. Freeze writes (stop every API worker and desktop client), "
+          "wait for 'caught up', then Ctrl-C. Do not start PATIENT_STORAGE=single clients before that.")
+    try:
+        with db.watch(pipeline, full_document="updateLookup", start_at_operation_time=start_time,
+                      batch_size=batch_size, max_await_time_ms=1000) as stream:
+            last_change, idle_reported = time.monotonic(), False
+            while stream.alive:
+                change = stream.try_next()
+                if change is None:
+                    if not idle_reported and time.monotonic() - last_change >= IDLE_SECONDS:
+                        print(f"  caught up: {applied} changes applied, none in the last {IDLE_SECONDS} s")
+                        idle_reported = True
+                    continue
+                last_change, idle_reported = time.monotonic(), False
+                op = to_patients_op(change)
+                if op is not None:
+                    target.bulk_write([op], ordered=True)
+                    applied += 1
+                    if applied % 100 == 0:
+                        print(f"  {applied} changes applied")
+    except KeyboardInterrupt:
+        pass
+    return applied
+
+
+def verify(db, bays):
+    '''Returns [(bay, old count, new count)] for every bay whose counts differ.'''
+    target = db[PATIENTS_COLLECTION]
+    mismatches = []
+    for bay in bays:
+        old, new = db[bay].count_documents({}), target.count_documents({"bay": bay})
+        if old != new:
+            mismatches.append((bay, old, new))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate bay collections into one patients collection")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--follow", action="store_true",
+                        help="after the backfill, replay live changes until Ctrl-C (needs a replica set)")
+    parser.add_argument("--verify-only", action="store_true", help="only compare per-bay counts")
+    parser.add_argument("--dry-run", action="store_true", help="read and count, write nothing")
+    args = parser.parse_args()
+
+    db = get_db()
+    bays = STORAGES["per_bay"].list_bays(db)
+    if not args.verify_only:
+        if not args.dry_run:
+            db[PATIENTS_COLLECTION].create_indexes(PATIENTS_INDEXES)
+        # Changes from here on are replayed by --follow, so nothing written during the backfill is lost
+        start_time = get_client().admin.command("ping").get("operationTime")
+        for bay in bays:
+            print(f"{bay}: {backfill_bay(db, bay, args.batch_size, args.dry_run)} documents")
+        if args.follow and not args.dry_run:
+            if start_time is None:
+                print("--follow needs a replica set (no cluster time available)")
+                return 1
+            print(f"{follow(db, start_time, args.batch_size)} changes replayed")
+
+    if args.dry_run:
+        return 0
+    mismatches = verify(db, bays)
+    for bay, old, new in mismatches:
+        print(f"MISMATCH {bay}: {old} in the bay collection, {new} in {PATIENTS_COLLECTION}")
+    print("Verify failed." if mismatches else f"Verified {len(bays)} bays.")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# References:
+# MongoDB Inc. (2025). Change streams: Start time; Bulk write operations. MongoDB manual.
+#       https://www.mongodb.com/docs/manual/changeStreams/
+#       https://www.mongodb.com/docs/manual/core/bulk-write-operations/
@@ -0,0 +1,186 @@
+# --------------------------------------------
+# On-disk census snapshot (SQLite) for instant start-up and offline reading
+# --------------------------------------------
+# The client keeps the last census it read in a small SQLite file, one row per
+# bay holding that bay's documents and its census version (the per-bay
+# counters every db_operation write bumps, see bump_census_version):
+#
+#   snapshot = load()                 # milliseconds, no network: draw this first
+#   snapshot = fetch(snapshot)        # then download only the bays whose version moved
+#
+# fetch() reads the versions BEFORE the documents, so a write racing the read
+# can only leave a bay looking older than it is (refetched next time), never
+# newer. Writes that bypass db_operation do not bump versions; the Refresh
+# button (fetch without a snapshot) re-reads everything, and so does any fetch
+# while one of this process's version bumps has failed and not been retried.
+# Edits made outside db_operation (Atlas, admin scripts, migrate_layout) never
+# move a version either, so a snapshot whose last full read is older than
+# SNAPSHOT_MAX_AGE is not used as a base: fetch re-reads everything.
+#
+# The snapshot is a cache: a missing, corrupt or foreign file (another
+# DB_NAME or schema) is ignored, and failing to write it is not an error
+# (Python Software Foundation, 2025; SQLite Consortium, 2024).
+#
+# It holds patient names, DOB and MRN, so its directory is created 0700 and
+# the file (and SQLite's journal, which copies the file's mode) is 0600: other
+# accounts on a shared workstation cannot read it. The dashboard deletes it
+# on logout and when the session expires.
+# ----------------------------
+from collections import namedtuple
+from datetime import datetime, timezone
+import os
+import sqlite3
+import threading
+
+from config.db_config import DB_NAME
+
+APP_DIR = os.path.join(os.path.expanduser("~"), ".bedbuddy")
+SNAPSHOT_FILE = os.getenv("CENSUS_SNAPSHOT_FILE", os.path.join(APP_DIR, "census_snapshot.sqlite"))
+SCHEMA_VERSION = 1
+SNAPSHOT_MAX_AGE = int(os.getenv("CENSUS_SNAPSHOT_MAX_AGE", "900"))   # seconds since the last full read
+
+# delete() bumps the generation; a fetch that started before it never saves
+_generation = 0
+_save_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS bays (bay TEXT PRIMARY KEY, version INTEGER NOT NULL, docs TEXT NOT NULL);
+"""
+
+# bays: {bay: (bay version, [documents])}; saved_at: UTC ISO time of the read;
+# full_at: UTC ISO time of the last read of every bay ("" when unknown)
+Snapshot = namedtuple("Snapshot", "bays version saved_at full_at")
+
+
+def all_docs(snapshot):
+    '''Every document in the snapshot (each carries its "bay"), for Census.from_documents.'''
+    return [doc for _, docs in snapshot.bays.values() for doc in docs]
+
+
+def saved_at_local(snapshot):
+    '''When the snapshot was read, as a local datetime.'''
+    return datetime.fromisoformat(snapshot.saved_at).astimezone()
+
+
+def expired(snapshot, max_age=SNAPSHOT_MAX_AGE):
+    '''True when the last full read is older than max_age seconds (or unknown).'''
+    try:
+        full_at = datetime.fromisoformat(snapshot.full_at)
+    except ValueError:
+        return True
+    return (datetime.now(timezone.utc) - full_at).total_seconds() > max_age
+
+
+def load(path=SNAPSHOT_FILE):
+    '''The snapshot on disk, or None when there is no usable one.'''
+    if not os.path.exists(path):
+        return None
+    from bson import json_util   # ObjectId and dates survive the round trip
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            if meta.get("schema") != str(SCHEMA_VERSION) or meta.get("database") != DB_NAME:
+                return None
+            rows = conn.execute("SELECT bay, version, docs FROM bays").fetchall()
+        finally:
+            conn.close()
+        bays = {bay: (version, json_util.loads(docs)) for bay, version, docs in rows}
+        return Snapshot(bays, int(meta["version"]), meta["saved_at"], meta.get("full_at", ""))
+    except (sqlite3.Error, ValueError, KeyError):
+        return None
+
+
+def _create_private(path):
+    '''Make sure `path` exists readable by this account only (0700 directory, 0600 file).'''
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if os.path.abspath(directory) == APP_DIR:
+        os.chmod(directory, 0o700)   # ours: tighten one created by an older version (never a chosen dir)
+    os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600))
+    os.chmod(path, 0o600)   # also tightens a file written by an older version
+
+
+def save(snapshot, changed=None, path=SNAPSHOT_FILE):
+    '''
+    Write `snapshot` in one transaction. With `changed`, only those bays' rows
+    are rewritten (bays no longer in the snapshot are always removed).
+    '''
+    from bson import json_util
+    _create_private(path)
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(_SCHEMA)
+        bays = snapshot.bays if changed is None else {bay: snapshot.bays[bay] for bay in changed}
+        with conn:
+            placeholders = ",".join("?" * len(snapshot.bays))
+            conn.execute(f"DELETE FROM bays WHERE bay NOT IN ({placeholders})", list(snapshot.bays))
+            conn.executemany("INSERT OR REPLACE INTO bays VALUES (?, ?, ?)", [
+                (bay, version, json_util.dumps(docs)) for bay, (version, docs) in bays.items()])
+            conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+                ("schema", str(SCHEMA_VERSION)), ("database", DB_NAME),
+                ("version", str(snapshot.version)), ("saved_at", snapshot.saved_at),
+                ("full_at", snapshot.full_at)])
+    finally:
+        conn.close()
+
+
+def delete(path=SNAPSHOT_FILE):
+    '''
+    Remove the snapshot and any leftover journal (logout, expired session).
+    A fetch already running in another thread will not write it back.
+    '''
+    global _generation
+    with _save_lock:
+        _generation += 1
+        for name in (path, f"{path}-journal", f"{path}-wal", f"{path}-shm"):
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+
+
+def fetch(snapshot=None, projection=None, path=SNAPSHOT_FILE):
+    '''
+    Read the census from MongoDB and save it as the new snapshot. With a
+    snapshot, only bays that are new or whose version moved are downloaded,
+    unless the snapshot is expired().
+    Returns the new Snapshot; raises PyMongoError when the database is unreachable.
+    '''
+    from database.db_operation import (
+        census_versions_pending, get_all_beds, get_bay_beds, get_bays, get_census_versions,
+    )
+
+    generation = _generation
+    version, versions = get_census_versions()
+    if census_versions_pending() or (snapshot is not None and expired(snapshot)):
+        snapshot = None   # versions cannot be trusted: a lost bump of ours, or too long since a full read
+    bays = get_bays(use_cache=False)
+    saved_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    if snapshot is None:
+        docs = {bay: [] for bay in bays}   # empty bays stay on the snapshot too
+        for doc in get_all_beds(projection=projection, use_cache=False):
+            docs.setdefault(doc["bay"], []).append(doc)
+        new = Snapshot({bay: (versions.get(bay, 0), bay_docs) for bay, bay_docs in docs.items()},
+                       version, saved_at, saved_at)
+        changed = None
+    else:
+        old = snapshot.bays
+        changed = [bay for bay in bays if bay not in old or old[bay][0] != versions.get(bay, 0)]
+        new_bays = {bay: old[bay] for bay in bays if bay not in changed}
+        for bay in changed:
+            new_bays[bay] = (versions.get(bay, 0), get_bay_beds(bay, projection=projection, use_cache=False))
+        new = Snapshot(new_bays, version, saved_at, snapshot.full_at)
+    with _save_lock:
+        if generation == _generation:   # not deleted (logout) while we were reading
+            try:
+                save(new, changed, path)
+            except (OSError, sqlite3.Error):
+                pass   # a lost snapshot only means a slower next start
+    return new
+
+# References:
+# Python Software Foundation. (2025). sqlite3 — DB-API 2.0 interface for SQLite databases.
+#       In Python 3.13 documentation. https://docs.python.org/3/library/sqlite3.html
+# SQLite Consortium. (2024). Atomic commit in SQLite. https://www.sqlite.org/atomiccommit.html
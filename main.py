@@ -1,12 +1,9 @@
 # Entry point for the BedBuddy application
 
 # This module initalizes the system by: 
-#   1. Retrieves patient records from the MongoDB Atalas database
-
-from ui import BedBuddy
-from database.db_operation import get_all_patients
-#   2. Displays basic patient info
-#   3. Launches the BedBuddy graphical interface
+#   1. Launches the BedBuddy graphical interface
+#   2. Shows the census saved on this machine, then fetches what changed from MongoDB Atlas
+#   3. Displays basic patient info once they arrive
 #--------------
 # Design Notes:
 #--------------
@@ -29,21 +26,20 @@ from database.db_operation import get_all_patients
 # ====================================================================================
 
 from ui import BedBuddy
-from database.db_operation import get_all_patients
-
-# Database retrival
-patients = get_all_patients()
+from ui.startup import report_first_window
 
-# Loop through each patient recrod and rpint key details
-for patient in patients:
-    print(f"Name: {patient['first_name']} {patient['last_name']}")
-    print(f"\tLocation: {patient['bed']}")
-    print(f"\tDOB: {patient['dob']}")
-    print(f"\tPriority: {patient['priority']}")
+def print_census(census):
+    """Loop through each patient record and print key details"""
+    for patient in census.patients():
+        print(f"Name: {patient.name}")
+        print(f"\tLocation: {patient.bed}")
+        print(f"\tDOB: {patient.dob}")
+        print(f"\tPriority: {patient.priority}")
 
 if __name__ == "__main__":
+    # The window comes up first; once it is painted, the census saved by the last
+    # session is drawn and only bays changed since then are read from MongoDB
     app = BedBuddy()
+    report_first_window(app.root)  # no-op unless profiling start-up
+    app.start(on_loaded=print_census)  # Snapshot, live updates and census load after the first paint
     app.run()
-
-
-
@@ -1,19 +1,10 @@
-import os
-import certifi
-from dotenv import load_dotenv
-from pymongo import MongoClient
-
-# Load your .env file
-load_dotenv()
-uri = os.getenv("MONGO_URI")
-
-# Connect with TLS certificate check
-client = MongoClient(uri, tlsCAFile=certifi.where(), serverSelectionTimeoutMS=5000)
+from config.db_config import ping, pool_settings
 
+# Uses the shared, pooled client from config/db_config.py (TLS CA and timeouts live there)
 try:
-    client.admin.command("ping")
-    print("Connected to MongoDB:")
-    
+    rtt_ms = ping()
+    print(f"Connected to MongoDB: ({rtt_ms:.1f} ms)")
+    print("Pool settings:", pool_settings())
+
 except Exception as e:
     print("Connection failed:", e)
-
@@ -0,0 +1,100 @@
+# --------------------------------------------
+# Analytics: census event hooks and the vectorized metrics
+# --------------------------------------------
+#   python -m pytest -q tests
+# ----------------------------
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from buslogic.analytics import (  # noqa: E402
+    ADMIT, ARRIVE, DISCHARGE, MOVE, NO_BED, EventLog, bed_stays, door_to_bed, grouped_percentiles,
+    load_events, occupancy, report, save_events, synthetic_events, turnover_times,
+)
+from buslogic.logic import Census  # noqa: E402
+
+
+def waiting_doc(priority=3, bed=""):
+    return {"_id": "p1", "bay": "majors", "bed": bed, "first_name": "Ana", "last_name": "Smith",
+            "priority": priority}
+
+
+@pytest.fixture
+def census():
+    census = Census.from_documents([{"_id": "b1", "bay": "majors", "bed": "B1"},
+                                    {"_id": "b2", "bay": "majors", "bed": "B2"}])
+    census.events = EventLog()
+    return census
+
+
+def kinds(census):
+    return census.events.to_events().kind.tolist()
+
+
+def test_waiting_patient_updates_log_nothing_after_arrival(census):
+    census.apply_document(waiting_doc())
+    census.apply_document(waiting_doc(priority=1))
+    census.apply_document(waiting_doc(priority=2))
+    assert kinds(census) == [ARRIVE]
+
+
+def test_change_stream_admit_move_and_back_to_waiting(census):
+    census.apply_document(waiting_doc())
+    census.apply_document(waiting_doc(bed="B1"))
+    census.apply_document(waiting_doc(bed="B2"))
+    census.apply_document(waiting_doc(bed=""))
+    census.remove_document("majors", "p1")
+    events = census.events.to_events()
+    assert events.kind.tolist() == [ARRIVE, ADMIT, MOVE, MOVE, DISCHARGE]
+    assert events.bed.tolist()[1:3] == [0, 1] and events.bed[3] == NO_BED
+
+
+def events_log():
+    log = EventLog()
+    log.record("arrive", "p1", at=0)
+    log.record("admit", "p1", "A", "B1", at=100)
+    log.record("move", "p1", "B", "B2", at=200)
+    log.record("discharge", "p1", at=400)
+    log.record("arrive", "p2", at=150)
+    log.record("admit", "p2", "A", "B1", at=250)
+    return log.to_events()
+
+
+def test_stays_occupancy_turnover_door_to_bed():
+    events = events_log()
+    stays = bed_stays(events, horizon=500)
+    assert stays.start.tolist() == [100, 200, 250]
+    assert stays.end.tolist() == [200, 400, 500]
+    assert stays.closed.tolist() == [True, True, False]
+    grid, counts = occupancy(stays, 2, 0, 500, 50)
+    assert counts[0].tolist() == [0, 0, 1, 1, 0, 1, 1, 1, 1, 1]
+    assert counts[1].tolist() == [0, 0, 0, 0, 1, 1, 1, 1, 0, 0]
+    assert turnover_times(stays)[1].tolist() == [50]
+    assert door_to_bed(events, stays)[1].tolist() == [100, 100]
+
+
+def test_grouped_percentiles_match_numpy():
+    rng = np.random.default_rng(1)
+    groups, values = rng.integers(0, 5, 1000), rng.random(1000)
+    result = grouped_percentiles(groups, values, 6, (50, 90))
+    expected = [np.percentile(values[groups == g], [50, 90]) for g in range(5)]
+    assert np.allclose(result[:5], expected)
+    assert np.isnan(result[5]).all()
+
+
+def test_save_load_round_trip(tmp_path):
+    events = events_log()
+    path = tmp_path / "history.npz"
+    save_events(events, path)
+    loaded = load_events(path)
+    assert loaded.beds == events.beds and loaded.patient_ids == events.patient_ids
+    assert np.array_equal(loaded.time, events.time)
+
+
+def test_synthetic_report_is_consistent():
+    events = synthetic_events(days=7, bays=2, beds_per_bay=5, seed=3)
+    result = report(events)
+    for row in result["bays"]:
+        assert row["beds"] == 5
+        assert 0 < row["utilization"] <= 1
+        assert row["occupancy_peak"] <= 5
@@ -0,0 +1,21 @@
+# --------------------------------------------
+# ApiClient: the process-wide client and its lifetime
+# --------------------------------------------
+#   python -m pytest -q tests
+# ----------------------------
+from ui.api_client import ApiClient, close_api_client, get_api_client
+
+
+def test_closing_the_shared_client_resets_it():
+    client = get_api_client()
+    assert get_api_client() is client
+    assert close_api_client(client)
+    assert get_api_client() is not client
+    close_api_client(get_api_client())
+
+
+def test_other_clients_are_left_to_their_owner():
+    shared, own = get_api_client(), ApiClient()
+    assert not close_api_client(own)
+    assert get_api_client() is shared
+    close_api_client(shared)
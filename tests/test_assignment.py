@@ -0,0 +1,124 @@
+# --------------------------------------------
+# BedAssigner: priority order, isolation and preferred bay constraints
+# --------------------------------------------
+#   python -m pytest -q tests
+# ----------------------------
+import pytest
+
+from buslogic.assignment import COMPACT_SLACK, Assignment, BedAssigner
+from buslogic.logic import Census
+
+
+def full_assigner(**kwargs):
+    assigner = BedAssigner(**kwargs)
+    assigner.add_bed("majors", "B1", free=False)
+    assigner.add_bed("majors", "B2", free=False)
+    assigner.add_bed("resus", "R1", isolation=True, free=False)
+    return assigner
+
+
+def test_free_bed_is_assigned_on_arrival():
+    assigner = BedAssigner()
+    assigner.add_bed("majors", "B10")
+    assigner.add_bed("majors", "B2")
+    assert assigner.arrive("p1", 3, 0.0) == Assignment("p1", "majors", "B2")   # natural bed order
+    assert assigner.free_count() == 1
+
+
+def test_released_bed_goes_to_most_urgent_then_longest_waiting():
+    assigner = full_assigner()
+    assigner.arrive("late-urgent", 1, 20.0)
+    assigner.arrive("early", 3, 5.0)
+    assigner.arrive("early-urgent", 1, 10.0)
+    assert assigner.release("majors", "B1").patient_id == "early-urgent"
+    assert assigner.release("majors", "B2").patient_id == "late-urgent"
+    assert assigner.next_waiting() == "early"
+
+
+def test_isolation_bed_only_overflows_when_allowed():
+    assigner = full_assigner()
+    assigner.arrive("p1", 1, 0.0)
+    assert assigner.release("resus", "R1") is None          # kept free for isolation
+    assert assigner.arrive("iso", 2, 1.0, isolation=True) == Assignment("iso", "resus", "R1")
+
+    overflow = full_assigner(allow_isolation_overflow=True)
+    overflow.arrive("p1", 1, 0.0)
+    assert overflow.release("resus", "R1") == Assignment("p1", "resus", "R1")
+
+
+def test_isolation_patient_wins_isolation_bed_over_more_urgent_patient():
+    assigner = full_assigner(allow_isolation_overflow=True)
+    assigner.arrive("urgent", 1, 0.0)
+    assigner.arrive("iso", 4, 1.0, isolation=True)
+    assert assigner.release("resus", "R1").patient_id == "iso"
+
+
+def test_preferred_bay_is_used_when_it_has_a_free_bed():
+    assigner = BedAssigner()
+    assigner.add_bed("majors", "B1")
+    assigner.add_bed("minors", "M1")
+    assert assigner.arrive("p1", 3, 0.0, preferred_bay="minors").bay == "minors"
+    assert assigner.arrive("p2", 3, 1.0, preferred_bay="minors").bay == "majors"
+
+
+def test_cancel_and_reprioritize_skip_stale_entries():
+    assigner = full_assigner()
+    assigner.arrive("p1", 2, 0.0)
+    assigner.arrive("p2", 3, 1.0)
+    assigner.arrive("p3", 3, 2.0)
+    assigner.cancel("p1")
+    assigner.reprioritize("p3", 1)
+    assert assigner.waiting_count() == 2
+    assert assigner.release("majors", "B1").patient_id == "p3"
+    assert assigner.release("majors", "B2").patient_id == "p2"
+
+
+def test_occupied_bed_is_not_handed_out():
+    assigner = BedAssigner()
+    assigner.add_bed("majors", "B1")
+    assigner.occupy("majors", "B1")
+    assert assigner.arrive("p1", 1, 0.0) is None
+
+
+def test_from_census_registers_free_beds():
+    census = Census.from_documents([
+        {"_id": "a", "bay": "majors", "bed": "B1"},
+        {"_id": "b", "bay": "majors", "bed": "B2", "first_name": "Ana", "last_name": "Smith"},
+    ])
+    assigner = BedAssigner.from_census(census)
+    assert assigner.free_count() == 1
+    assert assigner.arrive("p1", 3, 0.0) == Assignment("p1", "majors", "B1")
+
+
+def test_heaps_stay_bounded_over_many_release_take_cycles():
+    assigner = BedAssigner()
+    for n in range(10):
+        assigner.add_bed("majors", f"B{n}")
+    for cycle in range(5000):
+        bed = assigner.arrive(f"p{cycle}", 3, float(cycle))   # taken from the all-bays heap
+        assigner.release(bed.bay, bed.bed_id)
+    assert len(assigner._free_by_bay[("majors", False)]) <= 3 * 10 + COMPACT_SLACK + 1
+    assert len(assigner._free_any[False]) <= 3 * 10 + COMPACT_SLACK + 1
+    assert assigner.free_count() == 10
+    taken = {assigner.arrive(f"q{n}", 3, 0.0, preferred_bay="majors").bed_id for n in range(10)}
+    assert len(taken) == 10 and assigner.arrive("late", 3, 0.0) is None
+
+
+def test_rereleased_bed_is_handed_out_once():
+    assigner = BedAssigner()
+    assigner.add_bed("majors", "B1")
+    assigner.occupy("majors", "B1")
+    assigner.release("majors", "B1")
+    assert assigner.arrive("p1", 3, 0.0) == Assignment("p1", "majors", "B1")
+    assert assigner.arrive("p2", 3, 0.0) is None
+
+
+@pytest.mark.parametrize("priority", [None, "high", True])
+def test_non_numeric_priority_is_rejected(priority):
+    assigner = full_assigner()
+    with pytest.raises(ValueError):
+        assigner.arrive("p1", priority, 0.0)
+    assigner.arrive("p2", 2, 0.0)
+    with pytest.raises(ValueError):
+        assigner.reprioritize("p2", priority)
+    assert assigner.next_waiting() == "p2"
@@ -0,0 +1,113 @@
+# --------------------------------------------
+# Census model: building, admit / move / discharge, live change-stream updates
+# --------------------------------------------
+#   python -m pytest -q tests
+# ----------------------------
+import pytest
+
+from buslogic.logic import Census, Patient
+
+
+def bay_docs(bay, *beds):
+    '''Empty bed placeholders for one bay.'''
+    return [{"_id": f"{bay}-{bed}", "bay": bay, "bed": bed} for bed in beds]
+
+
+def patient_doc(doc_id, bay, bed, priority=3, last_name="Smith"):
+    return {"_id": doc_id, "bay": bay, "bed": bed, "first_name": "Ana",
+            "last_name": last_name, "priority": priority, "mrn": f"MRN{doc_id}"}
+
+
+@pytest.fixture
+def census():
+    return Census.from_documents(bay_docs("majors", "B1", "B2") + bay_docs("resus", "R1")
+                                 + [patient_doc("p1", "majors", "B1"), patient_doc("p2", "resus", "R1", 1)])
+
+
+def test_from_documents_places_patients_and_free_beds(census):
+    assert census.bays() == ["majors", "resus"]
+    assert census.patient("p1").bed == "B1"
+    assert [bed.bed_id for bed in census.free_beds()] == ["B2"]
+    assert [p.id for p in census.patients_with_priority(1)] == ["p2"]
+
+
+def test_double_booked_bed_puts_second_patient_on_waiting_list():
+    census = Census.from_documents(bay_docs("majors", "B1") + [patient_doc("p1", "majors", "B1"),
+                                                              patient_doc("p2", "majors", "B1")])
+    assert [p.id for p in census.waiting_patients()] == ["p2"]
+
+
+def test_move_and_discharge_keep_indexes_consistent(census):
+    census.move("p1", "majors", "B2")
+    assert census.bed("majors", "B1").patient is None
+    assert census.bed("majors", "B2").patient.id == "p1"
+    census.discharge("p1")
+    assert "p1" not in census
+    assert {bed.bed_id for bed in census.free_beds()} == {"B1", "B2"}
+
+
+def test_move_into_occupied_bed_is_rejected(census):
+    with pytest.raises(ValueError):
+        census.move("p1", "resus", "R1")
+    assert census.patient("p1").bed == "B1"
+
+
+def test_apply_document_is_idempotent(census):
+    doc = patient_doc("p1", "majors", "B2", priority=2)
+    census.apply_document(doc)
+    census.apply_document(doc)
+    assert census.patient("p1").bed == "B2"
+    assert [p.id for p in census.patients_with_priority(2)] == ["p1"]
+
+
+def test_cleared_document_discharges(census):
+    census.apply_document({"_id": "p1", "bay": "majors", "bed": "B1"})
+    assert "p1" not in census
+
+
+def test_cross_bay_move_keeps_patient_when_delete_follows_insert(census):
+    census.discharge("p2")
+    census.apply_document(patient_doc("p1", "resus", "R1"))   # insert into resus
+    census.remove_document("majors", "p1")                    # delete from the source bay
+    assert census.patient("p1").bay == "resus"
+
+
+def test_cross_bay_move_into_occupied_bed_keeps_waiting_patient(census):
+    # p1 moves majors -> resus/R1 while the local census still has p2 there:
+    # the upsert parks p1 on the waiting list, the source delete must not discharge them
+    census.apply_document(patient_doc("p1", "resus", "R1"))
+    assert census.patient("p1").bed is None
+    census.remove_document("majors", "p1")
+    assert "p1" in census
+    census.remove_document("resus", "p1")                     # a real delete from resus does
+    assert "p1" not in census
+
+
+def test_delete_from_other_bay_before_any_upsert_is_ignored(census):
+    census.remove_document("resus", "p1")
+    assert census.patient("p1").bay == "majors"
+    census.remove_document("majors", "p1")
+    assert "p1" not in census
+
+
+def test_single_layout_delete_always_discharges(census):
+    census.remove_document(None, "p1")
+    assert "p1" not in census
+
+
+def test_admit_rejects_duplicate_patient(census):
+    with pytest.raises(ValueError):
+        census.admit(Patient("p1", "Ana", "Smith"))
+
+
+def test_malformed_priority_does_not_break_the_load():
+    census = Census.from_documents(bay_docs("majors", "B1", "B2") + [
+        {**patient_doc("p1", "majors", "B1"), "priority": "high"},
+        {**patient_doc("p2", "majors", "B2"), "priority": " 2 "},
+        {**patient_doc("p3", "majors", ""), "priority": ""},
+    ])
+    assert census.patient("p1").priority == "high"
+    assert census.patient("p1").color == "yellow"   # default color for an unknown priority
+    assert census.patient("p2").priority == 2
+    assert census.patient("p3").priority is None
+    assert [p.id for p in census.patients_with_priority("high")] == ["p1"]
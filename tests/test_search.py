@@ -0,0 +1,48 @@
+# --------------------------------------------
+# Patient search: PrefixIndex and Census.search kept current on updates
+# --------------------------------------------
+#   python -m pytest -q tests
+# ----------------------------
+from buslogic.logic import Census, Patient
+from buslogic.search import PrefixIndex, query_terms
+
+
+def test_query_terms_split_and_casefold():
+    assert query_terms("  Smith majors_a/B3 ") == ["smith", "majors_a", "b3"]
+    assert query_terms("") == []
+
+
+def test_every_term_must_match_as_prefix():
+    index = PrefixIndex.build([(1, frozenset({"smith", "majors"})), (2, frozenset({"smythe", "majors"})),
+                               (3, frozenset({"smith", "resus"}))])
+    assert sorted(index.search("sm")) == [1, 2, 3]
+    assert sorted(index.search("smi maj")) == [1]
+    assert index.search("") == []
+    assert len(index.search("sm", limit=2)) == 2
+
+
+def test_add_remove_update():
+    index = PrefixIndex()
+    index.add("a", frozenset({"jones"}))
+    index.add("b", frozenset({"jones", "b1"}))
+    index.update("a", frozenset({"jonas"}))
+    assert index.search("jone") == ["b"]
+    index.remove("b")
+    assert index.search("jon") == ["a"]
+    assert "b" not in index and len(index) == 1
+
+
+def test_census_search_follows_admit_move_discharge():
+    census = Census()
+    census.add_bed("majors", "B1")
+    census.add_bed("resus", "R1")
+    census.build_search_index()
+    census.admit(Patient("p1", "Ana", "Smith-Jones", mrn="MRN0012345"), "majors", "B1")
+    assert [p.id for p in census.search("jones")] == ["p1"]
+    assert [p.id for p in census.search("0012")] == ["p1"]
+    assert [p.id for p in census.search("smi maj")] == ["p1"]
+    census.move("p1", "resus", "R1")
+    assert census.search("smi maj") == []
+    assert [p.id for p in census.search("smi res")] == ["p1"]
+    census.discharge("p1")
+    assert census.search("smith") == []
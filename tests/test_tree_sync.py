@@ -0,0 +1,96 @@
+# --------------------------------------------
+# TreeviewSync: minimal row diffs (against a recording stand-in for ttk.Treeview)
+# --------------------------------------------
+#   python -m pytest -q tests
+# ----------------------------
+import random
+
+import pytest
+
+from ui.tree_sync import TreeviewSync
+
+
+class RecordingTree:
+    '''The ttk.Treeview calls TreeviewSync makes, on a plain list; counts every call.'''
+
+    def __init__(self):
+        self.children = []      # attached iids in display order
+        self.values = {}
+        self.calls = []
+
+    def get_children(self):
+        return tuple(self.children)
+
+    def insert(self, parent, index, iid, values):
+        self.calls.append("insert")
+        self.children.append(iid)
+        self.values[iid] = values
+
+    def item(self, iid, values):
+        self.calls.append("item")
+        self.values[iid] = values
+
+    def delete(self, *iids):
+        self.calls.append("delete")
+        self.children = [iid for iid in self.children if iid not in iids]
+
+    def detach(self, *iids):
+        self.calls.append("detach")
+        self.children = [iid for iid in self.children if iid not in iids]
+
+    def move(self, iid, parent, index):
+        # Only moves of detached items are made, so the index needs no adjustment
+        assert iid not in self.children
+        self.calls.append("move")
+        self.children.insert(index, iid)
+
+    def after(self, ms, fn):
+        fn()
+
+    def after_cancel(self, after_id):
+        pass
+
+
+def rows(keys):
+    return [(key, (f"row {key}",)) for key in keys]
+
+
+@pytest.fixture
+def synced():
+    tree = RecordingTree()
+    sync = TreeviewSync(tree)
+    sync.sync(rows(range(100)))
+    tree.calls.clear()
+    return tree, sync
+
+
+def test_unchanged_rows_cost_nothing(synced):
+    tree, sync = synced
+    assert sync.sync(rows(range(100))) == (0, 0, 0)
+    assert tree.calls == []
+
+
+def test_one_row_moved_later_is_one_move(synced):
+    tree, sync = synced
+    order = list(range(1, 100)) + [0]
+    sync.sync(rows(order))
+    assert tree.children == [str(key) for key in order]
+    assert tree.calls.count("move") == 1
+
+
+def test_updates_inserts_and_deletes(synced):
+    tree, sync = synced
+    order = [key for key in range(100) if key != 50] + [100]
+    inserted, updated, deleted = sync.sync([(key, (f"new {key}",) if key == 7 else (f"row {key}",))
+                                            for key in order])
+    assert (inserted, updated, deleted) == (1, 1, 1)
+    assert tree.children == [str(key) for key in order]
+    assert tree.calls.count("move") == 0
+
+
+def test_shuffled_order_is_matched(synced):
+    tree, sync = synced
+    order = list(range(100))
+    random.Random(4).shuffle(order)
+    sync.sync(rows(order))
+    assert tree.children == [str(key) for key in order]
@@ -0,0 +1,170 @@
+# --------------------------------------------
+# Shared HTTP client for the BedBuddy API
+# --------------------------------------------
+# One pooled requests.Session per process, shared by the login window and the
+# dashboard, instead of a module-level requests.post() per call:
+#   - keep-alive: calls after the first re-use the open TCP (and TLS) connection
+#   - base URL from BEDBUDDY_API_URL instead of a hard-coded address
+#   - (connect, read) timeouts on every call, so a dead server cannot hang a worker
+#   - retries with exponential backoff for connection failures and 503 "busy"
+#     answers (honouring Retry-After); a request that reached the server is
+#     never re-sent after a read error. /auth/refresh is never retried at all:
+#     it rotates the refresh token, a 503 there can come from a proxy that
+#     already forwarded it, and re-sending a used token revokes the session
+#   - the logged-in AuthSession's bearer token is attached automatically
+# (Reitz & Chisamore, 2024; urllib3 contributors, 2024)
+#
+#   client = get_api_client()
+#   client.get("/health")
+#   close_api_client(client)    # at exit: closes and forgets the shared client
+# ----------------------------
+import os
+import threading
+
+API_URL = os.getenv("BEDBUDDY_API_URL", "http://127.0.0.1:8000")
+CONNECT_TIMEOUT = float(os.getenv("BEDBUDDY_API_CONNECT_TIMEOUT", "3.05"))  # seconds
+READ_TIMEOUT = float(os.getenv("BEDBUDDY_API_READ_TIMEOUT", "15"))          # seconds
+API_RETRIES = int(os.getenv("BEDBUDDY_API_RETRIES", "3"))
+BACKOFF_FACTOR = 0.3          # waits 0.3 s, 0.6 s, 1.2 s ... between attempts
+POOL_SIZE = 8                 # kept-alive connections (>= BackgroundWorker threads)
+RETRY_STATUSES = (503,)       # the API answers 503 before doing any work (hashing queue full)
+NO_RETRY_PATHS = ("/auth/refresh",)   # not idempotent: sent once, through a session without retries
+
+
+class ApiClient:
+    '''Pooled, retrying HTTP client bound to one API base URL.'''
+
+    def __init__(self, base_url=API_URL, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), retries=API_RETRIES):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.auth = None              # AuthSession whose token is sent with every call
+        self._etags = {}              # path -> (etag, last JSON body) for get_if_changed()
+        self._session = None
+        self._single_shot = None      # session without retries, for NO_RETRY_PATHS
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        '''The underlying requests.Session, built on first use (keeps `import ui` light).'''
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    @property
+    def single_shot_session(self):
+        '''A requests.Session that never retries (shares nothing with `session`).'''
+        if self._single_shot is None:
+            with self._lock:
+                if self._single_shot is None:
+                    self._single_shot = self._build_session(retries=0)
+        return self._single_shot
+
+    def _build_session(self, retries=None):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retries = self.retries if retries is None else retries
+        if retries:
+            retry = Retry(
+                total=retries,
+                connect=retries,               # never reached the server: always safe to retry
+                read=0,                        # the server may have acted on it: do not re-send
+                status=retries,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=None,          # 503 retries apply to POST too (see RETRY_STATUSES)
+                backoff_factor=BACKOFF_FACTOR,
+                respect_retry_after_header=True,
+                raise_on_status=False,         # hand the last 503 back instead of raising
+            )
+        else:
+            retry = Retry(total=0, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    # ---------------- Requests ---------------- #
+    def request(self, method, path, auth=True, **kwargs):
+        '''
+        Send `method` to base_url + path. The bearer token is added when a session
+        is signed in and auth is True. Raises requests.RequestException on failure.
+        '''
+        kwargs.setdefault("timeout", self.timeout)
+        if auth and self.auth is not None:
+            kwargs["headers"] = {**self.auth.auth_header, **kwargs.get("headers", {})}
+        session = self.single_shot_session if path in NO_RETRY_PATHS else self.session
+        return session.request(method, f"{self.base_url}{path}", **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def get_if_changed(self, path, **kwargs):
+        '''
+        Conditional GET: sends the ETag from the previous call for `path`.
+        Returns (changed, data); on 304 data is the previous body.
+        '''
+        etag, data = self._etags.get(path, (None, None))
+        headers = dict(kwargs.pop("headers", {}))
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        response = self.get(path, headers=headers, **kwargs)
+        if response.status_code == 304:
+            return False, data
+        response.raise_for_status()
+        data = response.json()
+        if "ETag" in response.headers:
+            self._etags[path] = (response.headers["ETag"], data)
+        return True, data
+
+    def login(self, username, password):
+        '''POST /auth/login; returns the response for the caller to inspect.'''
+        return self.post("/auth/login", auth=False, json={"username": username, "password": password})
+
+    def close(self):
+        self._etags.clear()
+        for session in (self._session, self._single_shot):
+            if session is not None:
+                session.close()
+        self._session = self._single_shot = None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_api_client():
+    '''The process-wide ApiClient shared by the login window and the dashboard.'''
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ApiClient()
+    return _client
+
+
+def close_api_client(client):
+    '''
+    Close `client` if it is the process-wide one and forget it, so the next
+    get_api_client() builds a fresh client. Any other client is left to its owner.
+    '''
+    global _client
+    with _client_lock:
+        if client is not _client:
+            return False
+        _client = None
+    client.close()
+    return True
+
+# References:
+# Reitz, K., & Chisamore, E. (2024). Requests: Advanced usage — Session objects;
+#       Timeouts. https://requests.readthedocs.io/en/latest/user/advanced/
+# urllib3 contributors. (2024). urllib3.util.Retry. urllib3 documentation.
+#       https://urllib3.readthedocs.io/en/stable/reference/urllib3.util.html
@@ -0,0 +1,124 @@
+# --------------------------------------------
+# Client-side login session for the Tkinter app
+# --------------------------------------------
+# Holds the JWT access token and the rotating refresh token returned by
+# /auth/login, and silently calls /auth/refresh shortly before the access
+# token expires, so workstations never re-send the password (and the server
+# never re-runs Argon2) just to stay logged in (IETF, 2012).
+# ----------------------------
+import time
+
+from .api_client import READ_TIMEOUT, get_api_client  # Pooled, retrying HTTP client
+
+REFRESH_MARGIN_SECONDS = 120   # refresh this long before the access token expires
+RETRY_SECONDS = 30             # retry delay when the server cannot be reached
+
+
+class AuthSession:
+    '''Access/refresh token pair with silent refresh on the Tk event loop.'''
+
+    def __init__(self, access_token, refresh_token, expires_in, client=None, on_expired=None):
+        self.client = client if client is not None else get_api_client()
+        self.on_expired = on_expired   # called if the refresh token is rejected
+        self._root = None
+        self._worker = None
+        self._after_id = None
+        self._set_tokens(access_token, refresh_token, expires_in)
+
+    @classmethod
+    def from_login_response(cls, data, client=None):
+        '''
+        Build a session from the JSON body returned by /auth/login and sign the
+        client in, so its later calls carry the bearer token.
+        '''
+        session = cls(data["access_token"], data.get("refresh_token"), data.get("expires_in", 3600), client)
+        session.client.auth = session
+        return session
+
+    def _set_tokens(self, access_token, refresh_token, expires_in):
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = time.monotonic() + expires_in
+
+    @property
+    def auth_header(self):
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    # ---------------- Refresh ---------------- #
+    def refresh(self):
+        '''
+        Exchange the refresh token for a new pair.
+        Returns True on success, False if the server rejected the token.
+        Raises requests.RequestException if the server cannot be reached or is busy.
+        '''
+        response = self.client.post("/auth/refresh", auth=False,
+                                    json={"refresh_token": self.refresh_token})
+        if response.status_code == 401:
+            return False
+        response.raise_for_status()   # e.g. 503 (never retried, see NO_RETRY_PATHS): try again later
+        data = response.json()
+        self._set_tokens(data["access_token"], data["refresh_token"], data.get("expires_in", 3600))
+        return True
+
+    def schedule_refresh(self, root, worker=None):
+        '''
+        Arrange for refresh() to run before expiry. With a BackgroundWorker the
+        HTTP call runs off the Tk thread; otherwise it runs on `root`'s event loop.
+        '''
+        if self.refresh_token is None:
+            return
+        self._root = root
+        if worker is not None:
+            self._worker = worker
+        delay = max(self.expires_at - time.monotonic() - REFRESH_MARGIN_SECONDS, 1)
+        self._schedule(delay)
+
+    def _schedule(self, delay_seconds):
+        self._after_id = self._root.after(int(delay_seconds * 1000), self._refresh_tick)
+
+    def _refresh_tick(self):
+        self._after_id = None
+        if self._worker is not None:
+            self._worker.submit(self.refresh, on_success=self._refresh_done,
+                                on_error=self._refresh_failed, timeout=READ_TIMEOUT + 15)
+            return
+        import requests
+        try:
+            ok = self.refresh()
+        except requests.exceptions.RequestException as e:
+            self._refresh_failed(e)
+            return
+        self._refresh_done(ok)
+
+    def _refresh_failed(self, error):
+        self._schedule(RETRY_SECONDS)   # server unreachable or too slow: try again shortly
+
+    def _refresh_done(self, ok):
+        if ok:
+            self.schedule_refresh(self._root)
+        elif self.on_expired is not None:
+            self.on_expired()
+
+    def logout(self):
+        '''
+        Revoke the refresh token on the server (best effort) and sign out.
+        Raises requests.RequestException if the server cannot be reached.
+        '''
+        self.cancel()
+        if self.refresh_token is not None:
+            token, self.refresh_token = self.refresh_token, None
+            self.client.post("/auth/logout", auth=False, json={"refresh_token": token})
+
+    def cancel(self):
+        '''Stop the silent refresh timer and sign the shared client out.'''
+        if self._root is not None and self._after_id is not None:
+            self._root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.client.auth is self:
+            self.client.auth = None
+
+# References:
+# IETF. (2012). The OAuth 2.0 authorization framework (RFC 6749).
+#       https://www.rfc-editor.org/rfc/rfc6749
+# Reitz, K., & Chisamore, E. (2024). Requests: HTTP for humans.
+#       https://requests.readthedocs.io/
@@ -0,0 +1,169 @@
+# --------------------------------------------
+# Canvas-based bay renderer
+# --------------------------------------------
+# Draws a whole bay on ONE tk.Canvas instead of building a Frame + Labels +
+# bindings per bed on every bay switch. Each grid slot owns a fixed set of
+# canvas items (bed box, icon background, icon, label) tagged "slot:<n>".
+# Switching bays re-uses those items: a slot is only reconfigured when what
+# it shows (bed name, occupancy, colour, selection) actually changed, and
+# surplus slots are hidden rather than destroyed. Clicks are hit-tested with
+# the "current" item tag (Shipman, 2013; TkDocs, 2024).
+#
+# The grid has as many columns as fit the canvas width and is re-laid out from
+# <Configure> when the window is resized. Bays taller than the view scroll
+# with the mouse wheel and with a vertical scrollbar attached by the owner:
+#   bar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
+#   canvas.configure(yscrollcommand=bar.set)
+# ----------------------------
+import tkinter as tk
+
+BED_WIDTH = 80
+BED_HEIGHT = 100
+BED_PAD = 15
+MIN_COLUMNS = 3
+BED_ROW_HEIGHT = BED_HEIGHT + 2 * BED_PAD   # one grid row, in pixels
+ICON_FONT = ("Arial", 25)
+LABEL_FONT = ("Arial", 10)
+
+
+class BayCanvas(tk.Canvas):
+    '''Renders census Bed objects in a grid; calls on_select(bed) when one is clicked.'''
+
+    def __init__(self, master, on_select=None, **kwargs):
+        kwargs.setdefault("bg", "lightgray")
+        kwargs.setdefault("highlightthickness", 0)
+        super().__init__(master, **kwargs)
+        self.on_select = on_select
+        self._slots = []          # per slot: dict of canvas item ids
+        self._drawn = []          # per slot: state tuple last drawn (None = hidden)
+        self._beds = []           # Bed shown in each visible slot
+        self._columns = MIN_COLUMNS
+        self.selected = None      # index of the selected slot
+        self.tag_bind("bed", "<Button-1>", self._on_click)
+        self.bind("<Configure>", self._on_resize)
+        self.bind("<MouseWheel>", self._on_wheel)                        # Windows, macOS
+        self.bind("<Button-4>", lambda event: self._scroll(-1))          # X11 wheel up
+        self.bind("<Button-5>", lambda event: self._scroll(1))           # X11 wheel down
+
+    # ---------------- Public ---------------- #
+    def render(self, beds, keep_selection=True):
+        '''
+        Show `beds` (census Bed objects, display order). Pass keep_selection=False
+        when switching bays. Returns how many slots were redrawn.
+        '''
+        if not keep_selection:
+            self.selected = None   # slots that showed it differ from _drawn and get redrawn below
+            self.yview_moveto(0)   # a new bay starts at its first row
+        if self.winfo_ismapped():  # before mapping the width is 1; <Configure> lays out later
+            self._set_columns(self.winfo_width())
+        self._beds = list(beds)
+        if self.selected is not None and self.selected >= len(self._beds):
+            self.selected = None
+        while len(self._slots) < len(self._beds):
+            self._create_slot()
+
+        redrawn = 0
+        for index, slot_state in enumerate(self._drawn):
+            state = self._state(index) if index < len(self._beds) else None
+            if state != slot_state:
+                self._draw(index, state)
+                redrawn += 1
+        self._update_scrollregion()
+        return redrawn
+
+    def select(self, index):
+        '''Highlight one slot (None clears the selection).'''
+        previous, self.selected = self.selected, index
+        for i in (previous, index):
+            if i is not None and i < len(self._beds):
+                self._draw(i, self._state(i))
+
+    def bed_at(self, index):
+        return self._beds[index] if index is not None and index < len(self._beds) else None
+
+    # ---------------- Internals ---------------- #
+    def _set_columns(self, width):
+        '''Re-place every slot when `width` fits a different number of columns.'''
+        columns = max(MIN_COLUMNS, width // (BED_WIDTH + 2 * BED_PAD))
+        if columns == self._columns:
+            return False
+        self._columns = columns
+        for index in range(len(self._slots)):
+            self._place(index)
+        return True
+
+    def _update_scrollregion(self):
+        rows = (len(self._beds) + self._columns - 1) // self._columns
+        self.configure(scrollregion=(0, 0, self._columns * (BED_WIDTH + 2 * BED_PAD),
+                                     rows * BED_ROW_HEIGHT))
+
+    def _on_resize(self, event):
+        if self._set_columns(event.width):
+            self._update_scrollregion()
+
+    def _on_wheel(self, event):
+        if event.delta:
+            # Windows reports multiples of 120 per notch, macOS small counts
+            self._scroll(-1 if event.delta > 0 else 1)
+
+    def _scroll(self, direction):
+        top, bottom = self.yview()
+        if top > 0 or bottom < 1:   # only when the bay is taller than the view
+            self.yview_scroll(direction, "units")
+
+    def _state(self, index):
+        bed = self._beds[index]
+        patient = bed.patient
+        return (bed.bed_id, patient.color if patient else None, index == self.selected)
+
+    def _create_slot(self):
+        index = len(self._slots)
+        tags = ("bed", f"slot:{index}")
+        slot = {
+            "box": self.create_rectangle(0, 0, 0, 0, fill="white", outline="black", width=1, tags=tags),
+            "icon_bg": self.create_rectangle(0, 0, 0, 0, fill="darkgray", outline="", tags=tags),
+            "icon": self.create_text(0, 0, text="\U0001F464", font=ICON_FONT, tags=tags),
+            "label": self.create_text(0, 0, text="", font=LABEL_FONT, tags=tags),
+        }
+        self._slots.append(slot)
+        self._drawn.append(("__new__",))   # forces the first draw
+        self._place(index)
+
+    def _place(self, index):
+        slot = self._slots[index]
+        row, col = divmod(index, self._columns)
+        x = BED_PAD + col * (BED_WIDTH + 2 * BED_PAD)
+        y = BED_PAD + row * BED_ROW_HEIGHT
+        self.coords(slot["box"], x, y, x + BED_WIDTH, y + BED_HEIGHT)
+        self.coords(slot["icon_bg"], x + 18, y + 8, x + BED_WIDTH - 18, y + 58)
+        self.coords(slot["icon"], x + BED_WIDTH / 2, y + 33)
+        self.coords(slot["label"], x + BED_WIDTH / 2, y + BED_HEIGHT - 15)
+
+    def _draw(self, index, state):
+        slot = self._slots[index]
+        self._drawn[index] = state
+        if state is None:
+            for item in slot.values():
+                self.itemconfigure(item, state="hidden")
+            return
+        bed_id, color, selected = state
+        self.itemconfigure(slot["box"], state="normal",
+                           outline="red" if selected else "black", width=3 if selected else 1)
+        self.itemconfigure(slot["label"], state="normal", text=bed_id)
+        icon_state = "normal" if color else "hidden"
+        self.itemconfigure(slot["icon_bg"], state=icon_state)
+        self.itemconfigure(slot["icon"], state=icon_state, fill=color or "black")
+
+    def _on_click(self, event):
+        for tag in self.gettags("current"):
+            if tag.startswith("slot:"):
+                index = int(tag[5:])
+                self.select(index)
+                if self.on_select is not None:
+                    self.on_select(self._beds[index])
+                return
+
+# References:
+# Shipman, J. W. (2013). Tkinter 8.5 reference: The Canvas widget.
+#       New Mexico Tech Computer Center. https://tkdocs.com/shipman/canvas.html
+# TkDocs. (2024). TkDocs tutorial: Canvas. https://tkdocs.com/tutorial/canvas.html
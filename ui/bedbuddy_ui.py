@@ -1,38 +1,92 @@
 import tkinter as tk  # Import the main Tkinter library for creating GUI windows and widgets
-from tkinter import ttk  # Import ttk for themed widgets like Treeview
-
-# ---------------- Data ---------------- #
-bay_beds = {  # Dictionary storing bay information and bed data
-    1: [  # Bay 1 beds
-        ("B1", "yellow", True, "John Green"),  # Bed name, color, patient presence, patient name
-        ("B2", "yellow", True, "Brandon Sanderson"),
-        ("B3", "white", False, None),
-        ("B4", "yellow", True, "George RR Martin"),
-        ("B5", "white", False, None)
-    ],
-    2: [  # Bay 2 beds
-        ("B1", "yellow", True, "Rick Riordan"),
-        ("B2", "white", False, None),
-        ("B3", "white", False, None),
-        ("B4", "yellow", True, "Frank Herbert")
-    ]
-}
+from tkinter import ttk, messagebox  # Import ttk for themed widgets like Treeview
+
+from buslogic.logic import CENSUS_LOAD_FIELDS, Census  # In-memory census with O(result) lookups
+from .tree_sync import TreeviewSync  # Diff-based Treeview updates
+from .bay_canvas import BED_ROW_HEIGHT, BayCanvas  # Whole bay drawn on one canvas
+from .worker import BackgroundWorker, WorkerTimeout  # DB/HTTP calls off the Tk thread
+from .api_client import close_api_client, get_api_client  # Keep-alive HTTP client shared with the login window
+
+CENSUS_LOAD_TIMEOUT = 30  # seconds before a census load is reported as failed
+OFFLINE_RETRY_MS = 30000  # how often a failed census load is tried again
+
+
+def synced_census(snapshot=None, fresh=False):
+    """
+    Read the census and save it as the on-disk snapshot (runs on a worker thread).
+    With a snapshot only the bays changed since then are downloaded; fresh drops
+    the DB read cache and re-reads everything. Returns (Census, snapshot).
+    """
+    from database import snapshot as census_snapshot
+    if fresh:
+        from database.db_operation import refresh
+        refresh()
+        snapshot = None
+    snapshot = census_snapshot.fetch(snapshot, projection=CENSUS_LOAD_FIELDS)
+    census = Census.from_documents(census_snapshot.all_docs(snapshot))
+    census.build_search_index()  # Here, so the first keystroke in the search box does not pay for it
+    return census, snapshot
 
 class BedBuddy:
-    def __init__(self):
+    def __init__(self, session=None, census=None):
         self.root = tk.Tk()  # Create the main application window
         self.root.title("Hospital Dashboard")  # Set the window title
         self.root.geometry("1000x450")  # Set the size of the window (width x height in pixels)
 
         # Set class variables
         self.tree = None # Geometry related
-        self.beds_frame = None
+        self.tree_sync = None # Only touches Treeview rows that changed
+        self.bay_canvas = None
         self.selected_bed = None # Data tracking
+        self.session = session # Logged-in AuthSession (None when launched without login)
+        self.api = session.client if session is not None else get_api_client() # Sends the bearer token itself
+        self.census = census if census is not None else Census() # Beds and patients (buslogic)
+        self.bay_buttons_frame = None
+        self.current_bay = None
+        self.showing_all = False # True while "Show All Patients" is on screen
+        self.watcher = None # Live change-stream watcher (start_live_updates)
+        self.status_label = None # Loading / error message under the sidebar buttons
+        self.progress = None # Indeterminate bar shown while background jobs run
+        self.census_job = None # Census load in flight (load_census_async)
+        self.snapshot = None # Census saved on this machine, the base for delta loads
+        self.offline = False # True while showing the snapshot because the database is unreachable
+        self.offline_banner = None # Read-only warning across the top of the window
+        self.retry_id = None # Pending reconnect attempt while offline
+        self.search_var = None # Search box text (setup_ui)
+        self.search_id = None # Pending debounced search
+        self.logged_out = False # Set by log_out(); run() then revokes the refresh token
 
         # Get UI up
         self.setup_ui()
 
+        # Network and database calls run here, never on the Tk thread
+        self.worker = BackgroundWorker(self.root, on_busy=self.set_busy)
+
+        # Keep the access token fresh in the background
+        if self.session is not None:
+            self.session.on_expired = self.session_expired
+            self.session.schedule_refresh(self.root, worker=self.worker)
+
+    def session_expired(self):
+        """Refresh token was rejected (revoked or expired): the user must sign in again"""
+        messagebox.showwarning("Session expired", "Your session has expired. Please log in again.")
+        self.log_out()
+
+    def log_out(self):
+        """Delete the census saved on this machine and close the dashboard"""
+        from database import snapshot as census_snapshot
+        self.logged_out = True
+        if self.census_job is not None:
+            self.census_job.cancel()  # Its result would save the snapshot again
+        self.snapshot = None
+        census_snapshot.delete()
+        self.root.destroy()  # Ends mainloop; run() revokes the refresh token
+
     def setup_ui(self):
+        # ---------------- Offline Banner (packed only while offline) ---------------- #
+        self.offline_banner = tk.Label(self.root, text="", bg="#b00020", fg="white",
+                                       font=("Arial", 10, "bold"), pady=4)
+
         # ---------------- Left Sidebar ---------------- #
         sidebar = tk.Frame(self.root, bg="lightgray", width=150)  # Create a sidebar frame with gray background
         sidebar.pack(side="left", fill="y")  # Pack the sidebar on the left side and fill it vertically
@@ -48,6 +102,12 @@ class BedBuddy:
         patient_label = tk.Label(patient_frame, text="Patient View", font=("Arial", 12, "bold"))  # Label for Patient View
         patient_label.pack(anchor="w", padx=5, pady=5)  # Pack label at top-left with padding
 
+        # Search box: name, MRN, bay or bed prefix; results follow the typing (debounced)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *_: self.schedule_search())
+        search_entry = ttk.Entry(patient_frame, textvariable=self.search_var, width=40)
+        search_entry.pack(anchor="w", padx=10)
+
         # Treeview for Patient Table
         columns = ("Name", "Location", "Patient Info")  # Define columns for patient data
         self.tree = ttk.Treeview(patient_frame, columns=columns, show="headings", height=10)  # Create Treeview widget
@@ -57,6 +117,7 @@ class BedBuddy:
             self.tree.column(col, anchor="center", width=150)  # Set column width and center alignment
 
         self.tree.pack(fill="both", expand=True, padx=10, pady=10)  # Pack the Treeview in the patient frame
+        self.tree_sync = TreeviewSync(self.tree)  # Rows keyed by patient _id
 
         # ---------------- Bay View ---------------- #
         bay_frame = tk.Frame(self.root, bd=1, relief="solid", width=300)  # Create a frame for Bay View with border
@@ -65,108 +126,294 @@ class BedBuddy:
         bay_label = tk.Label(bay_frame, text="Bay View", font=("Arial", 12, "bold"))  # Label for Bay View
         bay_label.pack(anchor="w", padx=5, pady=5)  # Pack label at top-left
 
-        self.beds_frame = tk.Frame(bay_frame, bg="lightgray")  # Frame inside bay_frame to hold beds
-        self.beds_frame.pack(fill="both", expand=True, padx=20, pady=20)  # Fill space and add padding
+        self.bay_canvas = BayCanvas(bay_frame, on_select=self.bed_clicked, width=330)  # Canvas holding every bed
+        bay_scroll = ttk.Scrollbar(bay_frame, orient="vertical", command=self.bay_canvas.yview)  # Large bays scroll
+        self.bay_canvas.configure(yscrollcommand=bay_scroll.set, yscrollincrement=BED_ROW_HEIGHT // 2)
+        bay_scroll.pack(side="right", fill="y", pady=20)  # Scrollbar along the right edge
+        self.bay_canvas.pack(fill="both", expand=True, padx=(20, 0), pady=20)  # Fill space and add padding
 
         # ---------------- Buttons ---------------- #
-        # Sidebar Bay buttons
-        bay1_btn = tk.Button(sidebar, text="- Bay 1", bg="lightgray", relief="flat",
-                             command=lambda: self.show_bay(1))  # Button to show Bay 1
-        bay1_btn.pack(anchor="w", padx=20)  # Pack button to left
-
-        bay2_btn = tk.Button(sidebar, text="- Bay 2", bg="lightgray", relief="flat",
-                             command=lambda: self.show_bay(2))  # Button to show Bay 2
-        bay2_btn.pack(anchor="w", padx=20)  # Pack button
+        # Sidebar Bay buttons (one per bay in the census)
+        self.bay_buttons_frame = tk.Frame(sidebar, bg="lightgray")
+        self.bay_buttons_frame.pack(anchor="w", fill="x")
+        self.build_bay_buttons()
 
         # Patients buttons
         patients_btn = tk.Button(sidebar, text="Show All Patients", relief="flat", bg="gray25", fg="white",
-                                 command=lambda: self.show_all_patients())  # Button to show all patients
+                                 command=lambda: self.all_patients_clicked())  # Button to show all patients
         patients_btn.pack(anchor="w", padx=10, pady=20, fill="x")  # Pack button
 
-        # ---------------- Load Bay1 by default ---------------- #
-        self.show_bay(1)  # Display Bay 1 on startup
+        refresh_btn = tk.Button(sidebar, text="Refresh", relief="flat", bg="gray40", fg="white",
+                                command=lambda: self.refresh_census())  # Re-read the census from MongoDB
+        refresh_btn.pack(anchor="w", padx=10, fill="x")  # Pack button
+
+        if self.session is not None:
+            logout_btn = tk.Button(sidebar, text="Log out", relief="flat", bg="gray40", fg="white",
+                                   command=lambda: self.log_out())  # Deletes the saved census too
+            logout_btn.pack(anchor="w", padx=10, pady=(10, 0), fill="x")  # Pack button
+
+        # Loading indicator (shown while background jobs run) and status text
+        self.progress = ttk.Progressbar(sidebar, mode="indeterminate", length=120)
+        self.status_label = tk.Label(sidebar, text="", bg="lightgray", fg="gray20",
+                                     font=("Arial", 9), wraplength=130, justify="left")
+        self.status_label.pack(anchor="w", padx=10, pady=(10, 0))
+
+        # ---------------- Load first bay by default ---------------- #
+        bays = self.census.bays()
+        if bays:
+            self.show_bay(bays[0])  # Display the first bay on startup
+
+    def build_bay_buttons(self):
+        """(Re)create one sidebar button per bay"""
+        for widget in self.bay_buttons_frame.winfo_children():
+            widget.destroy()
+        for bay in self.census.bays():
+            bay_btn = tk.Button(self.bay_buttons_frame, text=f"- {bay}", bg="lightgray", relief="flat",
+                                command=lambda b=bay: self.bay_clicked(b))  # Button to show this bay
+            bay_btn.pack(anchor="w", padx=20)  # Pack button to left
+
+    def refresh_census(self):
+        """Drop the DB read cache and reload the census (Refresh button)"""
+        self.load_census_async(fresh=True)
+
+    # ---------------- Background loading ---------------- #
+    def set_busy(self, busy):
+        """Show or hide the loading indicator (BackgroundWorker on_busy callback)"""
+        if busy:
+            self.progress.pack(anchor="w", padx=10, pady=(10, 0), before=self.status_label)
+            self.progress.start(15)
+        else:
+            self.progress.stop()
+            self.progress.pack_forget()
+
+    def start(self, on_loaded=None):
+        """Schedule snapshot, live updates and census load for after the first paint"""
+        self.root.after(0, lambda: self.start_loading(on_loaded))
+
+    def start_loading(self, on_loaded=None):
+        """Runs from mainloop: draw the empty window, then the snapshot, then fetch changes"""
+        self.root.update_idletasks()  # Paint the mapped window before any import or disk read
+        self.show_snapshot()  # No network I/O; the offline banner appears if MongoDB is unreachable
+        self.start_live_updates()  # Apply other workstations' changes as they happen
+        self.load_census_async(on_loaded=on_loaded)  # Bays changed since the snapshot, on a worker
+
+    def show_snapshot(self):
+        """Draw the census saved by the last session, before any network I/O (milliseconds)"""
+        from database import snapshot as census_snapshot
+        self.snapshot = census_snapshot.load()
+        if self.snapshot is not None:
+            self.census_loaded(Census.from_documents(census_snapshot.all_docs(self.snapshot)), self.snapshot)
+        return self.snapshot
+
+    def load_census_async(self, fresh=False, on_loaded=None):
+        """Load the census on a worker thread; the window stays responsive meanwhile"""
+        if self.census_job is not None:
+            self.census_job.cancel()  # A newer load supersedes the one in flight
+        if self.retry_id is not None:
+            self.root.after_cancel(self.retry_id)
+            self.retry_id = None
+        self.status_label.config(text="Checking for changes..." if self.snapshot else "Loading census...",
+                                 fg="gray20")
+        self.census_job = self.worker.submit(
+            synced_census, self.snapshot, fresh=fresh,  # Only changed bays when a snapshot exists
+            on_success=lambda result: self.census_loaded(*result, on_loaded=on_loaded),
+            on_error=lambda error: self.census_failed(error, on_loaded),
+            timeout=CENSUS_LOAD_TIMEOUT,
+        )
+
+    def census_loaded(self, census, snapshot=None, on_loaded=None):
+        """Swap in a freshly loaded census (Tk thread)"""
+        self.census_job = None
+        self.census = census
+        if snapshot is not None:
+            self.snapshot = snapshot
+        self.set_offline(False)
+        self.status_label.config(text="")
+        self.build_bay_buttons()
+        if self.current_bay in self.census.bays() or self.showing_all:
+            self.redraw()
+        elif self.census.bays():
+            self.show_bay(self.census.bays()[0])
+        if on_loaded is not None:
+            on_loaded(census)
+
+    def census_failed(self, error, on_loaded=None):
+        """Keep showing the last census, say why the load failed and try again later"""
+        self.census_job = None
+        reason = "timed out" if isinstance(error, WorkerTimeout) else str(error) or type(error).__name__
+        self.status_label.config(text=f"Could not load census: {reason}. "
+                                      f"Retrying in {OFFLINE_RETRY_MS // 1000} s", fg="red")
+        if self.snapshot is not None:  # Saved census on screen: keep it, read-only
+            self.set_offline(True)
+        self.retry_id = self.root.after(OFFLINE_RETRY_MS, lambda: self.load_census_async(on_loaded=on_loaded))
+
+    def set_offline(self, offline):
+        """Show or hide the read-only banner over the saved census"""
+        self.offline = offline
+        if not offline:
+            self.offline_banner.pack_forget()
+            return
+        from database.snapshot import saved_at_local
+        saved = saved_at_local(self.snapshot).strftime("%d %b %H:%M")
+        self.offline_banner.config(text=f"OFFLINE - read-only census saved {saved}. "
+                                        f"Reconnecting every {OFFLINE_RETRY_MS // 1000} s...")
+        if not self.offline_banner.winfo_manager():  # Not packed yet
+            self.offline_banner.pack(side="top", fill="x", before=self.root.pack_slaves()[0])
+
+    # ---------------- Live updates ---------------- #
+    LIVE_POLL_MS = 250  # How often the Tk thread drains the change queue
+
+    def start_live_updates(self):
+        """Watch the bay collections and apply changes to the census as they happen"""
+        from database.change_stream import CensusWatcher
+        self.watcher = CensusWatcher()
+        self.watcher.start()
+        self.root.after(self.LIVE_POLL_MS, self.apply_live_changes)
+
+    def apply_live_changes(self):
+        """Drain the watcher queue on the Tk thread, apply coalesced changes, redraw once"""
+        from database.change_stream import drain
+        if self.census_job is not None:  # Hold changes until the census being loaded arrives
+            self.root.after(self.LIVE_POLL_MS, self.apply_live_changes)
+            return
+        reload_needed, changes = drain(self.watcher.changes)
+        if reload_needed:
+            self.refresh_census()
+        if changes:
+            bays_before = self.census.bays()
+            for change in changes:
+                if change.op == "upsert":
+                    self.census.apply_document(change.doc)
+                else:
+                    self.census.remove_document(change.bay, change.doc_id)
+            if self.census.bays() != bays_before:
+                self.build_bay_buttons()
+            self.redraw()
+        self.root.after(self.LIVE_POLL_MS, self.apply_live_changes)
+
+    def redraw(self):
+        """Re-render whichever view is on screen from the current census"""
+        if self.search_var.get().strip():
+            if self.current_bay is not None:
+                self.bay_canvas.render(self.census.beds(self.current_bay))  # Bay view stays live
+            self.run_search()  # Search results stay in the Treeview
+        elif self.showing_all:
+            self.show_all_patients()
+        elif self.current_bay is not None:
+            self.show_bay(self.current_bay)
 
     # ---------------- Functions ---------------- #
+    def patient_row(self, bed):
+        """Treeview values for the patient in an occupied bed"""
+        patient = bed.patient
+        info = f"Priority {patient.priority}" if patient.priority is not None else "..."
+        return (patient.name, bed.location, info)
+
     def show_patients(self, bay_number):
         """Display patients for a specific bay in the Treeview"""
-        for row in self.tree.get_children():  # Delete all existing rows in Treeview
-            self.tree.delete(row)
-        for b in bay_beds.get(bay_number, []):  # Loop through beds in the bay
-            bedname, color, has_patient, pname = b  # Unpack bed info
-            if has_patient and color in ("yellow", "orange"):  # Only show beds with patients
-                location = f"Bay {bay_number} / {bedname}"  # Format location string
-                self.tree.insert("", "end", values=(pname, location, "..."))  # Insert patient info into Treeview
-
-    def create_bed(self, frame, text, color="white", icon=False, patient_name=None, bay_number=None):
-        """Create a bed block with optional patient icon and click event"""
-        f = tk.Frame(frame, width=80, height=100, bg="white", bd=1, relief="solid")  # Create frame for bed
-        f.propagate(False)  # Prevent child widgets from resizing the frame
-        f.pack_propagate(False)  # Prevent automatic resizing by packing
-
-        label = tk.Label(f, text=text, bg="white", font=("Arial", 10))  # Label with bed name
-        label.pack(side="bottom", pady=5)  # Place bed label at bottom
-
-        if icon:  # If a patient icon should be displayed
-            icon_lbl = tk.Label(f, text="👤", fg=color, bg="darkgray", font=("Arial", 25))  # Create icon label
-            icon_lbl.pack(side="top", pady=5)  # Place icon at top
-
-        # Click event to highlight the bed and optionally show patient in Treeview
-        def on_click(event):
-            if self.selected_bed is not None:  # Remove red border from previous selection
-                self.selected_bed.config(bd=1, relief="solid", highlightthickness=0)
-            f.config(bd=3, relief="solid", highlightbackground="red", highlightcolor="red", highlightthickness=3)  # Highlight current bed
-            self.selected_bed = f  # Update global selected bed
-
-            if patient_name:  # Update Treeview to show patient info
-                for row in self.tree.get_children():  # Clear previous Treeview rows
-                    self.tree.delete(row)
-                location = f"Bay {bay_number} / {text}"  # Format bed location
-                self.tree.insert("", "end", values=(patient_name, location, "..."))  # Insert patient info
-
-        f.bind("<Button-1>", on_click)  # Bind click event to bed frame
-        if icon:  # Bind click event to icon too
-            icon_lbl.bind("<Button-1>", on_click)
-
-        return f  # Return the bed frame widget
+        self.tree_sync.sync(  # Insert/update/delete only the rows that changed
+            (bed.patient.id, self.patient_row(bed))
+            for bed in self.census.occupied_beds(bay_number)  # Only beds with patients (indexed lookup)
+        )
+
+    def search_row(self, patient):
+        """Treeview values for a search hit (waiting patients have no bed yet)"""
+        bed = self.census.bed(patient.bay, patient.bed)
+        if bed is not None:
+            return self.patient_row(bed)
+        info = f"Priority {patient.priority}" if patient.priority is not None else "..."
+        return (patient.name, "Waiting", info)
+
+    # ---------------- Search ---------------- #
+    SEARCH_DEBOUNCE_MS = 150  # Search once typing pauses this long
+    SEARCH_RESULT_LIMIT = 200  # Rows shown for a search; type more to narrow it down
+
+    def schedule_search(self):
+        """Every keystroke restarts the timer, so one search runs per pause in typing"""
+        if self.search_id is not None:
+            self.root.after_cancel(self.search_id)
+        self.search_id = self.root.after(self.SEARCH_DEBOUNCE_MS, self.run_search)
+
+    def run_search(self):
+        """Show the patients matching the search box (prefix index, O(log n + matches))"""
+        self.search_id = None
+        query = self.search_var.get().strip()
+        if not query:
+            self.redraw()  # Box cleared: back to the bay or all-patients view
+            return
+        self.tree_sync.sync(
+            (patient.id, self.search_row(patient))
+            for patient in self.census.search(query, limit=self.SEARCH_RESULT_LIMIT)
+        )
+
+    def clear_search(self):
+        """Empty the search box without triggering another search"""
+        if self.search_var.get():
+            self.search_var.set("")
+        if self.search_id is not None:
+            self.root.after_cancel(self.search_id)
+            self.search_id = None
+
+    def bay_clicked(self, bay_number):
+        """Sidebar bay button: leave search results for that bay"""
+        self.clear_search()
+        self.show_bay(bay_number)
+
+    def all_patients_clicked(self):
+        """Show All Patients button: leave search results for every patient"""
+        self.clear_search()
+        self.show_all_patients()
+
+    def bed_clicked(self, bed):
+        """Bay canvas click: leave search results for the clicked patient"""
+        self.clear_search()
+        self.on_bed_selected(bed)
+
+    def on_bed_selected(self, bed):
+        """A bed was clicked on the bay canvas: show only its patient in the Treeview"""
+        self.selected_bed = bed
+        if bed.occupied:
+            self.tree_sync.sync([(bed.patient.id, self.patient_row(bed))])
 
     def show_bay(self, bay_number):
         """Display all beds for a given bay"""
-        if self.selected_bed is not None:  # Clear previous selection
-            self.selected_bed.config(bd=1, relief="solid", highlightthickness=0)
-            self.selected_bed = None
-
-        for row in self.tree.get_children():  # Clear Treeview
-            self.tree.delete(row)
-
-        for widget in self.beds_frame.winfo_children():  # Destroy previous bed widgets
-            widget.destroy()
-
-        beds = bay_beds.get(bay_number, [])  # Get beds for the bay
-        row, col = 0, 0  # Initialize grid row/column
-        for b in beds:
-            bedname, color, has_patient, pname = b
-            bed = self.create_bed(
-                self.beds_frame, bedname, color, has_patient,
-                patient_name=pname, bay_number=bay_number
-            )
-            bed.grid(row=row, column=col, padx=15, pady=15)  # Place bed in grid
-            col += 1
-            if col > 2:  # Move to next row after 3 columns
-                col = 0
-                row += 1
-
-        self.show_patients(bay_number)  # Display patients in Treeview for this bay
+        switching = bay_number != self.current_bay or self.showing_all
+        self.current_bay = bay_number
+        self.showing_all = False
+        # Re-uses the canvas items of the previous bay; only changed beds are redrawn
+        self.bay_canvas.render(self.census.beds(bay_number), keep_selection=not switching)
+        self.selected_bed = self.bay_canvas.bed_at(self.bay_canvas.selected)  # None after a bay switch
+
+        if self.selected_bed is not None and self.selected_bed.occupied:
+            self.on_bed_selected(self.selected_bed)  # Keep showing the selected patient
+        else:
+            self.show_patients(bay_number)  # Display patients in Treeview for this bay
 
     def show_all_patients(self):
         """Display all patients from all bays in the Treeview"""
-        for row in self.tree.get_children():  # Clear Treeview
-            self.tree.delete(row)
-        for bay_num, beds in bay_beds.items():  # Loop through all bays
-            for b in beds:
-                bedname, color, has_patient, pname = b
-                if has_patient and color in ("yellow", "orange"):  # Only show patients
-                    location = f"Bay {bay_num} / {bedname}"  # Format location
-                    self.tree.insert("", "end", values=(pname, location, "..."))  # Insert patient info
+        self.showing_all = True
+        self.tree_sync.sync(  # Large loads are inserted in time-sliced batches
+            (bed.patient.id, self.patient_row(bed))
+            for bed in self.census.occupied_beds()  # Every occupied bed in every bay
+        )
+
+    def revoke_session(self):
+        """After log_out(): revoke the refresh token so it cannot be used again"""
+        import requests
+        try:
+            self.session.logout()
+        except requests.exceptions.RequestException:
+            pass  # Server unreachable: the token still expires on its own
 
     def run(self):
-        self.root.mainloop()  # Start the Tkinter main event loop
\ No newline at end of file
+        try:
+            self.root.mainloop()  # Start the Tkinter main event loop
+        finally:
+            self.worker.shutdown()  # Discard jobs still in flight (a late census load must not re-save)
+            if self.session is not None:
+                self.session.cancel()  # Stop the refresh timer
+                if self.logged_out:
+                    self.revoke_session()
+            close_api_client(self.api)  # Close and forget the shared client; an injected one is its owner's to close
+            if self.watcher is not None:
+                self.watcher.stop(timeout=2)  # Stop the change stream (saves the resume token)
\ No newline at end of file
@@ -0,0 +1,34 @@
+# --------------------------------------------
+# Startup profiling hook
+# --------------------------------------------
+# With BEDBUDDY_PROFILE_STARTUP=1 set, an entry point calls
+# report_first_window(root) right after building its window: the window is
+# mapped and drawn, a "window visible" timestamp is printed, and the process
+# exits. benchmarks/bench_startup.py launches the app this way (together with
+# python -X importtime) to measure cold start to first window
+# (Python Software Foundation, 2025).
+# ----------------------------
+import os
+import sys
+import time
+
+STARTUP_PROFILE_ENV = "BEDBUDDY_PROFILE_STARTUP"
+WINDOW_VISIBLE_MARKER = "BEDBUDDY_WINDOW_VISIBLE"
+
+
+def profiling_startup():
+    return os.getenv(STARTUP_PROFILE_ENV) == "1"
+
+
+def report_first_window(root):
+    '''In profiling mode: draw `root`, print the wall-clock time, and exit. Otherwise a no-op.'''
+    if not profiling_startup():
+        return
+    root.update()   # map and draw the window now instead of on the first mainloop pass
+    print(f"{WINDOW_VISIBLE_MARKER} {time.time():.6f}", flush=True)
+    root.destroy()
+    sys.exit(0)
+
+# References:
+# Python Software Foundation. (2025). Command line and environment: -X importtime.
+#       In Python 3.13 documentation. https://docs.python.org/3/using/cmdline.html#cmdoption-X
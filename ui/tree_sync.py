@@ -0,0 +1,131 @@
+# --------------------------------------------
+# Row reconciliation for ttk.Treeview
+# --------------------------------------------
+# Instead of deleting every row and inserting everything again on each
+# refresh, TreeviewSync keeps track of what is on screen (keyed by a stable
+# id, the patient's Mongo _id) and only touches rows that changed:
+#   - rows that disappeared  -> one tree.delete() call for all of them
+#   - rows whose values changed -> tree.item(...)
+#   - new rows -> tree.insert(...), in time-sliced batches with after() when
+#     there are many, so the Tk event loop keeps handling input while a large
+#     census loads (TkDocs, 2024; Python Software Foundation, 2025).
+#   - reordered rows -> the longest run of rows already in relative order
+#     stays put; only the others are detached and re-attached at their index
+#     (one row changing place costs one move, not one per row)
+# ----------------------------
+from bisect import bisect_left
+
+INSERT_BATCH_SIZE = 500   # rows inserted per slice
+SLICE_DELAY_MS = 1        # pause between slices so Tk can process events
+
+
+class TreeviewSync:
+    '''Keeps a Treeview's rows in line with a {key: values} mapping.'''
+
+    def __init__(self, tree, batch_size=INSERT_BATCH_SIZE, slice_delay_ms=SLICE_DELAY_MS):
+        self.tree = tree
+        self.batch_size = batch_size
+        self.slice_delay_ms = slice_delay_ms
+        self._rows = {}          # iid -> values currently shown
+        self._order = []         # iids in the order they should appear
+        self._pending = []       # (iid, values) still to insert
+        self._after_id = None
+
+    def sync(self, rows):
+        '''
+        Show exactly `rows`, an iterable of (key, values) in display order.
+        Returns (inserted, updated, deleted) counts.
+        '''
+        self._cancel_pending()
+        target = {}
+        for key, values in rows:
+            target[str(key)] = tuple(values)
+        self._order = list(target)
+
+        stale = [iid for iid in self._rows if iid not in target]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self._rows[iid]
+
+        updated = 0
+        new_rows = []
+        for iid, values in target.items():
+            shown = self._rows.get(iid)
+            if shown is None:
+                new_rows.append((iid, values))
+            elif shown != values:
+                self.tree.item(iid, values=values)
+                self._rows[iid] = values
+                updated += 1
+
+        self._pending = new_rows
+        self._insert_slice()   # first slice right away so something shows immediately
+        return len(new_rows), updated, len(stale)
+
+    def clear(self):
+        self.sync(())
+
+    @property
+    def loading(self):
+        '''True while a large insert is still being sliced in.'''
+        return bool(self._pending)
+
+    def _insert_slice(self):
+        self._after_id = None
+        batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+        for iid, values in batch:
+            self.tree.insert("", "end", iid=iid, values=values)
+            self._rows[iid] = values
+        if self._pending:
+            self._after_id = self.tree.after(self.slice_delay_ms, self._insert_slice)
+        else:
+            self._fix_order()
+
+    def _fix_order(self):
+        '''
+        Move as few rows as possible to match the requested order. Returns the
+        number of rows moved.
+        '''
+        shown = self.tree.get_children()
+        if list(shown) == self._order:
+            return 0
+        position = {iid: index for index, iid in enumerate(shown)}
+        keep = _increasing_run([position[iid] for iid in self._order])
+        moving = [iid for index, iid in enumerate(self._order) if index not in keep]
+        self.tree.detach(*moving)
+        # Rows before `index` in the requested order are now exactly the first
+        # `index` children, so each re-attach position is unambiguous
+        for index, iid in enumerate(self._order):
+            if index not in keep:
+                self.tree.move(iid, "", index)
+        return len(moving)
+
+    def _cancel_pending(self):
+        if self._after_id is not None:
+            self.tree.after_cancel(self._after_id)
+            self._after_id = None
+        self._pending = []
+
+def _increasing_run(values):
+    '''Indexes of one longest strictly increasing subsequence of `values` (O(n log n)).'''
+    tails, tail_index, previous = [], [], [None] * len(values)
+    for index, value in enumerate(values):
+        slot = bisect_left(tails, value)
+        if slot == len(tails):
+            tails.append(value)
+            tail_index.append(index)
+        else:
+            tails[slot] = value
+            tail_index[slot] = index
+        previous[index] = tail_index[slot - 1] if slot else None
+    keep, index = set(), tail_index[-1] if tail_index else None
+    while index is not None:
+        keep.add(index)
+        index = previous[index]
+    return keep
+
+# References:
+# Python Software Foundation. (2025). tkinter.ttk — Tk themed widgets: Treeview.
+#       https://docs.python.org/3/library/tkinter.ttk.html#treeview
+# TkDocs. (2024). TkDocs tutorial: Tree. https://tkdocs.com/tutorial/tree.html
@@ -0,0 +1,150 @@
+# --------------------------------------------
+# Background worker for the Tkinter client
+# --------------------------------------------
+# Tk is single-threaded: a MongoDB query or HTTP request made from a button
+# handler freezes the whole window until it returns. BackgroundWorker runs
+# those calls on a small thread pool instead and hands each result back to
+# the Tk thread through a queue.Queue, which is drained with root.after()
+# (widgets are only ever touched from the Tk thread).
+#
+#   job = worker.submit(load_census, on_success=show, on_error=report, timeout=30)
+#   job.cancel()        # result (if it still arrives) is discarded
+#
+# A timed-out job calls on_error(WorkerTimeout()); Python threads cannot be
+# killed, so the call itself finishes in the background and its result is
+# dropped. on_busy(True/False) fires when the first job starts / the last
+# one ends, for loading indicators (Python Software Foundation, 2025;
+# TkDocs, 2024).
+# ----------------------------
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import queue
+import time
+
+WORKER_THREADS = 4     # DB + HTTP calls in flight at once
+POLL_MS = 50           # how often the Tk thread checks for finished jobs
+
+
+class WorkerTimeout(Exception):
+    '''A background job did not finish within its timeout.'''
+
+
+class Job:
+    '''Handle for one submitted call.'''
+
+    def __init__(self, job_id, on_success, on_error, timeout):
+        self.id = job_id
+        self.on_success = on_success
+        self.on_error = on_error
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.future = None
+        self.cancelled = False
+        self.done = False
+
+    def cancel(self):
+        '''Drop this job: no callback will run. Not-yet-started calls never run.'''
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class BackgroundWorker:
+    '''Thread pool whose results are delivered on the Tk event loop.'''
+
+    def __init__(self, root, max_workers=WORKER_THREADS, poll_ms=POLL_MS, on_busy=None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_busy = on_busy                # on_busy(bool) for loading indicators
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bedbuddy-worker")
+        self._results = queue.Queue()         # (job, ok, value) from worker threads
+        self._jobs = {}                       # job id -> Job still waiting for a result
+        self._ids = itertools.count(1)
+        self._after_id = None
+        self._closed = False
+
+    @property
+    def busy(self):
+        return bool(self._jobs)
+
+    def submit(self, fn, *args, on_success=None, on_error=None, timeout=None, **kwargs):
+        '''
+        Run fn(*args, **kwargs) on the pool. on_success(result) or on_error(exception)
+        is then called on the Tk thread. Returns a Job.
+        '''
+        if self._closed:
+            raise RuntimeError("worker has been shut down")
+        job = Job(next(self._ids), on_success, on_error, timeout)
+        was_busy = self.busy
+        self._jobs[job.id] = job
+        job.future = self._executor.submit(self._call, job, fn, args, kwargs)
+        if not was_busy:
+            self._set_busy(True)
+        if self._after_id is None:
+            self._after_id = self.root.after(self.poll_ms, self._poll)
+        return job
+
+    def shutdown(self):
+        '''Cancel pending jobs and stop polling (call before the root is destroyed).'''
+        self._closed = True
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        for job in self._jobs.values():
+            job.cancel()
+        self._jobs.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------- Internals ---------------- #
+    def _call(self, job, fn, args, kwargs):
+        # Runs on a worker thread: never touch widgets here
+        if job.cancelled:
+            return
+        try:
+            self._results.put((job, True, fn(*args, **kwargs)))
+        except Exception as e:
+            self._results.put((job, False, e))
+
+    def _poll(self):
+        self._after_id = None
+        try:
+            while not self._closed:
+                try:
+                    job, ok, value = self._results.get_nowait()
+                except queue.Empty:
+                    break
+                self._finish(job, ok, value)
+
+            now = time.monotonic()
+            for job in list(self._jobs.values()):
+                if self._closed:
+                    break
+                if job.cancelled:
+                    del self._jobs[job.id]   # its result, if any, is discarded
+                elif job.deadline is not None and now >= job.deadline:
+                    job.cancel()
+                    self._finish(job, False, WorkerTimeout(), force=True)
+        finally:
+            # Keep polling even if a callback raised (Tk reports the exception)
+            if not self._closed and self._after_id is None:   # a callback may have re-armed it
+                if self._jobs:
+                    self._after_id = self.root.after(self.poll_ms, self._poll)
+                else:
+                    self._set_busy(False)
+
+    def _finish(self, job, ok, value, force=False):
+        if self._jobs.pop(job.id, None) is None or (job.cancelled and not force):
+            return   # cancelled or already timed out: discard
+        job.done = True
+        callback = job.on_success if ok else job.on_error
+        if callback is not None:
+            callback(value)
+
+    def _set_busy(self, busy):
+        if self.on_busy is not None:
+            self.on_busy(busy)
+
+# References:
+# Python Software Foundation. (2025). concurrent.futures — Launching parallel tasks;
+#       queue — A synchronized queue class. In Python 3.13 documentation.
+#       https://docs.python.org/3/library/concurrent.futures.html
+# TkDocs. (2024). TkDocs tutorial: Event loop. https://tkdocs.com/tutorial/eventloop.html